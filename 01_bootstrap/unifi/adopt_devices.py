@@ -7,6 +7,8 @@ Environment Variables:
   UNIFI_URL   -> e.g. https://10.0.1.20:8443
   UNIFI_USER  -> controller admin (no 2FA)
   UNIFI_PASS  -> password
+  UNIFI_SESSION_DIR -> login cache dir (default ~/.cache/rylan-unifi); the
+                       login is reused across runs and refreshed on 401
 
 Usage:
   python adopt_devices.py --site default --dry-run
@@ -20,6 +22,7 @@ import logging
 import os
 import sys
 import time
+from collections.abc import Iterable, Iterator
 from http.cookiejar import MozillaCookieJar
 from pathlib import Path
 from typing import Any, NoReturn, cast
@@ -27,6 +30,11 @@ from typing import Any, NoReturn, cast
 import requests
 import urllib3
 
+# Import from repo root for the local `shared` package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from shared.auth import ControllerLogin
+from shared.unifi_client import iter_data_records
+
 urllib3.disable_warnings()  # self-signed certs
 
 SESSION = requests.Session()
@@ -45,34 +53,33 @@ def fail(msg: str) -> NoReturn:
 
 
 def login(url: str, username: str, password: str) -> None:
-    """Authenticate with UniFi controller."""
-    resp = SESSION.post(
-        f"{url}/api/login",
-        json={"username": username, "password": password},
-        verify=False,
-    )
-    if resp.status_code != HTTP_OK:
-        fail(f"Login failed ({resp.status_code})")
+    """Authenticate with UniFi controller, reusing a cached login when one is still valid."""
+    try:
+        ControllerLogin(url, username, password, verify_ssl=False).attach(SESSION, eager=True)
+    except requests.HTTPError as e:
+        fail(f"Login failed ({e.response.status_code if e.response is not None else e})")
     logger.info("Authenticated")
 
 
-def list_devices(url: str, site: str) -> list[dict[str, Any]]:
-    """Retrieve all devices from controller.
+def iter_devices(url: str, site: str) -> Iterator[dict[str, Any]]:
+    """Stream devices from the controller one at a time.
 
-    This validates the controller response at runtime and returns a
-    `list[dict[str, Any]]` so callers can rely on the element shape.
+    The ``stat/device`` body grows with the fleet (hundreds of MB for
+    thousands of devices), so it is parsed incrementally rather than loaded
+    whole; non-dict items are skipped so callers can rely on the shape.
     """
     endpoint = f"{url}/proxy/network/api/s/{site}/stat/device"
-    resp = SESSION.get(endpoint, verify=False)
-    if resp.status_code != HTTP_OK:
-        fail(f"Device list failed ({resp.status_code})")
+    with SESSION.get(endpoint, verify=False, stream=True) as resp:
+        if resp.status_code != HTTP_OK:
+            fail(f"Device list failed ({resp.status_code})")
+        for item in iter_data_records(resp):
+            if isinstance(item, dict):
+                yield cast("dict[str, Any]", item)
 
-    data = resp.json().get("data", [])
-    if not isinstance(data, list):
-        return []
 
-    # Convert to the expected shape while filtering non-dict items
-    return [cast("dict[str, Any]", item) for item in data if isinstance(item, dict)]
+def list_devices(url: str, site: str) -> list[dict[str, Any]]:
+    """Retrieve all devices from controller (see ``iter_devices`` for large fleets)."""
+    return list(iter_devices(url, site))
 
 
 def adopt(url: str, site: str, mac: str) -> None:
@@ -124,30 +131,33 @@ def main() -> None:
             fail("UNIFI_USER/UNIFI_PASS must be set in environment")
         login(url, user, password)
 
-    devices = list_devices(url, args.site)
-    if not devices:
+    # Single streaming pass: log each device and keep only the pending MACs
+    total = 0
+    pending: list[str] = []
+    for d in iter_devices(url, args.site):
+        total += 1
+        print_device_summary([d])
+        mac = d.get("mac")
+        if d.get("state") != DEVICE_STATE_ADOPTED and isinstance(mac, str):
+            pending.append(mac)
+    if not total:
         logger.info("No devices discovered.")
         return
 
-    pending = [d for d in devices if d.get("state") != DEVICE_STATE_ADOPTED]
-    logger.info("Found %d devices; %d pending adoption", len(devices), len(pending))
-
-    print_device_summary(devices)
+    logger.info("Found %d devices; %d pending adoption", total, len(pending))
 
     if args.dry_run:
         logger.info("Dry-run complete; no adoption performed.")
         return
 
-    for d in pending:
-        mac = d.get("mac")
-        if isinstance(mac, str):
-            adopt(url, args.site, mac)
+    for mac in pending:
+        adopt(url, args.site, mac)
         time.sleep(2)
 
     logger.info("Pass complete. Re-run with --dry-run to verify final state.")
 
 
-def print_device_summary(devices: list[dict[str, Any]]) -> None:
+def print_device_summary(devices: Iterable[dict[str, Any]]) -> None:
     """Print a concise listing of discovered devices."""
     for d in devices:
         status = "ADOPTED" if d.get("state") == DEVICE_STATE_ADOPTED else "PENDING"
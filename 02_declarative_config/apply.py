@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field, ValidationError
 
 # Import from parent directory for local `shared` package
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.redactor_logging import install_redacting_filter
 from shared.unifi_client import UniFiClient
 
 DeepDiff: Any | None = None
@@ -29,6 +30,7 @@ except (ImportError, ModuleNotFoundError):
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
 logger = logging.getLogger("fortress")
+install_redacting_filter("fortress")
 
 BASE_DIR = Path(__file__).parent.parent
 GUEST_VLAN_ID = 90
@@ -186,30 +188,29 @@ def reconcile(
         logger.info("Dry-run complete - no changes applied")
         return 0
 
-    # Apply creates
+    # Apply creates and updates as bounded-concurrency bulk writes
     errors = []
-    for vlan in to_create:
-        try:
-            client.create_network(build_payload(vlan))
-            logger.info("Created VLAN %d (%s)", vlan.id, vlan.name)
-        except Exception:
-            logger.exception("Failed to create VLAN %d", vlan.id)
-            errors.append(vlan.id)
-
-    # Apply updates
+    updates: list[tuple[VLAN, str]] = []
     for vlan in to_update:
-        existing = existing_by_vlan[vlan.id]
-        nid = existing.get("_id")
+        nid = existing_by_vlan[vlan.id].get("_id")
         if not isinstance(nid, str):
             logger.error("Unexpected '_id' type for VLAN %d: %r", vlan.id, nid)
             errors.append(vlan.id)
             continue
-        try:
-            client.update_network(nid, build_payload(vlan))
-            logger.info("Updated VLAN %d (%s)", vlan.id, vlan.name)
-        except Exception:
-            logger.exception("Failed to update VLAN %d", vlan.id)
-            errors.append(vlan.id)
+        updates.append((vlan, nid))
+
+    created = client.create_networks(build_payload(vlan) for vlan in to_create)
+    updated = client.update_networks((nid, build_payload(vlan)) for vlan, nid in updates)
+    for action, vlans, results in (
+        ("create", to_create, created),
+        ("update", [vlan for vlan, _ in updates], updated),
+    ):
+        for vlan, result in zip(vlans, results, strict=True):
+            if result.ok:
+                logger.info("%sd VLAN %d (%s)", action.capitalize(), vlan.id, vlan.name)
+            else:
+                logger.error("Failed to %s VLAN %d: %s", action, vlan.id, result.error)
+                errors.append(vlan.id)
 
     return 1 if errors else 0
 
@@ -15,17 +15,24 @@ from collections.abc import Callable
 from typing import ParamSpec, TypeVar
 
 from app.exceptions import FortressError
+from app.redactor_logging import install_redacting_filter
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
 
-# Fortress-wide logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s",
-)
+FORTRESS_LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
 logger = logging.getLogger("fortress")
+install_redacting_filter("fortress")
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Install the fortress log format on the root logger.
+
+    Call from entrypoints; importing this module no longer configures logging.
+    """
+    logging.basicConfig(level=level, format=FORTRESS_LOG_FORMAT)
 
 
 def guardrail(*, guardian: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
@@ -7,34 +7,57 @@ Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
 
 from __future__ import annotations
 
+import bisect
+import fnmatch
+import gzip
+import heapq
+import importlib.util
+import itertools
 import logging
+import os
 import re
+import shutil
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
-logger = logging.getLogger(__name__)
-
-try:
-    from presidio_analyzer import AnalyzerEngine
-    from presidio_anonymizer import AnonymizerEngine
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from typing import TextIO
 
-    PRESIDIO_AVAILABLE = True
-except ImportError:  # pragma: no cover
-    PRESIDIO_AVAILABLE = False
-    AnalyzerEngine: Any = None  # type: ignore[no-redef]
-    AnonymizerEngine: Any = None  # type: ignore[no-redef]
+logger = logging.getLogger(__name__)
 
-if not PRESIDIO_AVAILABLE:
-    logger.warning("Presidio unavailable — using regex fallback")
-    logger.debug("Install: pip install presidio-analyzer presidio-anonymizer")
+# Presidio pulls in spaCy (seconds to import), so only its presence is checked here;
+# the classes are imported by ``_load_presidio`` when an engine is first built.
+PRESIDIO_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ("presidio_analyzer", "presidio_anonymizer")
+)
+AnalyzerEngine: Any = None
+BatchAnalyzerEngine: Any = None
+AnonymizerEngine: Any = None
 
 
-# Regex patterns for common PII/secrets
+# Regex patterns for common PII/secrets.
+# Every pattern must run in linear time on any input: a match attempt may only scan an
+# unbounded run when it starts at the beginning of that run (enforced by a lookbehind) and
+# consumes it atomically, so hostile hex/colon/dot runs cannot trigger rescans. Atomic runs
+# use the ``(?=(X+))\1`` idiom (a lookahead is never re-entered), which also works before
+# Python 3.11 where possessive ``X++`` is unavailable.
+# An IPv6 run may also start right after a ``label:`` prefix (``addr:fe80::1``, ``ip6:2001:db8::1``):
+# the label ends in a non-hex word character plus at most four hex digits, so the start sits at a
+# run boundary only a label can create, never in the middle of a hostile hex/colon run.
+_IPV6_AFTER_LABEL = "|".join(f"(?<=[g-zG-Z_][0-9a-fA-F]{{{n}}}:)" for n in range(5))
 PATTERNS = {
     "ipv4": r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
-    "ipv6": r"(?:[0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}",
+    # A whole hex-and-colon run that holds "::" or eight groups; timestamps and MACs do not qualify.
+    "ipv6": (
+        rf"(?:(?<![\w:])|{_IPV6_AFTER_LABEL})(?=[0-9a-fA-F:]*::|(?:[0-9a-fA-F]{{1,4}}:){{7}}[0-9a-fA-F])"
+        r"(?=((?:[0-9a-fA-F]{1,4}(?![0-9a-fA-F])|:)+))\1(?!\w)"
+    ),
     "mac": r"\b(?:[0-9A-Fa-f]{2}[:-]){5}(?:[0-9A-Fa-f]{2})\b",
-    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "email": r"(?<![A-Za-z0-9._%+-])(?=([A-Za-z0-9._%+-]+))\1@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
     "phone": r"\b(?:\+1|1)?[-.]?\(?[0-9]{3}\)?[-.]?[0-9]{3}[-.]?[0-9]{4}\b",
     "serial": r"(?:SN|Serial|S/N):?\s*([A-Z0-9]{8,})",
     "uuid": r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
@@ -42,69 +65,651 @@ PATTERNS = {
     "password": r"(?:password|passwd|pwd)\s*[:=]\s*[^\s]+",
 }
 
+REDACTION_TOKEN = "[REDACTED]"
+
+# Compiled once at import; order is significant (each pattern sees the output of the previous one).
+_COMPILED_PATTERNS: dict[str, re.Pattern[str]] = {
+    name: re.compile(pattern, flags=re.IGNORECASE) for name, pattern in PATTERNS.items()
+}
+
+# Staged-scanner gates: a cheap necessary condition for each pattern, checked on the ORIGINAL
+# text. Gates cannot match "[" or "]", so any gate hit after substitution lies inside untouched
+# original text — a gate that fails before substitution also fails after it, and skipping a
+# gated pattern never changes the output (nor causes a false negative in is_pii_present).
+_GATES: dict[str, re.Pattern[str]] = {
+    name: re.compile(gate, flags=re.IGNORECASE)
+    for name, gate in {
+        "ipv4": r"\d\.\d",
+        "ipv6": r":[0-9a-f]{0,4}:",
+        "mac": r"[0-9a-f]{2}[:-][0-9a-f]{2}[:-]",
+        "email": r"@",
+        "phone": r"[0-9]{3}",
+        "serial": r"SN|Serial|S/N",
+        "uuid": r"[0-9a-f]{4}-[0-9a-f]{4}-",
+        "api_key": r"api|token|secret",
+        "password": r"passw|pwd",
+    }.items()
+}
+# Prefilter: one scan over every gate; when it misses, the text is clean.
+_ANY_GATE = re.compile("|".join(f"(?:{gate.pattern})" for gate in _GATES.values()), flags=re.IGNORECASE)
+
+# Streaming cut points. Only serial/api_key/password can span whitespace (via \s*), and only
+# password's [^\s]+ value can span the JSON delimiters below; a candidate cut is accepted
+# when neither can happen, so each segment redacts exactly as it would inside the whole text.
+STREAM_CHUNK_CHARS = 1 << 20
+_CUT_SEARCH_WINDOW = 1 << 16
+_MAX_CUT_PROBES = 64
+_CUT_CANDIDATES = re.compile(r"\s|(?<=[,\"{}\[\]])(?=[,\"{}\[\]])")
+_UNSAFE_TAIL = re.compile(r"(?:[:=]|SN|Serial|S/N|passw(?:or)?d|pwd|api[_-]?key|token|secret)\Z", flags=re.IGNORECASE)
+_PASSWORD_SPAN = re.compile(r"(?:password|passwd|pwd)\s*[:=]", flags=re.IGNORECASE)
+_ASCII_WHITESPACE = " \t\n\r\f\v"
+
+
+# Entities requested from Presidio; MACs are masked by regex before analysis.
+PRESIDIO_ENTITIES: tuple[str, ...] = (
+    "IP_ADDRESS",
+    "EMAIL_ADDRESS",
+    "PHONE_NUMBER",
+    "PERSON",
+    "DOMAIN",
+)
+_WARM_UP_TEXT = "Contact Jane Doe at admin@rylan.internal or 10.0.10.10"
+
+# Hybrid mode: entities the regex patterns already cover are not sent to Presidio,
+# which only sees short windows around capitalized-token runs and dotted names.
+_REGEX_COVERED_ENTITIES = frozenset({"IP_ADDRESS", "EMAIL_ADDRESS", "PHONE_NUMBER"})
+_NLP_CANDIDATE = re.compile(r"\b[A-Z][a-z]+(?:[ '-][A-Z][a-z]+)*\b|\b(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\b")
+_WINDOW_CONTEXT = 40
+
+
+class PresidioEngines:
+    """Process-wide holder for one Presidio analyzer/anonymizer pair.
+
+    Engines are built lazily on first use (loading the spaCy model once),
+    shared by every caller and thread, and rebuilt only after ``reset``.
+    A failed build is not cached, so the next call retries.
+    """
+
+    def __init__(self, entities: tuple[str, ...] = PRESIDIO_ENTITIES, language: str = "en") -> None:
+        """Configure the holder; no engine is built until ``get`` is called."""
+        self.entities: tuple[str, ...] = entities
+        self.language: str = language
+        self._lock = threading.Lock()
+        self._engines: tuple[Any, Any] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the engines have been built."""
+        return self._engines is not None
+
+    def get(self) -> tuple[Any, Any]:
+        """Return ``(analyzer, anonymizer)``, building them on first call."""
+        engines = self._engines
+        if engines is None:
+            with self._lock:
+                engines = self._engines
+                if engines is None:
+                    _load_presidio()
+                    engines = (AnalyzerEngine(), AnonymizerEngine())
+                    self._engines = engines
+        return engines
+
+    def warm_up(self) -> None:
+        """Build the engines and run one analysis so the NLP pipeline is fully loaded."""
+        analyzer, _ = self.get()
+        analyzer.analyze(text=_WARM_UP_TEXT, entities=list(self.entities), language=self.language)
+
+    def reset(self, *, entities: tuple[str, ...] | None = None, language: str | None = None) -> None:
+        """Drop the engines (optionally changing config); the next ``get`` rebuilds them."""
+        with self._lock:
+            if entities is not None:
+                self.entities = entities
+            if language is not None:
+                self.language = language
+            self._engines = None
+
+
+def _load_presidio() -> None:
+    """Import the Presidio engine classes on first real use (no-op once loaded or patched).
+
+    An installed but broken Presidio (its import raises) is recorded by clearing
+    ``PRESIDIO_AVAILABLE``, so later calls go straight to regex instead of
+    retrying the import; the error is re-raised for the current caller.
+    """
+    global AnalyzerEngine, BatchAnalyzerEngine, AnonymizerEngine, PRESIDIO_AVAILABLE, _FALLBACK_WARNED
+    if AnalyzerEngine is not None and AnonymizerEngine is not None:
+        return
+    try:
+        from presidio_analyzer import AnalyzerEngine as analyzer_cls
+        from presidio_analyzer import BatchAnalyzerEngine as batch_cls
+        from presidio_anonymizer import AnonymizerEngine as anonymizer_cls
+    except Exception as e:
+        PRESIDIO_AVAILABLE = False
+        _FALLBACK_WARNED = True
+        logger.warning("Presidio failed to import (%s) — using regex fallback from now on", e)
+        raise
+
+    AnalyzerEngine, AnonymizerEngine = analyzer_cls, anonymizer_cls
+    if BatchAnalyzerEngine is None:
+        BatchAnalyzerEngine = batch_cls
+
+
+_PRESIDIO = PresidioEngines()
+
+
+def warm_up_presidio() -> bool:
+    """Load Presidio ahead of the first redaction (e.g. at service start).
+
+    Returns:
+        True if the engines are ready, False if Presidio is unavailable or failed to load.
+
+    """
+    if not PRESIDIO_AVAILABLE:
+        return False
+    try:
+        _PRESIDIO.warm_up()
+    except Exception:
+        logger.exception("Presidio warm-up failed")
+        return False
+    return True
+
+
+def reset_presidio(*, entities: tuple[str, ...] | None = None, language: str | None = None) -> None:
+    """Discard cached Presidio engines (and cached results), e.g. after changing the entity configuration."""
+    _PRESIDIO.reset(entities=entities, language=language)
+    if _CACHE is not None:
+        _CACHE.clear()
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of ``RedactionCache`` counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class RedactionCache:
+    """Bounded LRU of redaction results for repeated lines (heartbeats, retry spam).
+
+    Entries are keyed by ``(engine, text)``: the dict lookup hashes the content
+    and confirms equality, so a hash collision can never return another line's
+    output. Texts longer than ``max_text_len`` bypass the cache so whole
+    documents cannot crowd out log lines. Safe to share across threads.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_text_len: int = 4096) -> None:
+        """Create an empty cache holding at most ``maxsize`` entries."""
+        if maxsize < 1:
+            msg = "maxsize must be >= 1"
+            raise ValueError(msg)
+        self.maxsize: int = maxsize
+        self.max_text_len: int = max_text_len
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, engine: str, text: str) -> str | None:
+        """Return the cached result for ``text`` (marking it recently used), or None."""
+        if len(text) > self.max_text_len:
+            return None
+        key = (engine, text)
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, engine: str, text: str, redacted: str) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        if len(text) > self.max_text_len:
+            return
+        key = (engine, text)
+        with self._lock:
+            self._data[key] = redacted
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return current counters."""
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
+
+
+_CACHE: RedactionCache | None = None
+
+
+def enable_cache(maxsize: int = 4096, max_text_len: int = 4096) -> RedactionCache:
+    """Turn on result caching for ``redact_pii`` / ``redact_many`` (replacing any existing cache)."""
+    global _CACHE
+    _CACHE = RedactionCache(maxsize=maxsize, max_text_len=max_text_len)
+    return _CACHE
+
+
+def disable_cache() -> None:
+    """Turn result caching off and release its memory."""
+    global _CACHE
+    _CACHE = None
+
+
+def cache_stats() -> CacheStats | None:
+    """Return counters of the active cache, or None when caching is disabled."""
+    return _CACHE.stats() if _CACHE is not None else None
+
+
+# --------------------------------------------------------------------------- #
+# Allowlist: known infrastructure values that stay readable
+# --------------------------------------------------------------------------- #
+
+PUBLIC_RESOLVERS: frozenset[str] = frozenset(
+    {
+        "1.1.1.1",
+        "1.0.0.1",
+        "8.8.8.8",
+        "8.8.4.4",
+        "9.9.9.9",
+        "149.112.112.112",
+        "2606:4700:4700::1111",
+        "2606:4700:4700::1001",
+        "2001:4860:4860::8888",
+        "2001:4860:4860::8844",
+    }
+)
+# Keys in the declarative config (``02_declarative_config/*.yaml``) whose values are infrastructure.
+ALLOWLIST_CONFIG_KEYS: frozenset[str] = frozenset(
+    {"gateway", "gateways", "subnet", "subnets", "dns_servers", "nameservers"}
+)
+
+# Matches whose exact text is in ``_ALLOWLIST`` are kept; only patterns in ``_ALLOWLISTED_NAMES``
+# (those that can produce an allowlisted value) pay for the per-match lookup.
+_ALLOWLIST: frozenset[str] = frozenset()
+_ALLOWLISTED_NAMES: frozenset[str] = frozenset()
+
+
+def set_allowlist(values: Iterable[str]) -> frozenset[str]:
+    """Keep matches whose text is one of ``values`` instead of redacting them (replaces any previous list).
+
+    Values are compared exactly against the matched text (upper/lower-case
+    variants are added for hex addresses). Values no pattern can match are
+    ignored. Applies to every engine; cached results are discarded.
+
+    Returns:
+        The active allowlist.
+
+    """
+    global _ALLOWLIST, _ALLOWLISTED_NAMES
+    allow: set[str] = set()
+    for value in values:
+        value = value.strip()
+        if value:
+            allow.update((value, value.lower(), value.upper()))
+    _ALLOWLIST = frozenset(allow)
+    _ALLOWLISTED_NAMES = frozenset(
+        name for name, compiled in _COMPILED_PATTERNS.items() if any(compiled.fullmatch(value) for value in allow)
+    )
+    if _CACHE is not None:
+        _CACHE.clear()
+    return _ALLOWLIST
+
+
+def clear_allowlist() -> None:
+    """Redact every match again."""
+    set_allowlist(())
+
+
+def _collect_config_values(node: object, keys: frozenset[str], into: set[str], *, under_key: bool = False) -> None:
+    """Add the scalar values stored under ``keys`` anywhere in ``node`` to ``into``."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            _collect_config_values(value, keys, into, under_key=str(key) in keys)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_config_values(item, keys, into, under_key=under_key)
+    elif under_key and isinstance(node, str):
+        into.add(node)
+        # "10.0.10.0/26": the address pattern matches the part before the prefix length.
+        into.add(node.split("/", 1)[0])
+
+
+def allowlist_from_config(
+    paths: Iterable[str],
+    *,
+    keys: Iterable[str] = ALLOWLIST_CONFIG_KEYS,
+) -> frozenset[str]:
+    """Collect gateway, subnet and resolver values from declarative config files.
+
+    Args:
+        paths: ``.yaml``/``.yml``/``.json`` files such as ``02_declarative_config/vlans.yaml``.
+        keys: Key names whose values (or list items) are collected, at any depth.
+
+    Returns:
+        The collected values, ready for ``set_allowlist``.
+
+    Raises:
+        FileNotFoundError: If a config file does not exist.
+
+    """
+    import json
+
+    import yaml
+
+    wanted = frozenset(keys)
+    values: set[str] = set()
+    for raw in paths:
+        path = Path(raw)
+        if not path.exists():
+            msg = f"Allowlist config not found: {path}"
+            raise FileNotFoundError(msg)
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+        _collect_config_values(data, wanted, values)
+    return frozenset(values)
+
+
+_FALLBACK_WARNED = False
+
+
+def _resolve_engine(method: str) -> str:
+    """Map a requested ``method`` to the engine that will actually run (``presidio``, ``hybrid`` or ``regex``).
+
+    The first time a Presidio method is requested without Presidio, a warning is
+    logged once; importing the module (e.g. for the regex-only logging filter) stays silent.
+    """
+    global _FALLBACK_WARNED
+    if not PRESIDIO_AVAILABLE:
+        if method in ("auto", "presidio", "hybrid") and not _FALLBACK_WARNED:
+            _FALLBACK_WARNED = True
+            logger.warning("Presidio unavailable — using regex fallback")
+            logger.debug("Install: pip install presidio-analyzer presidio-anonymizer")
+        return "regex"
+    if method in ("auto", "presidio"):
+        return "presidio"
+    if method == "hybrid":
+        return "hybrid"
+    return "regex"
+
 
 def redact_pii(text: str, method: str = "auto") -> str:
     """Redact PII from ``text``.
 
     Args:
         text: Input text to redact.
-        method: ``presidio`` (requires library), ``regex``, or ``auto``.
+        method: ``presidio`` (requires library), ``hybrid`` (regex, then Presidio on
+            candidate windows only), ``regex``, or ``auto``.
 
     Returns:
         Redacted text with PII replaced by ``[REDACTED]``.
 
     """
-    if method == "auto":
-        method = "presidio" if PRESIDIO_AVAILABLE else "regex"
+    engine = _resolve_engine(method)
+    cache = _CACHE
+    if cache is not None:
+        cached = cache.get(engine, text)
+        if cached is not None:
+            return cached
 
-    if method == "presidio" and PRESIDIO_AVAILABLE:
-        return _redact_presidio(text)
-
-    return _redact_regex(text)
+    if engine == "presidio":
+        redacted = _redact_presidio(text)
+    elif engine == "hybrid":
+        redacted = _redact_hybrid_batch([text])[0]
+    else:
+        redacted = _redact_regex(text)
+    if cache is not None:
+        cache.put(engine, text, redacted)
+    return redacted
 
 
 def _redact_presidio(text: str) -> str:
     """Redact using Presidio Analyzer + Anonymizer (preferred method).
 
-    Falls back to regex on failure.
+    Engines come from the shared ``PresidioEngines`` holder. Falls back to regex on failure.
     """
     try:
-        analyzer = AnalyzerEngine()
-        anonymizer = AnonymizerEngine()
+        analyzer, anonymizer = _PRESIDIO.get()
+        masked = _mask_macs(text)
 
         results = analyzer.analyze(
-            text=text,
-            entities=[
-                "IP_ADDRESS",
-                "EMAIL_ADDRESS",
-                "PHONE_NUMBER",
-                "PERSON",
-                "DOMAIN",
-            ],
-            language="en",
+            text=masked,
+            entities=list(_PRESIDIO.entities),
+            language=_PRESIDIO.language,
         )
 
-        anonymized = cast("str", anonymizer.anonymize(text=text, analyzer_results=results).text)
-
-        # Apply additional regex for MAC addresses (Presidio doesn't catch these)
-        return re.sub(PATTERNS["mac"], "[REDACTED]", anonymized, flags=re.IGNORECASE)
+        return cast("str", anonymizer.anonymize(text=masked, analyzer_results=_drop_allowed(masked, results)).text)
 
     except Exception:
         logger.exception("Presidio redaction failed; falling back to regex")
         return _redact_regex(text)
 
 
+def _drop_allowed(text: str, results: list[Any]) -> list[Any]:
+    """Remove analyzer results whose span text is allowlisted."""
+    if not _ALLOWLIST:
+        return results
+    return [result for result in results if text[result.start : result.end] not in _ALLOWLIST]
+
+
+def _mask_macs(text: str) -> str:
+    """Replace MAC addresses (which Presidio does not detect) before analysis.
+
+    Runs on the input rather than as a second full pass over the anonymized
+    output, and only when the cheap MAC gate sees a candidate.
+    """
+    if not _GATES["mac"].search(text):
+        return text
+    return _COMPILED_PATTERNS["mac"].sub(REDACTION_TOKEN, text)
+
+
+def _candidate_windows(text: str) -> list[tuple[int, int]]:
+    """Return merged ``(start, end)`` windows of ``text`` that may hold NLP-only entities.
+
+    Each capitalized-token run or dotted name is widened by ``_WINDOW_CONTEXT``
+    characters for NER context, trimmed back to whole words.
+    """
+    windows: list[tuple[int, int]] = []
+    for match in _NLP_CANDIDATE.finditer(text):
+        start = max(0, match.start() - _WINDOW_CONTEXT)
+        if start > 0 and not text[start - 1].isspace():
+            gap = text.find(" ", start, match.start())
+            start = gap + 1 if gap >= 0 else match.start()
+        end = min(len(text), match.end() + _WINDOW_CONTEXT)
+        if end < len(text) and not text[end].isspace():
+            gap = text.rfind(" ", match.end(), end)
+            end = gap if gap >= 0 else match.end()
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(end, windows[-1][1]))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def _redact_hybrid_batch(batch: list[str]) -> list[str]:
+    """Regex-redact a batch, then run Presidio only on candidate windows for NLP-only entities.
+
+    Structured entities (IPs, MACs, emails, phones, ...) are handled by the
+    staged regex engine; the analyzer sees one batched pass over the windows
+    selected by ``_candidate_windows``. Text without candidates never reaches
+    Presidio; allowlisted analyzer spans are left in place. On analyzer failure
+    the regex result is returned.
+    """
+    redacted = _redact_regex_batch(batch)
+    entities = [entity for entity in _PRESIDIO.entities if entity not in _REGEX_COVERED_ENTITIES]
+    spans = [(i, start, end) for i, text in enumerate(redacted) for start, end in _candidate_windows(text)]
+    if not entities or not spans:
+        return redacted
+    try:
+        analyzer, anonymizer = _PRESIDIO.get()
+        all_results = BatchAnalyzerEngine(analyzer_engine=analyzer).analyze_iterator(
+            texts=[redacted[i][start:end] for i, start, end in spans],
+            language=_PRESIDIO.language,
+            batch_size=min(len(spans), DEFAULT_BATCH_SIZE),
+            entities=entities,
+        )
+        per_text: dict[int, list[Any]] = {}
+        for (i, start, end), results in zip(spans, all_results, strict=True):
+            for result in _drop_allowed(redacted[i][start:end], results):
+                result.start += start
+                result.end += start
+                per_text.setdefault(i, []).append(result)
+        for i, results in per_text.items():
+            redacted[i] = cast("str", anonymizer.anonymize(text=redacted[i], analyzer_results=results).text)
+    except Exception:
+        logger.exception("Presidio hybrid pass failed; returning regex redaction")
+    return redacted
+
+
+def _applicable_names(text: str, *, prefiltered: bool = False) -> list[str]:
+    """Return the pattern names (in ``PATTERNS`` order) whose gate matches ``text``.
+
+    ``prefiltered`` skips the combined gate scan when the caller already saw it hit.
+    """
+    if not prefiltered and not _ANY_GATE.search(text):
+        return []
+    return [name for name, gate in _GATES.items() if gate.search(text)]
+
+
 def _redact_regex(text: str) -> str:
-    """Redact using regex patterns (fallback method)."""
+    """Redact using regex patterns (fallback method).
+
+    Staged scanner: one cheap gate pass selects the patterns that can possibly
+    match, then only those run. Output is identical to substituting every
+    pattern in ``PATTERNS`` order; clean text is returned without allocation.
+    """
+    return _redact_regex_counted(text)[0]
+
+
+def _redact_regex_counted(text: str, *, prefiltered: bool = False) -> tuple[str, int]:
+    """Same as ``_redact_regex`` but also return the number of substitutions made."""
     redacted = text
+    total = 0
+    for name in _applicable_names(text, prefiltered=prefiltered):
+        if name in _ALLOWLISTED_NAMES:
+            redacted, count = _sub_unless_allowed(_COMPILED_PATTERNS[name], redacted)
+        else:
+            redacted, count = _COMPILED_PATTERNS[name].subn(REDACTION_TOKEN, redacted)
+        total += count
+    return redacted, total
+
 
-    # Apply all patterns using values() for clarity and performance
-    for pattern in PATTERNS.values():
-        redacted = re.sub(pattern, "[REDACTED]", redacted, flags=re.IGNORECASE)
+def _sub_unless_allowed(compiled: re.Pattern[str], text: str) -> tuple[str, int]:
+    """``compiled.subn`` that keeps allowlisted matches; the count excludes kept matches."""
+    allow = _ALLOWLIST
+    kept = 0
 
+    def replace(match: re.Match[str]) -> str:
+        nonlocal kept
+        value = match.group()
+        if value in allow:
+            kept += 1
+            return value
+        return REDACTION_TOKEN
+
+    redacted, count = compiled.subn(replace, text)
+    return redacted, count - kept
+
+
+DEFAULT_BATCH_SIZE = 256
+
+
+def redact_many(texts: Iterable[str], method: str = "auto", *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """Redact many strings, yielding results in input order.
+
+    Input is consumed lazily in batches of ``batch_size``. The regex path
+    prefilters a whole batch with one scan and only redacts lines that can
+    contain PII; the Presidio path analyses each batch through
+    ``BatchAnalyzerEngine`` so spaCy's ``nlp.pipe`` batching is used.
+
+    Args:
+        texts: Strings to redact (e.g. log lines).
+        method: ``presidio`` (requires library), ``hybrid``, ``regex``, or ``auto``.
+        batch_size: Number of strings handed to the engine at once.
+
+    Yields:
+        Redacted strings, one per input.
+
+    """
+    if batch_size < 1:
+        msg = "batch_size must be >= 1"
+        raise ValueError(msg)
+    engine = _resolve_engine(method)
+    redact_batch = {
+        "presidio": _redact_presidio_batch,
+        "hybrid": _redact_hybrid_batch,
+    }.get(engine, _redact_regex_batch)
+
+    iterator = iter(texts)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        cache = _CACHE
+        if cache is None:
+            yield from redact_batch(batch)
+            continue
+        # Only cache misses reach the engine; they are still redacted as one batch.
+        results = [cache.get(engine, text) for text in batch]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fresh = redact_batch([batch[i] for i in missing])
+            for i, redacted in zip(missing, fresh, strict=True):
+                results[i] = redacted
+                cache.put(engine, batch[i], redacted)
+        yield from cast("list[str]", results)
+
+
+def _redact_regex_batch(batch: list[str]) -> list[str]:
+    """Regex-redact a batch; one prefilter scan over the joined batch finds the lines to work on.
+
+    No gate can match a newline, so every prefilter hit lies inside a single line.
+    """
+    joined = "\n".join(batch)
+    starts: list[int] = []
+    offset = 0
+    for text in batch:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    redacted = list(batch)
+    pos = 0
+    while match := _ANY_GATE.search(joined, pos):
+        index = bisect.bisect_right(starts, match.start()) - 1
+        redacted[index] = _redact_regex_counted(batch[index], prefiltered=True)[0]
+        pos = starts[index + 1] if index + 1 < len(starts) else len(joined)
     return redacted
 
 
+def _redact_presidio_batch(batch: list[str]) -> list[str]:
+    """Presidio-redact a batch with one batched NLP pass; falls back to regex on failure."""
+    try:
+        analyzer, anonymizer = _PRESIDIO.get()
+        batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+        masked = [_mask_macs(text) for text in batch]
+        all_results = batch_analyzer.analyze_iterator(
+            texts=masked,
+            language=_PRESIDIO.language,
+            batch_size=len(batch),
+            entities=list(_PRESIDIO.entities),
+        )
+        return [
+            cast("str", anonymizer.anonymize(text=text, analyzer_results=_drop_allowed(text, results)).text)
+            for text, results in zip(masked, all_results, strict=True)
+        ]
+    except Exception:
+        logger.exception("Presidio batch redaction failed; falling back to regex")
+        return _redact_regex_batch(batch)
+
+
 def redact_file(filepath: str, output_filepath: str | None = None) -> str:
     """Redact PII from a file.
 
@@ -140,21 +745,481 @@ def redact_file(filepath: str, output_filepath: str | None = None) -> str:
     return redacted_content
 
 
+def _tail_is_safe(buffer: str, end: int) -> bool:
+    """Return True unless the text before ``buffer[end:]``'s whitespace gap could open a cross-gap match."""
+    i = end - 1
+    while i >= 0 and buffer[i].isspace():
+        i -= 1
+    # Nothing but whitespace left: everything before ``buffer`` was flushed at a safe cut.
+    return i < 0 or _UNSAFE_TAIL.search(buffer, max(0, i - 15), i + 1) is None
+
+
+def _is_safe_cut(buffer: str, cut: int) -> bool:
+    """Return True if ``buffer[:cut]`` redacts identically on its own."""
+    if buffer[cut - 1].isspace():
+        return _tail_is_safe(buffer, cut)
+    # Delimiter pair inside a whitespace-free run: only a password value can cross it.
+    run_start = max(buffer.rfind(ch, 0, cut) for ch in _ASCII_WHITESPACE) + 1
+    if _PASSWORD_SPAN.search(buffer, run_start, cut):
+        return False
+    return run_start == 0 or _tail_is_safe(buffer, run_start)
+
+
+def _find_safe_cut(buffer: str) -> int:
+    """Return the largest safe split index in ``buffer``, or 0 if none was found."""
+    start = max(0, len(buffer) - _CUT_SEARCH_WINDOW)
+    candidates = [m.end() for m in _CUT_CANDIDATES.finditer(buffer, start)]
+    for cut in reversed(candidates[-_MAX_CUT_PROBES:]):
+        if cut > 0 and _is_safe_cut(buffer, cut):
+            return cut
+    return 0
+
+
+def redact_stream(
+    source: TextIO,
+    sink: TextIO,
+    *,
+    method: str = "regex",
+    chunk_size: int = STREAM_CHUNK_CHARS,
+) -> int:
+    """Redact ``source`` into ``sink`` chunk by chunk.
+
+    Each chunk is split at the last point no match can straddle (whitespace or a
+    JSON delimiter pair), so memory stays around ``chunk_size`` regardless of
+    input size. With ``method="regex"`` the output equals redacting the whole
+    text at once; NLP methods see one segment at a time.
+
+    Returns:
+        Number of characters written to ``sink``.
+
+    """
+    written = 0
+    for segment in _iter_safe_segments(source, chunk_size):
+        redacted = redact_pii(segment, method=method)
+        sink.write(redacted)
+        written += len(redacted)
+    return written
+
+
+def _iter_safe_segments(source: TextIO, chunk_size: int) -> Iterator[str]:
+    """Yield consecutive pieces of ``source`` that can each be redacted independently."""
+    pending = ""
+    while chunk := source.read(chunk_size):
+        pending += chunk
+        cut = _find_safe_cut(pending)
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+    if pending:
+        yield pending
+
+
+GZIP_COMPRESSLEVEL = 6
+
+
+def _open_text(path: Path, mode: str, *, compressed: bool | None = None, preserve: bool = False) -> TextIO:
+    """Open ``path`` as UTF-8 text, going through gzip when ``compressed`` (default: ``.gz`` suffix).
+
+    Compressed data is (de)compressed incrementally as the stream is read or
+    written, so no decompressed copy is ever materialised. With ``preserve``,
+    line endings and undecodable bytes round-trip unchanged (``newline=""``
+    and ``surrogateescape``); otherwise reads use universal newlines and
+    replace undecodable bytes, matching ``redact_file``.
+    """
+    if compressed is None:
+        compressed = path.suffix == ".gz"
+    newline = "" if preserve else None
+    errors = "surrogateescape" if preserve else ("strict" if "w" in mode else "replace")
+    if compressed:
+        if "w" in mode:
+            return cast(
+                "TextIO",
+                gzip.open(
+                    path, "wt", compresslevel=GZIP_COMPRESSLEVEL, encoding="utf-8", errors=errors, newline=newline
+                ),
+            )
+        return cast("TextIO", gzip.open(path, "rt", encoding="utf-8", errors=errors, newline=newline))
+    if "w" in mode:
+        return path.open("w", encoding="utf-8", errors=errors, newline=newline)
+    return path.open(encoding="utf-8", errors=errors, newline=newline)
+
+
+def redact_file_streaming(
+    filepath: str,
+    output_filepath: str,
+    *,
+    method: str = "regex",
+    chunk_size: int = STREAM_CHUNK_CHARS,
+) -> int:
+    """Redact a file of any size to ``output_filepath`` in bounded memory.
+
+    Produces the same bytes as ``redact_file`` with the regex engine, without
+    holding either copy of the content in memory. A ``.gz`` input is
+    decompressed on the fly and a ``.gz`` output is compressed on the fly, so
+    rotated archives are redacted without ever landing decompressed on disk.
+
+    Returns:
+        Number of characters written.
+
+    Raises:
+        FileNotFoundError: If input file not found.
+
+    """
+    path = Path(filepath)
+    if not path.exists():
+        msg = f"Input file not found: {path}"
+        raise FileNotFoundError(msg)
+
+    out_path = Path(output_filepath)
+    with _open_text(path, "r") as src, _open_text(out_path, "w") as dst:
+        written = redact_stream(src, dst, method=method, chunk_size=chunk_size)
+    logger.info("Redacted content streamed", extra={"path": str(out_path)})
+    return written
+
+
 def is_pii_present(text: str) -> bool:
-    """Return True if ``text`` contains potential PII."""
-    return any(re.search(pattern, text, flags=re.IGNORECASE) for pattern in PATTERNS.values())
+    """Return True if ``text`` contains potential PII.
+
+    A single prefilter scan rejects clean text; full patterns only run when
+    their own gate passes. A gate can only fail when its pattern cannot match,
+    so there are no false negatives.
+    """
+    for name in _applicable_names(text):
+        if name in _ALLOWLISTED_NAMES:
+            if next(_iter_pattern_findings(name, text), None) is not None:
+                return True
+        elif _COMPILED_PATTERNS[name].search(text):
+            return True
+    return False
+
+
+class Finding(NamedTuple):
+    """One detected entity: backend label (``ipv4``, ``IP_ADDRESS``, ...) and ``text[start:end]``."""
+
+    entity: str
+    start: int
+    end: int
+
+
+def find_pii(text: str, method: str = "auto") -> Iterator[Finding]:
+    """Yield PII spans in ``text`` by start offset, without building a redacted copy.
+
+    Regex spans are every match of every pattern against the original text, so
+    they may overlap where patterns do. Presidio spans are the analyzer results
+    plus regex MAC matches (falls back to regex on failure). Hybrid spans are
+    the regex spans plus analyzer results for the NLP-only entities on
+    candidate windows (capitalized-token runs and dotted names, with context)
+    of the original text. Hybrid redaction selects its windows after regex
+    masking, so NER context and window merging can differ slightly and the two
+    may disagree on borderline NLP entities.
+
+    Args:
+        text: Input text to scan.
+        method: ``presidio`` (requires library), ``hybrid``, ``regex``, or ``auto``.
+
+    Yields:
+        ``Finding`` tuples ordered by ``start``.
+
+    """
+    engine = _resolve_engine(method)
+    if engine == "presidio":
+        findings = _find_presidio(text)
+        if findings is not None:
+            yield from findings
+            return
+    elif engine == "hybrid":
+        yield from _find_hybrid(text)
+        return
+    streams = [_iter_pattern_findings(name, text) for name in _applicable_names(text)]
+    yield from heapq.merge(*streams, key=lambda finding: finding.start)
+
+
+def _iter_pattern_findings(name: str, text: str) -> Iterator[Finding]:
+    allow = _ALLOWLIST if name in _ALLOWLISTED_NAMES else frozenset()
+    for match in _COMPILED_PATTERNS[name].finditer(text):
+        if not allow or match.group() not in allow:
+            yield Finding(name, match.start(), match.end())
+
+
+def _find_presidio(text: str) -> list[Finding] | None:
+    """Return sorted Presidio + MAC findings, or None if Presidio failed."""
+    try:
+        analyzer, _ = _PRESIDIO.get()
+        results = analyzer.analyze(text=text, entities=list(_PRESIDIO.entities), language=_PRESIDIO.language)
+    except Exception:
+        logger.exception("Presidio analysis failed; falling back to regex")
+        return None
+    findings = [Finding(r.entity_type, r.start, r.end) for r in _drop_allowed(text, results)]
+    findings.extend(_iter_pattern_findings("mac", text))
+    findings.sort(key=lambda finding: finding.start)
+    return findings
+
+
+def _find_hybrid(text: str) -> list[Finding]:
+    """Return sorted regex findings plus analyzer findings on candidate windows of ``text``.
+
+    Windows come from the original text so offsets need no mapping (unlike
+    ``_redact_hybrid_batch``, which windows the regex-masked text). Analyzer
+    spans lying inside a regex span are dropped, since hybrid redaction masks
+    that text before Presidio sees it. On analyzer failure only the regex
+    findings are returned.
+    """
+    findings = sorted(
+        (finding for name in _applicable_names(text) for finding in _iter_pattern_findings(name, text)),
+        key=lambda finding: finding.start,
+    )
+    entities = [entity for entity in _PRESIDIO.entities if entity not in _REGEX_COVERED_ENTITIES]
+    windows = _candidate_windows(text) if entities else []
+    if not windows:
+        return findings
+    try:
+        analyzer, _ = _PRESIDIO.get()
+        all_results = BatchAnalyzerEngine(analyzer_engine=analyzer).analyze_iterator(
+            texts=[text[start:end] for start, end in windows],
+            language=_PRESIDIO.language,
+            batch_size=min(len(windows), DEFAULT_BATCH_SIZE),
+            entities=entities,
+        )
+        nlp = [
+            Finding(result.entity_type, result.start + start, result.end + start)
+            for (start, end), results in zip(windows, all_results, strict=True)
+            for result in _drop_allowed(text[start:end], results)
+        ]
+    except Exception:
+        logger.exception("Presidio hybrid analysis failed; returning regex findings")
+        return findings
+    nlp = [n for n in nlp if not any(f.start <= n.start and n.end <= f.end for f in findings)]
+    return sorted([*findings, *nlp], key=lambda finding: finding.start)
+
+
+def summarize_pii(text: str, method: str = "auto") -> dict[str, int]:
+    """Return ``{entity: count}`` for ``text`` (summary mode of ``find_pii``; empty when clean)."""
+    if _resolve_engine(method) == "regex":
+        counts = {name: sum(1 for _ in _iter_pattern_findings(name, text)) for name in _applicable_names(text)}
+        return {name: count for name, count in counts.items() if count}
+    summary: dict[str, int] = {}
+    for finding in find_pii(text, method=method):
+        summary[finding.entity] = summary.get(finding.entity, 0) + 1
+    return summary
+
+
+# --------------------------------------------------------------------------- #
+# Directory-tree CLI
+# --------------------------------------------------------------------------- #
+
+DEFAULT_EXCLUDES: tuple[str, ...] = (
+    ".git",
+    ".venv",
+    "venv",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+)
+_BINARY_SNIFF_BYTES = 8192
+
+
+class FileReport(NamedTuple):
+    """Per-file result of a tree sweep (``error`` is set when the file could not be processed)."""
+
+    path: str
+    findings: int
+    error: str | None = None
+
+
+def _glob_match(rel_path: str, patterns: Sequence[str]) -> bool:
+    """Match a POSIX relative path (or its basename) against fnmatch ``patterns``."""
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel_path, pat) or fnmatch.fnmatch(name, pat) for pat in patterns)
+
+
+def iter_tree(
+    root: Path,
+    *,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = DEFAULT_EXCLUDES,
+) -> Iterator[Path]:
+    """Yield files under ``root`` (or ``root`` itself) that pass the include/exclude globs."""
+    if root.is_file():
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        base = Path(dirpath)
+        rel_dir = base.relative_to(root).as_posix()
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+        dirnames[:] = sorted(d for d in dirnames if not _glob_match(prefix + d, exclude))
+        for name in sorted(filenames):
+            rel = prefix + name
+            if _glob_match(rel, exclude) or (include and not _glob_match(rel, include)):
+                continue
+            yield base / name
+
+
+def _is_binary(path: Path) -> bool:
+    """Sniff for NUL bytes (inside the decompressed stream for ``.gz`` archives)."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        return b"\0" in f.read(_BINARY_SNIFF_BYTES)
+
+
+def _process_file(task: tuple[str, str | None, bool]) -> FileReport | None:
+    """Worker: count (and optionally write) redactions for one file; None for binaries.
+
+    ``.gz`` archives are streamed through decompress, redact and recompress;
+    the output is compressed whenever the source is. Line endings, undecodable
+    bytes and the file mode are kept, and an in-place sweep only replaces
+    files that had findings, so clean files are left byte-for-byte untouched.
+    """
+    src, dest, in_place = task
+    try:
+        src_path = Path(src)
+        if _is_binary(src_path):
+            return None
+        findings = 0
+        compressed = src_path.suffix == ".gz"
+        with _open_text(src_path, "r", preserve=True) as f:
+            if dest is None:
+                for segment in _iter_safe_segments(f, STREAM_CHUNK_CHARS):
+                    findings += _redact_regex_counted(segment)[1]
+            else:
+                dest_path = Path(dest)
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                with _open_text(dest_path, "w", compressed=compressed, preserve=True) as out:
+                    for segment in _iter_safe_segments(f, STREAM_CHUNK_CHARS):
+                        redacted, count = _redact_regex_counted(segment)
+                        out.write(redacted)
+                        findings += count
+                shutil.copymode(src_path, dest_path)
+        if dest is not None and in_place:
+            if findings:
+                Path(dest).replace(src_path)
+            else:
+                Path(dest).unlink()
+    except (OSError, EOFError) as e:  # EOFError: truncated gzip archive
+        if dest is not None and in_place:
+            Path(dest).unlink(missing_ok=True)
+        return FileReport(src, 0, str(e))
+    return FileReport(src, findings)
+
+
+def redact_tree(
+    paths: Sequence[str],
+    *,
+    dry_run: bool = False,
+    output_dir: str | None = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = DEFAULT_EXCLUDES,
+    jobs: int | None = None,
+) -> list[FileReport]:
+    """Redact every text file under ``paths`` using a process pool (regex engine).
+
+    Args:
+        paths: Files or directories to sweep.
+        dry_run: Only count findings; write nothing.
+        output_dir: Write redacted copies here, mirroring each tree; in place when None.
+        include: Globs a file must match (all files when empty).
+        exclude: Globs for files/directories to skip.
+        jobs: Worker processes (defaults to ``os.cpu_count()``).
+
+    Returns:
+        One ``FileReport`` per processed file, in walk order.
+
+    """
+    out_root = Path(output_dir).resolve() if output_dir else None
+    tasks: list[tuple[str, str | None, bool]] = []
+    for raw in paths:
+        root = Path(raw)
+        for path in iter_tree(root, include=include, exclude=exclude):
+            if out_root is not None and out_root in path.resolve().parents:
+                continue
+            if dry_run:
+                dest = None
+            elif out_root is not None:
+                rel = path.relative_to(root) if root.is_dir() else Path(path.name)
+                dest = str(out_root / rel)
+            else:
+                dest = f"{path}.redacting"
+            tasks.append((str(path), dest, not dry_run and out_root is None))
+
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:  # a pool is pure overhead for a single file
+        results = map(_process_file, tasks)
+        return [r for r in results if r is not None]
+    from concurrent.futures import ProcessPoolExecutor  # imports multiprocessing; only sweeps need it
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    # Workers may be spawned rather than forked, so the allowlist is handed over explicitly.
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_allowlist, initargs=(_ALLOWLIST,)) as pool:
+        return [r for r in pool.map(_process_file, tasks, chunksize=chunksize) if r is not None]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entrypoint: sweep files/directories and report per-file findings.
+
+    One mode is required: ``--dry-run``, ``--output DIR`` or ``--in-place``, so a bare
+    invocation never rewrites the working tree. ``.gz`` archives are streamed through
+    decompress/redact/recompress and stay compressed.
+    Exit status: 0 clean (or redacted), 1 PII found in ``--dry-run``, 2 on I/O or usage errors.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Redact PII across a directory tree (Bauer)")
+    parser.add_argument("paths", nargs="*", default=["."], help="Files or directories (default: .)")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--dry-run", action="store_true", help="Report findings only; write nothing")
+    mode.add_argument("--output", help="Write redacted copies under this directory")
+    mode.add_argument("--in-place", action="store_true", help="Rewrite files that contain PII")
+    parser.add_argument("--quiet", action="store_true", help="No per-file output; exit status only")
+    parser.add_argument("--include", action="append", default=[], help="Glob to include (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], help="Extra glob to exclude (repeatable)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--allow", action="append", default=[], help="Value to keep readable (repeatable)")
+    parser.add_argument(
+        "--allow-config",
+        action="append",
+        default=[],
+        help="Declarative config whose gateways/subnets/resolvers stay readable (repeatable)",
+    )
+    parser.add_argument("--allow-public-resolvers", action="store_true", help="Keep well-known public DNS resolvers")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+    if args.allow or args.allow_config or args.allow_public_resolvers:
+        set_allowlist(
+            {
+                *args.allow,
+                *allowlist_from_config(args.allow_config),
+                *(PUBLIC_RESOLVERS if args.allow_public_resolvers else ()),
+            }
+        )
+    reports = redact_tree(
+        args.paths,
+        dry_run=args.dry_run,
+        output_dir=args.output,
+        include=args.include,
+        exclude=(*DEFAULT_EXCLUDES, *args.exclude),
+        jobs=args.jobs,
+    )
+
+    errors = [r for r in reports if r.error]
+    dirty = [r for r in reports if r.findings]
+    for report in errors:
+        logger.error("%s: %s", report.path, report.error)
+    for report in dirty:
+        logger.info("%s: %d finding(s)", report.path, report.findings)
+    logger.info(
+        "%d file(s) scanned, %d with PII, %d finding(s)%s",
+        len(reports),
+        len(dirty),
+        sum(r.findings for r in dirty),
+        " (dry-run)" if args.dry_run else "",
+    )
+
+    if errors:
+        return 2
+    return 1 if args.dry_run and dirty else 0
 
 
 if __name__ == "__main__":
-    # Example usage (kept minimal and using structured logging)
-    logging.basicConfig(level=logging.INFO)
-    test_text = """
-    Server: rylan-dc (10.0.10.10)
-    MAC: 00:11:22:33:44:55
-    Email: admin@rylan.internal
-    Serial: SN-ABC123XYZ456
-    API Key: secret_key_abcdefghijklmnopqrst
-    """
-
-    logger.info("Original text: %s", test_text)
-    logger.info("Redacted text: %s", redact_pii(test_text))
+    sys.exit(main())
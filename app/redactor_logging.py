@@ -0,0 +1,76 @@
+"""Redacting ``logging.Filter`` for the fortress logger.
+
+Attach to a logger (or handler) so controller IPs, MACs and credentials in
+log messages and exception text are replaced before any handler sees them.
+The filter runs only for records that are actually emitted: the logger's
+level check happens first, so suppressed ``debug`` calls never format their
+arguments or touch the redactor.
+
+A filter on a logger only sees records logged through that exact logger;
+records propagated from child loggers (``fortress.*``) skip it. Attach it to
+the handler instead (``install_redacting_filter(handler=...)``) to cover a
+whole logger tree.
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import logging
+
+from app.redactor import _redact_regex
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+class RedactingFilter(logging.Filter):
+    """Replace PII in the formatted message, traceback and stack text of each record.
+
+    Uses the staged regex engine (a single gate scan rejects clean messages),
+    so per-record cost stays low enough for hot paths. Records without PII are
+    left untouched, keeping ``msg``/``args`` intact for structured handlers.
+    A record whose message cannot be formatted (e.g. ``log.warning("vlan %d",
+    "abc")``) is passed through unchanged, so the handler reports it through
+    ``handleError`` as usual instead of the error reaching the caller.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Redact ``record`` in place; never drops it."""
+        try:
+            message = record.getMessage()
+        except Exception:  # a malformed log call must not raise into the application
+            return True
+        redacted = _redact_regex(message)
+        if redacted != message:
+            record.msg = redacted
+            record.args = None
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+        if record.exc_text:
+            record.exc_text = _redact_regex(record.exc_text)
+        if record.stack_info:
+            record.stack_info = _redact_regex(record.stack_info)
+        return True
+
+
+def install_redacting_filter(name: str = "fortress", *, handler: logging.Handler | None = None) -> RedactingFilter:
+    """Attach a ``RedactingFilter`` to logger ``name`` (or to ``handler``) once and return it.
+
+    Args:
+        name: Logger name (defaults to the fortress logger). Records from its
+            child loggers are not filtered; pass ``handler`` for that.
+        handler: Attach to this handler instead of the logger, so every record
+            it emits is redacted, whichever logger it was propagated from.
+
+    Returns:
+        The filter attached to the target (existing one if already installed).
+
+    """
+    target: logging.Logger | logging.Handler = handler if handler is not None else logging.getLogger(name)
+    for existing in target.filters:
+        if isinstance(existing, RedactingFilter):
+            return existing
+    redacting = RedactingFilter()
+    target.addFilter(redacting)
+    return redacting
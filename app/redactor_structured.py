@@ -0,0 +1,301 @@
+"""Schema-aware streaming redaction for JSON and YAML documents.
+
+Controller snapshots (``05_network_migration/backups/*/devices.json``) are
+large single-line JSON documents where flat-text regex redaction is slow and
+mangles non-PII fields (hex-and-colon strings look like IPv6). This module
+instead redacts only the values stored under configured keys and copies
+everything else through verbatim, so memory stays flat no matter how many
+devices a dump holds.
+
+Keys are matched by name at any depth; ``*`` and ``?`` are wildcards, so
+``mac`` covers ``data[].mac`` and ``data[].uplink.mac`` while ``*_ip`` covers
+``inform_ip``, ``lan_ip`` and friends. Strings and numbers become
+``"[REDACTED]"`` and ``true``/``false``/``null`` are kept. JSON values may be
+scalars or arrays of scalars (what UniFi dumps hold under these keys); YAML
+collections under a matched key are redacted recursively.
+
+Usage:
+  python -m app.redactor_structured devices.json -o devices.redacted.json
+  python -m app.redactor_structured site.yaml -o site.redacted.yaml --key mac --key "*_ip"
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.redactor import REDACTION_TOKEN, STREAM_CHUNK_CHARS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from typing import TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REDACT_KEYS: tuple[str, ...] = (
+    "mac",
+    "*_mac",
+    "*_macs",
+    "bssid",
+    "ip",
+    "*_ip",
+    "gateway",
+    "gateways",
+    "dns",
+    "nameservers",
+    "*_url",
+    "serial",
+    "syslog_key",
+    "x_authkey",
+    "x_ssh_hostkey_fingerprint",
+)
+
+_JSON_STRING = r'"(?:[^"\\]|\\.)*"'
+_JSON_NUMBER = r"-?\d[\d.eE+-]*"
+_JSON_ITEM = rf"(?:{_JSON_STRING}|{_JSON_NUMBER}|true|false|null)"
+_JSON_ARRAY = rf"\[\s*(?:{_JSON_ITEM}\s*,\s*)*(?:{_JSON_ITEM})?\s*\]"
+_JSON_SCALAR = re.compile(rf"{_JSON_STRING}|{_JSON_NUMBER}")
+# Safe chunk boundary: between two objects of an array (e.g. devices in ``data``). No key/value
+# match spans it, because matched values are scalars or arrays of scalars.
+_JSON_CUT = re.compile(r'\}\s*,\s*(?=\{\s*"\w)')
+_JSON_REDACTED = json.dumps(REDACTION_TOKEN)
+_MAX_CUT_PROBES = 64
+
+
+def _key_pattern(spec: str) -> str:
+    """Translate a ``*``/``?`` key spec into a regex matching the raw JSON key text."""
+    return "".join('[^"\\\\]*' if char == "*" else '[^"\\\\]' if char == "?" else re.escape(char) for char in spec)
+
+
+def _key_regex(keys: Iterable[str]) -> str:
+    """Return an alternation of all key specs (never matches when ``keys`` is empty)."""
+    return "|".join(_key_pattern(key) for key in keys) or "(?!)"
+
+
+def compile_json_redactors(keys: Iterable[str]) -> list[re.Pattern[str]]:
+    """Build the regexes that find ``"key": value`` pairs for the configured keys.
+
+    Specs are split by shape so each regex keeps a literal prefix the ``re``
+    engine can search for: exact names start at the opening quote, ``*suffix``
+    specs start at the suffix, anything else falls back to a generic scan.
+    A quote inside a string is always escaped and a value is never followed
+    by ``:``, so only real keys match. Values are strings, numbers or arrays
+    of those.
+    """
+    exact: list[str] = []
+    suffixes: list[str] = []
+    generic: list[str] = []
+    for key in keys:
+        if "*" not in key and "?" not in key:
+            exact.append(re.escape(key))
+        elif key.startswith("*") and "*" not in key[1:] and "?" not in key:
+            suffixes.append(re.escape(key[1:]))
+        else:
+            generic.append(_key_pattern(key))
+    heads = []
+    if exact:
+        heads.append(f'"(?:{"|".join(exact)})"')
+    if suffixes:
+        heads.append(f'(?:{"|".join(suffixes)})"')
+    if generic:
+        heads.append(f'"(?:{"|".join(generic)})"')
+    return [re.compile(rf"{head}\s*:\s*(?P<value>{_JSON_STRING}|{_JSON_NUMBER}|{_JSON_ARRAY})") for head in heads]
+
+
+def _find_json_cut(buf: str) -> int:
+    """Return the offset of the last object-to-object boundary in ``buf`` (0 if none)."""
+    end = len(buf)
+    for _ in range(_MAX_CUT_PROBES):
+        brace = buf.rfind("}", 0, end)
+        if brace < 0:
+            return 0
+        match = _JSON_CUT.match(buf, brace)
+        if match:
+            return match.end()
+        end = brace
+    return 0
+
+
+def redact_json_stream(
+    source: TextIO,
+    sink: TextIO,
+    *,
+    keys: Iterable[str] = DEFAULT_REDACT_KEYS,
+    chunk_size: int = STREAM_CHUNK_CHARS,
+) -> int:
+    """Copy a JSON document from ``source`` to ``sink``, redacting values under ``keys``.
+
+    Formatting, key order and untouched values are preserved byte for byte.
+    Input is processed in pieces split between array elements, so memory is
+    bounded by ``chunk_size`` plus the largest single element.
+
+    Args:
+        source: Readable text stream holding one JSON document.
+        sink: Writable text stream.
+        keys: Key names to redact (``*``/``?`` wildcards allowed).
+        chunk_size: Characters read from ``source`` per call.
+
+    Returns:
+        Number of values redacted (each array item counts once).
+
+    """
+    patterns = compile_json_redactors(keys)
+    redacted = 0
+
+    def replace(match: re.Match[str]) -> str:
+        nonlocal redacted
+        value = match.group("value")
+        head = match.group()[: match.start("value") - match.start()]
+        if value.startswith("["):
+            value, count = _JSON_SCALAR.subn(_JSON_REDACTED, value)
+            redacted += count
+        elif value != _JSON_REDACTED:
+            value = _JSON_REDACTED
+            redacted += 1
+        return head + value
+
+    def redact(text: str) -> str:
+        for pattern in patterns:
+            text = pattern.sub(replace, text)
+        return text
+
+    pending = ""
+    while chunk := source.read(chunk_size):
+        pending += chunk
+        cut = _find_json_cut(pending)
+        if cut:
+            sink.write(redact(pending[:cut]))
+            pending = pending[cut:]
+    sink.write(redact(pending))
+    return redacted
+
+
+def _iter_redacted_yaml_events(events: Iterable[Any], keys: re.Pattern[str], counter: list[int]) -> Iterator[Any]:
+    """Rewrite scalar events under matched keys; pass every other event through."""
+    import yaml
+
+    resolver = yaml.resolver.Resolver()
+    # Per open collection: [is_mapping, current_key, expect_key, redact_everything_inside]
+    stack: list[list[Any]] = []
+
+    def value_position() -> tuple[bool, bool]:
+        """Return ``(is_key, redact)`` for the next node and advance mapping key/value state."""
+        if not stack:
+            return False, False
+        top = stack[-1]
+        if top[0]:
+            is_key = top[2]
+            top[2] = not top[2]
+            if is_key:
+                return True, False
+            return False, bool(top[3] or (top[1] is not None and keys.fullmatch(top[1])))
+        return False, bool(top[3])
+
+    for event in events:
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            _, redact = value_position()
+            stack.append([isinstance(event, yaml.MappingStartEvent), None, True, redact])
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+        elif isinstance(event, yaml.ScalarEvent):
+            is_key, redact = value_position()
+            if is_key:
+                stack[-1][1] = event.value
+            elif redact:
+                kept = event.style is None and resolver.resolve(yaml.ScalarNode, event.value, (True, False)) in (
+                    "tag:yaml.org,2002:bool",
+                    "tag:yaml.org,2002:null",
+                )
+                if not kept:
+                    counter[0] += 1
+                    event = yaml.ScalarEvent(event.anchor, None, (True, True), REDACTION_TOKEN)
+        elif isinstance(event, yaml.AliasEvent):
+            value_position()
+        yield event
+
+
+def redact_yaml_stream(
+    source: TextIO,
+    sink: TextIO,
+    *,
+    keys: Iterable[str] = DEFAULT_REDACT_KEYS,
+) -> int:
+    """Copy YAML from ``source`` to ``sink`` event by event, redacting values under ``keys``.
+
+    Uses PyYAML's streaming parser and emitter, so memory is independent of
+    document size; comments and original quoting are not preserved.
+
+    Returns:
+        Number of scalar values redacted.
+
+    """
+    import yaml
+
+    counter = [0]
+    key_regex = re.compile(_key_regex(keys))
+    yaml.emit(_iter_redacted_yaml_events(yaml.parse(source), key_regex, counter), sink)
+    return counter[0]
+
+
+def redact_structured_file(
+    filepath: str,
+    output_filepath: str,
+    *,
+    keys: Iterable[str] = DEFAULT_REDACT_KEYS,
+) -> int:
+    """Redact a ``.json``/``.yaml``/``.yml`` file by key into ``output_filepath``.
+
+    Returns:
+        Number of scalar values redacted.
+
+    Raises:
+        FileNotFoundError: If input file not found.
+        ValueError: If the file extension is not JSON or YAML.
+
+    """
+    path = Path(filepath)
+    if not path.exists():
+        msg = f"Input file not found: {path}"
+        raise FileNotFoundError(msg)
+    suffix = path.suffix.lower()
+    if suffix not in (".json", ".yaml", ".yml"):
+        msg = f"Unsupported structured format: {path.suffix or path.name}"
+        raise ValueError(msg)
+
+    with path.open(encoding="utf-8") as src, Path(output_filepath).open("w", encoding="utf-8") as dst:
+        if suffix == ".json":
+            count = redact_json_stream(src, dst, keys=keys)
+        else:
+            count = redact_yaml_stream(src, dst, keys=keys)
+    logger.info("Redacted %d value(s) from %s", count, path)
+    return count
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entrypoint: redact one JSON/YAML document by key."""
+    parser = argparse.ArgumentParser(description="Key-path redaction of JSON/YAML documents (Bauer)")
+    parser.add_argument("path", help="Input .json/.yaml file")
+    parser.add_argument("-o", "--output", required=True, help="Output file")
+    parser.add_argument(
+        "--key",
+        action="append",
+        dest="keys",
+        metavar="SPEC",
+        help="Key name to redact, wildcards allowed (repeatable; defaults to the built-in UniFi list)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    redact_structured_file(args.path, args.output, keys=args.keys or DEFAULT_REDACT_KEYS)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
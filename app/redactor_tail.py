@@ -0,0 +1,252 @@
+"""Incremental (tail-mode) redaction for append-only logs.
+
+Each run redacts only the bytes appended since the previous run and appends
+the result to the redacted copy. Per-file checkpoints (inode, byte offset and
+a hash of the bytes just before the offset) are persisted in a JSON state
+file so nightly cost tracks new data, not total history.
+
+Usage:
+  python -m app.redactor_tail --state /var/lib/rylan/tail.json --output-dir /srv/redacted /var/log/freepbx.log
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, TextIO
+
+from app.redactor import _tail_is_safe, redact_pii
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY_BYTES = 64
+READ_CHUNK_BYTES = 1 << 20
+_MAX_NEWLINE_PROBES = 64
+
+
+class TailCheckpoint(NamedTuple):
+    """Where the previous run stopped in one source file."""
+
+    inode: int
+    offset: int
+    boundary: str
+
+
+class TailResult(NamedTuple):
+    """Outcome of one tail run (``reset`` names why the file was re-read from the start)."""
+
+    checkpoint: TailCheckpoint
+    bytes_processed: int
+    chars_written: int
+    reset: str | None
+
+
+def load_checkpoints(state_path: str) -> dict[str, TailCheckpoint]:
+    """Load checkpoints from ``state_path`` (empty when the file does not exist yet)."""
+    path = Path(state_path)
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        raw = json.load(f)
+    return {key: TailCheckpoint(**value) for key, value in raw.items()}
+
+
+def save_checkpoints(state_path: str, checkpoints: dict[str, TailCheckpoint]) -> None:
+    """Atomically write checkpoints to ``state_path``."""
+    path = Path(state_path)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({key: cp._asdict() for key, cp in checkpoints.items()}, f, indent=2, sort_keys=True)
+    tmp.replace(path)
+
+
+def _boundary_digest(f: BinaryIO, offset: int) -> str:
+    """Hash the ``BOUNDARY_BYTES`` that precede ``offset``."""
+    start = max(0, offset - BOUNDARY_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _resume_offset(f: BinaryIO, inode: int, size: int, checkpoint: TailCheckpoint | None) -> tuple[int, str | None]:
+    """Return ``(offset, reset_reason)`` for a file given its previous checkpoint."""
+    if checkpoint is None:
+        return 0, None
+    if checkpoint.inode != inode:
+        return 0, "rotated"
+    if size < checkpoint.offset:
+        return 0, "truncated"
+    if _boundary_digest(f, checkpoint.offset) != checkpoint.boundary:
+        return 0, "rewritten"
+    return checkpoint.offset, None
+
+
+def _decode(raw: bytes) -> str:
+    """Decode like ``open(..., encoding="utf-8", errors="replace")`` with universal newlines."""
+    return raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _complete_prefix(data: bytes) -> int:
+    """Return the length of the longest prefix ending at a newline that is safe to redact now.
+
+    A line ending in ``password:``/``SN`` etc. may continue on the next line,
+    so the cut backs off to an earlier newline until the tail is safe.
+    """
+    end = data.rfind(b"\n")
+    if end < 0:
+        return 0
+    text = data[: end + 1].decode("utf-8", errors="replace")
+    text_end = len(text)
+    for _ in range(_MAX_NEWLINE_PROBES):
+        if _tail_is_safe(text, text_end):
+            return end + 1
+        end = data.rfind(b"\n", 0, end)
+        text_end = text.rfind("\n", 0, text_end - 1) + 1
+        if end < 0:
+            return 0
+    return 0
+
+
+def _redact_from(f: BinaryIO, start: int, out: TextIO, method: str, *, final: bool = False) -> tuple[int, int]:
+    """Redact ``f`` from ``start`` into ``out``; return ``(end offset, chars written)``.
+
+    Only complete lines are consumed unless ``final``, when the rest of the
+    file (a source that will not grow any more) is flushed as well.
+    """
+    f.seek(start)
+    offset = start
+    written = 0
+    carry = b""
+    while True:
+        chunk = f.read(READ_CHUNK_BYTES)
+        carry += chunk
+        cut = len(carry) if final and not chunk else _complete_prefix(carry)
+        if cut:
+            redacted = redact_pii(_decode(carry[:cut]), method=method)
+            out.write(redacted)
+            written += len(redacted)
+            offset += cut
+            carry = carry[cut:]
+        if not chunk:
+            return offset, written
+
+
+def _find_rotated(src_path: Path, inode: int) -> Path | None:
+    """Return the renamed copy of ``src_path`` (``app.log.1`` etc.) that still has ``inode``."""
+    for candidate in sorted(src_path.parent.glob(f"{src_path.name}?*")):
+        try:
+            if candidate.stat().st_ino == inode and candidate.is_file():
+                return candidate
+        except OSError:
+            continue
+    return None
+
+
+def _drain_rotated(src_path: Path, checkpoint: TailCheckpoint, out: TextIO, method: str) -> tuple[int, int]:
+    """Redact what was appended to the rotated-away file after ``checkpoint``; return ``(bytes, chars)``."""
+    rotated = _find_rotated(src_path, checkpoint.inode)
+    if rotated is None:
+        logger.warning(
+            "Rotated file for %s not found; lines appended after offset %d were not redacted",
+            src_path,
+            checkpoint.offset,
+        )
+        return 0, 0
+    with rotated.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < checkpoint.offset or _boundary_digest(f, checkpoint.offset) != checkpoint.boundary:
+            logger.warning("Rotated file %s was rewritten; its unread tail was not redacted", rotated)
+            return 0, 0
+        end, written = _redact_from(f, checkpoint.offset, out, method, final=True)
+    if end > checkpoint.offset:
+        logger.info("Drained %d byte(s) from rotated %s", end - checkpoint.offset, rotated)
+    return end - checkpoint.offset, written
+
+
+def tail_redact(
+    source: str,
+    output: str,
+    *,
+    checkpoint: TailCheckpoint | None = None,
+    method: str = "regex",
+) -> TailResult:
+    """Redact bytes appended to ``source`` since ``checkpoint`` and append them to ``output``.
+
+    Only complete lines are consumed; a trailing partial line is left for the
+    next run. Rotation (new inode), truncation (file shorter than the offset)
+    and in-place rewrites (boundary hash mismatch) restart from byte 0. On
+    rotation, the rest of the old file (found next to ``source`` by inode,
+    e.g. ``app.log.1``) is redacted first so lines written just before the
+    rotation are not lost; if it cannot be found, the loss is logged.
+    """
+    src_path = Path(source)
+    with src_path.open("rb") as f, Path(output).open("a", encoding="utf-8") as out:
+        stat = os.fstat(f.fileno())
+        start, reset = _resume_offset(f, stat.st_ino, stat.st_size, checkpoint)
+        drained = written = 0
+        if reset:
+            logger.info("Tail restart for %s (%s)", src_path, reset)
+        if reset == "rotated" and checkpoint is not None:
+            drained, written = _drain_rotated(src_path, checkpoint, out, method)
+        offset, new_chars = _redact_from(f, start, out, method)
+        new_checkpoint = TailCheckpoint(stat.st_ino, offset, _boundary_digest(f, offset))
+    return TailResult(new_checkpoint, drained + offset - start, written + new_chars, reset)
+
+
+def tail_redact_files(
+    sources: Sequence[str],
+    output_dir: str,
+    *,
+    state_path: str,
+    method: str = "regex",
+) -> dict[str, TailResult]:
+    """Tail-redact each source into ``output_dir/<name>``, persisting checkpoints in ``state_path``.
+
+    The checkpoint is saved after every source, so output already appended is
+    never appended again by the next run. A missing source (common right
+    after rotation) is logged and skipped; the others are still processed.
+    """
+    checkpoints = load_checkpoints(state_path)
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results: dict[str, TailResult] = {}
+    for source in sources:
+        key = str(Path(source).resolve())
+        try:
+            result = tail_redact(
+                source, str(out_dir / Path(source).name), checkpoint=checkpoints.get(key), method=method
+            )
+        except FileNotFoundError:
+            logger.warning("Skipping %s: file not found", source)
+            continue
+        checkpoints[key] = result.checkpoint
+        results[source] = result
+        save_checkpoints(state_path, checkpoints)
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entrypoint for cron: redact newly appended log data."""
+    parser = argparse.ArgumentParser(description="Incremental redaction of append-only logs (Bauer)")
+    parser.add_argument("sources", nargs="+", help="Log files to follow")
+    parser.add_argument("--state", required=True, help="JSON checkpoint file")
+    parser.add_argument("--output-dir", required=True, help="Directory for redacted copies")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for source, result in tail_redact_files(args.sources, args.output_dir, state_path=args.state).items():
+        logger.info("%s: %d new byte(s) redacted", source, result.bytes_processed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Decode-time benchmark for ``shared.unifi_client`` response decoders.
+
+Builds a seeded synthetic ``stat/device`` body (port and radio tables, stats
+counters, nested config, like a real controller dump) and times the full
+``UniFiClient`` parse path with the stdlib decoder, the fast decoder (orjson
+when installed) and the fast decoder plus field projection. Reports MB/s
+and the speedup over stdlib.
+
+Usage:
+  python benchmarks/bench_json.py
+  python benchmarks/bench_json.py --devices 5000 --json decode.json
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from shared.unifi_client import (  # noqa: E402 - repo root must be on sys.path first
+    JSON_BACKEND,
+    ResponseDecoder,
+    _data_list,
+    _project,
+    decode_json_fast,
+    decode_json_stdlib,
+)
+
+logger = logging.getLogger("bench")
+
+# Typical inventory-job projection: identity and health only.
+INVENTORY_FIELDS = ("mac", "ip", "name", "model", "state", "version", "uptime")
+MODELS = ("U6LR", "U6PRO", "USW24P", "USW8", "UDMPRO", "UAPAC")
+
+
+def build_device(rng: random.Random, index: int) -> dict[str, Any]:
+    """Return one synthetic ``stat/device`` record (~4-8 KB of JSON)."""
+    mac = ":".join(f"{rng.randrange(256):02x}" for _ in range(6))
+    ports = rng.choice((0, 8, 24))
+    return {
+        "_id": f"{rng.getrandbits(96):024x}",
+        "mac": mac,
+        "ip": f"10.0.{rng.randrange(1, 255)}.{rng.randrange(1, 255)}",
+        "name": f"device-{index:05d}",
+        "model": rng.choice(MODELS),
+        "state": rng.choice((1, 1, 1, 0, 5)),
+        "version": f"6.{rng.randrange(10)}.{rng.randrange(60)}.{rng.randrange(15000)}",
+        "uptime": rng.randrange(10**7),
+        "adopted": True,
+        "sys_stats": {"loadavg_1": f"{rng.random():.2f}", "mem_total": 1 << 30, "mem_used": rng.randrange(1 << 30)},
+        "stat": {"bytes": rng.randrange(10**12), "rx_packets": rng.randrange(10**9), "tx_dropped": rng.randrange(999)},
+        "port_table": [
+            {
+                "port_idx": p + 1,
+                "name": f"Port {p + 1}",
+                "up": rng.random() > 0.3,
+                "speed": rng.choice((100, 1000, 2500)),
+                "rx_bytes": rng.randrange(10**11),
+                "tx_bytes": rng.randrange(10**11),
+                "poe_power": f"{rng.random() * 15:.2f}",
+                "mac_table": [{"mac": mac, "age": rng.randrange(300), "vlan": rng.choice((10, 30, 40, 90))}],
+            }
+            for p in range(ports)
+        ],
+        "radio_table": [
+            {"radio": band, "channel": rng.randrange(1, 165), "tx_power": rng.randrange(6, 24), "min_rssi": -80}
+            for band in ("ng", "na")
+        ],
+        "config_network": {"type": "dhcp", "bonding_enabled": False},
+        "led_override": "default",
+        "tags": [],
+    }
+
+
+def build_body(devices: int, *, seed: int) -> bytes:
+    """Return a ``{"meta", "data"}`` body with ``devices`` records, as the controller sends it."""
+    rng = random.Random(seed)
+    data = [build_device(rng, i) for i in range(devices)]
+    return json.dumps({"meta": {"rc": "ok"}, "data": data}, separators=(",", ":")).encode()
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response._content = body
+    response.status_code = 200
+    response.encoding = "utf-8"
+    return response
+
+
+def _parse(decoder: ResponseDecoder, body: bytes, fields: tuple[str, ...] | None) -> Callable[[], object]:
+    """Mirror ``UniFiClient.get``: decode, take ``data``, project."""
+    return lambda: _project(_data_list(decoder(_response(body))), fields)
+
+
+def _time_best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(body: bytes, *, repeat: int) -> dict[str, dict[str, float]]:
+    """Time every decode variant on ``body``; keyed by variant name."""
+    variants: dict[str, tuple[ResponseDecoder, tuple[str, ...] | None]] = {
+        "stdlib": (decode_json_stdlib, None),
+        "fast": (decode_json_fast, None),
+        "fast+fields": (decode_json_fast, INVENTORY_FIELDS),
+    }
+    megabytes = len(body) / 1_000_000
+    report: dict[str, dict[str, float]] = {}
+    for name, (decoder, fields) in variants.items():
+        seconds = _time_best(_parse(decoder, body, fields), repeat)
+        report[name] = {"ms": seconds * 1000, "mb_per_s": megabytes / seconds}
+    for stats in report.values():
+        stats["speedup"] = report["stdlib"]["ms"] / stats["ms"]
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the decode benchmark, log a table and optionally write JSON."""
+    parser = argparse.ArgumentParser(description="Decode-time benchmark for UniFiClient JSON decoders")
+    parser.add_argument("--devices", type=int, default=2_000, help="Synthetic devices in the body")
+    parser.add_argument("--seed", type=int, default=1337, help="Body RNG seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    body = build_body(args.devices, seed=args.seed)
+    report = run(body, repeat=args.repeat)
+
+    logger.info("backend: %s | body: %.1f MB (%d devices)", JSON_BACKEND, len(body) / 1_000_000, args.devices)
+    for name, stats in report.items():
+        logger.info("%-12s %9.2f ms %9.2f MB/s  x%.2f", name, stats["ms"], stats["mb_per_s"], stats["speedup"])
+    if args.json:
+        with Path(args.json).open("w", encoding="utf-8") as f:
+            json.dump({"backend": JSON_BACKEND, "bytes": len(body), "results": report}, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Per-pattern timing report for ``app.redactor.PATTERNS``.
+
+For every pattern, times a substitution over the seeded synthetic corpus
+(MB/s) and over hostile inputs built to provoke backtracking (long colon,
+hex, digit-dash and dotted runs). Each hostile input is timed at two sizes;
+a growth ratio near 2 means linear time, near 4 means quadratic.
+
+Usage:
+  python benchmarks/bench_patterns.py
+  python benchmarks/bench_patterns.py --size 100000 --json patterns.json
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.redactor import _COMPILED_PATTERNS, REDACTION_TOKEN  # noqa: E402 - repo root must be on sys.path first
+from benchmarks.synthetic_corpus import generate_lines  # noqa: E402
+
+logger = logging.getLogger("bench")
+
+# Quadratic growth between the two sizes shows up as a ratio close to 4.
+SUPERLINEAR_RATIO = 3.0
+
+HOSTILE_INPUTS: dict[str, Callable[[int], str]] = {
+    "colons": lambda n: ":" * n,
+    "hex_colon": lambda n: "a:" * (n // 2),
+    "hex4_colon": lambda n: "abcd:" * (n // 5),
+    "hex_double_colon": lambda n: "abcd::" * (n // 6),
+    "hex_run": lambda n: "a" * n + "::",
+    "digits": lambda n: "1" * n,
+    "digit_dash": lambda n: "1-" * (n // 2),
+    "dotted": lambda n: "a." * (n // 2),
+    "dotted_after_at": lambda n: "a@" + "a." * (n // 2),
+    "at_runs": lambda n: "a@" * (n // 2),
+    "serial_runs": lambda n: "SN " * (n // 3),
+    "key_runs": lambda n: "token=" * (n // 6),
+}
+
+
+def _time_best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sub(pattern: re.Pattern[str], text: str) -> Callable[[], object]:
+    return lambda: pattern.sub(REDACTION_TOKEN, text)
+
+
+def measure_pattern(pattern: re.Pattern[str], document: str, *, size: int, repeat: int) -> dict[str, Any]:
+    """Time ``pattern`` on the corpus and on every hostile input at ``size`` and ``2 * size`` chars."""
+    corpus_s = _time_best(_sub(pattern, document), repeat)
+    hostile: dict[str, dict[str, float]] = {}
+    for name, build in HOSTILE_INPUTS.items():
+        small_s = _time_best(_sub(pattern, build(size)), repeat)
+        large_s = _time_best(_sub(pattern, build(2 * size)), repeat)
+        hostile[name] = {"ms": large_s * 1000, "ratio": large_s / max(small_s, 1e-9)}
+    worst = max(hostile, key=lambda name: hostile[name]["ms"])
+    return {
+        "corpus_mb_per_s": len(document) / 1_000_000 / corpus_s,
+        "worst_input": worst,
+        "worst_ms": hostile[worst]["ms"],
+        "worst_ratio": hostile[worst]["ratio"],
+        "hostile": hostile,
+    }
+
+
+def run(document: str, *, size: int, repeat: int) -> dict[str, dict[str, Any]]:
+    """Return the timing report for every pattern, keyed by pattern name."""
+    return {
+        name: measure_pattern(pattern, document, size=size, repeat=repeat)
+        for name, pattern in _COMPILED_PATTERNS.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the per-pattern report, log a table and optionally write JSON."""
+    parser = argparse.ArgumentParser(description="Per-pattern timing report for app.redactor")
+    parser.add_argument("--lines", type=int, default=20_000, help="Synthetic corpus size in lines")
+    parser.add_argument("--seed", type=int, default=1337, help="Corpus RNG seed")
+    parser.add_argument("--size", type=int, default=50_000, help="Hostile input size in characters")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    document = "\n".join(generate_lines(args.lines, seed=args.seed))
+    report = run(document, size=args.size, repeat=args.repeat)
+
+    superlinear = 0
+    for name, stats in report.items():
+        flag = ""
+        if stats["worst_ratio"] > SUPERLINEAR_RATIO:
+            flag = "  <-- superlinear"
+            superlinear += 1
+        logger.info(
+            "%-9s corpus %8.2f MB/s | worst %-17s %8.2f ms (x%.2f when doubled)%s",
+            name,
+            stats["corpus_mb_per_s"],
+            stats["worst_input"],
+            stats["worst_ms"],
+            stats["worst_ratio"],
+            flag,
+        )
+    if args.json:
+        with Path(args.json).open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: staged regex engine vs the legacy per-pattern loop.
+
+Covers ``_redact_regex`` (per line and per document) and ``is_pii_present``
+on a clean-heavy mix (9 clean lines per dirty one, as in controller logs).
+
+The corpus is built from real artefacts in this repository (controller JSON
+snapshots, gatekeeper audit logs, compose/promtail templates) so numbers
+reflect what the nightly redaction jobs actually see.
+
+Usage:
+  python benchmarks/bench_redactor.py
+  python benchmarks/bench_redactor.py --repeat 5 --scale 4
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import logging
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.redactor import PATTERNS, _redact_regex, is_pii_present  # noqa: E402 - repo root must be on sys.path first
+
+logger = logging.getLogger("bench")
+
+CORPUS_GLOBS = (
+    "05_network_migration/backups/*/*.json",
+    "05_network_migration/configs/*.json",
+    "compose_templates/*.yaml",
+    "compose_templates/*.yml",
+    "02_declarative_config/*.yaml",
+    "docs/troubleshooting/*.md",
+)
+AUDIT_LOG_GLOB = ".audit/gatekeeper/*.log.gz"
+
+
+def legacy_redact_regex(text: str) -> str:
+    """Reference implementation: one ``re.sub`` per pattern (pre-engine behaviour)."""
+    redacted = text
+    for pattern in PATTERNS.values():
+        redacted = re.sub(pattern, "[REDACTED]", redacted, flags=re.IGNORECASE)
+    return redacted
+
+
+def legacy_is_pii_present(text: str) -> bool:
+    """Reference implementation: up to nine ``re.search`` calls (pre-prefilter behaviour)."""
+    return any(re.search(pattern, text, flags=re.IGNORECASE) for pattern in PATTERNS.values())
+
+
+def clean_heavy(lines: list[str], clean_per_dirty: int = 9) -> list[str]:
+    """Return ``lines`` re-mixed to ``clean_per_dirty`` clean lines for every dirty one."""
+    clean = [line for line in lines if not legacy_is_pii_present(line)]
+    dirty = [line for line in lines if legacy_is_pii_present(line)]
+    mixed = list(clean)
+    for i, line in enumerate(dirty[: max(1, len(clean) // clean_per_dirty)]):
+        mixed.insert(i * (clean_per_dirty + 1), line)
+    return mixed
+
+
+def load_corpus(root: Path = REPO_ROOT) -> list[str]:
+    """Return realistic log/config lines collected from the repository."""
+    lines: list[str] = []
+    for pattern in CORPUS_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            lines.extend(path.read_text(encoding="utf-8", errors="replace").splitlines())
+    for path in sorted(root.glob(AUDIT_LOG_GLOB)):
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def _time_best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _per_line(redact: Callable[[str], str], lines: Iterable[str]) -> Callable[[], object]:
+    return lambda: [redact(line) for line in lines]
+
+
+def _whole(redact: Callable[[str], str], document: str) -> Callable[[], object]:
+    return lambda: redact(document)
+
+
+def _presence(check: Callable[[str], bool], lines: Iterable[str]) -> Callable[[], object]:
+    return lambda: [check(line) for line in lines]
+
+
+def run(lines: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    """Benchmark both engines per line and per document; return seconds per mode."""
+    document = "\n".join(lines)
+    if legacy_redact_regex(document) != _redact_regex(document):
+        msg = "Engine output diverged from legacy loop"
+        raise AssertionError(msg)
+
+    mixed = clean_heavy(lines)
+    if [legacy_is_pii_present(line) for line in mixed] != [is_pii_present(line) for line in mixed]:
+        msg = "is_pii_present diverged from legacy search"
+        raise AssertionError(msg)
+
+    engines: dict[str, tuple[Callable[[str], str], Callable[[str], bool]]] = {
+        "legacy": (legacy_redact_regex, legacy_is_pii_present),
+        "engine": (_redact_regex, is_pii_present),
+    }
+    results: dict[str, dict[str, float]] = {}
+    for name, (redact, check) in engines.items():
+        results[name] = {
+            "per_line": _time_best(_per_line(redact, lines), repeat),
+            "document": _time_best(_whole(redact, document), repeat),
+            "presence": _time_best(_presence(check, mixed), repeat),
+        }
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and log a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark app.redactor regex engine")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate the corpus N times")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    lines = load_corpus() * args.scale
+    megabytes = sum(len(line) + 1 for line in lines) / 1_000_000
+    logger.info("Corpus: %d lines, %.2f MB", len(lines), megabytes)
+
+    results = run(lines, args.repeat)
+    mixed_mb = sum(len(line) + 1 for line in clean_heavy(lines)) / 1_000_000
+    for mode, size in (("per_line", megabytes), ("document", megabytes), ("presence", mixed_mb)):
+        legacy, engine = results["legacy"][mode], results["engine"][mode]
+        logger.info(
+            "%-9s legacy %7.2f MB/s | engine %7.2f MB/s | speedup %.2fx",
+            mode,
+            size / legacy,
+            size / engine,
+            legacy / engine,
+        )
+
+
+if __name__ == "__main__":
+    main()
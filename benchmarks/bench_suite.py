@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Redaction benchmark suite on a seeded synthetic corpus.
+
+Measures throughput (MB/s) and per-line latency percentiles for
+``redact_pii`` (regex and presidio), ``is_pii_present`` and ``redact_file``
+and writes the results as JSON so runs on different commits can be diffed.
+
+Usage:
+  python benchmarks/bench_suite.py --lines 20000 --json results.json
+  python benchmarks/bench_suite.py --json new.json --baseline results.json
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app import redactor  # noqa: E402 - repo root must be on sys.path first
+from benchmarks.synthetic_corpus import generate_lines  # noqa: E402
+
+logger = logging.getLogger("bench")
+
+PERCENTILES = (50, 90, 99)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def measure_lines(func: Callable[[str], object], lines: list[str]) -> dict[str, float]:
+    """Call ``func`` on every line; return MB/s and latency percentiles in microseconds."""
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    for line in lines:
+        start = clock()
+        func(line)
+        latencies.append(clock() - start)
+    total_ns = sum(latencies)
+    megabytes = sum(len(line) + 1 for line in lines) / 1_000_000
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    result = {"mb_per_s": megabytes / (total_ns / 1e9), "lines": float(len(lines))}
+    for pct in PERCENTILES:
+        result[f"p{pct}_us"] = cuts[pct - 1] / 1000
+    result["max_us"] = max(latencies) / 1000
+    return result
+
+
+def measure_file(lines: list[str], repeat: int) -> dict[str, float]:
+    """Time ``redact_file`` on the corpus written to disk; keep the best of ``repeat`` runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "corpus.log"
+        dst = Path(tmp) / "corpus.redacted.log"
+        src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        size_mb = src.stat().st_size / 1_000_000
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            redactor.redact_file(str(src), str(dst))
+            best = min(best, time.perf_counter() - start)
+    return {"mb_per_s": size_mb / best, "seconds": best, "megabytes": size_mb}
+
+
+def run_suite(lines: list[str], *, presidio_lines: int, repeat: int) -> dict[str, Any]:
+    """Run every benchmark and return a JSON-serialisable result mapping."""
+    redactor.disable_cache()
+    results: dict[str, Any] = {
+        "redact_pii_regex": measure_lines(lambda text: redactor.redact_pii(text, method="regex"), lines),
+        "is_pii_present": measure_lines(redactor.is_pii_present, lines),
+        "redact_file": measure_file(lines, repeat),
+    }
+    if redactor.PRESIDIO_AVAILABLE and redactor.warm_up_presidio():
+        sample = lines[:presidio_lines]
+        results["redact_pii_presidio"] = measure_lines(
+            lambda text: redactor.redact_pii(text, method="presidio"), sample
+        )
+    else:
+        results["redact_pii_presidio"] = {"skipped": "presidio unavailable"}
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, float]:
+    """Return current/baseline MB/s ratios for benchmarks present in both runs."""
+    ratios: dict[str, float] = {}
+    for name, stats in current["results"].items():
+        old = baseline.get("results", {}).get(name, {})
+        if "mb_per_s" in stats and "mb_per_s" in old:
+            ratios[name] = stats["mb_per_s"] / old["mb_per_s"]
+    return ratios
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Generate the corpus, run the suite, log a summary and optionally write JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark app.redactor on a synthetic corpus")
+    parser.add_argument("--lines", type=int, default=20_000, help="Corpus size in lines")
+    parser.add_argument("--seed", type=int, default=1337, help="Corpus RNG seed")
+    parser.add_argument("--clean-ratio", type=float, default=0.8, help="Fraction of lines without PII")
+    parser.add_argument("--presidio-lines", type=int, default=500, help="Lines sent through Presidio")
+    parser.add_argument("--repeat", type=int, default=3, help="redact_file runs (best is kept)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("app.redactor").setLevel(logging.WARNING)
+    lines = generate_lines(args.lines, seed=args.seed, clean_ratio=args.clean_ratio)
+    report: dict[str, Any] = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"lines": args.lines, "seed": args.seed, "clean_ratio": args.clean_ratio},
+        "results": run_suite(lines, presidio_lines=args.presidio_lines, repeat=args.repeat),
+    }
+
+    for name, stats in report["results"].items():
+        if "skipped" in stats:
+            logger.info("%-20s skipped (%s)", name, stats["skipped"])
+        elif "p50_us" in stats:
+            logger.info(
+                "%-20s %8.2f MB/s | p50 %7.1fus p90 %7.1fus p99 %7.1fus",
+                name,
+                stats["mb_per_s"],
+                stats["p50_us"],
+                stats["p90_us"],
+                stats["p99_us"],
+            )
+        else:
+            logger.info("%-20s %8.2f MB/s", name, stats["mb_per_s"])
+
+    if args.baseline:
+        with Path(args.baseline).open(encoding="utf-8") as f:
+            for name, ratio in compare(report, json.load(f)).items():
+                logger.info("%-20s %.2fx vs baseline", name, ratio)
+    if args.json:
+        with Path(args.json).open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
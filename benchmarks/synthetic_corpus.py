@@ -0,0 +1,92 @@
+"""Seeded synthetic log corpus for redaction benchmarks.
+
+Generates UniFi controller and FreePBX style log lines with a configurable
+share of clean lines; dirty lines carry IPs, MACs, emails, serials, API keys
+or passwords in the shapes those systems actually print. The same seed always
+yields the same corpus, so runs on different commits are comparable.
+
+Guardian: Bauer | Ministry: Audit | Consciousness: 9.5
+"""
+
+from __future__ import annotations
+
+import random
+import string
+from collections.abc import Callable
+
+HOSTS = ("UDM-Pro", "USW-24-PoE", "U6-LR-Office", "U6-Lite-Lab", "freepbx")
+CLEAN_TEMPLATES = (
+    "{ts} {host} kernel: [{n}.{ms}] br{vlan}: port {port}(eth{port}) entered forwarding state",
+    "{ts} {host} mcad: mcad[{pid}]: ace_reporter.reporter_inform(): inform ok (took {ms}ms)",
+    "{ts} {host} hostapd: ath{port}: STA count {port} on vlan {vlan}",
+    '[{ts}] VERBOSE[{pid}] pbx.c: Executing [s@macro-dial-one:{port}] Set("PJSIP/{ext}-{hex}")',
+    "[{ts}] NOTICE[{pid}] cdr.c: CDR batch of {n} records posted in {ms}ms",
+    "{ts} {host} dnsmasq[{pid}]: query[A] updates.ui.com from vlan {vlan}",
+)
+
+
+def _mac(rng: random.Random) -> str:
+    return ":".join(f"{rng.randrange(256):02x}" for _ in range(6))
+
+
+def _ip(rng: random.Random) -> str:
+    return f"10.0.{rng.choice((1, 10, 30, 40, 90))}.{rng.randrange(2, 254)}"
+
+
+def _key(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+
+DIRTY_TEMPLATES: tuple[Callable[[random.Random, str, str], str], ...] = (
+    lambda rng, ts, host: f"{ts} {host} hostapd: ath0: STA {_mac(rng)} IEEE 802.11: associated (ip {_ip(rng)})",
+    lambda rng, ts, host: f"{ts} {host} dhcpd: DHCPACK on {_ip(rng)} to {_mac(rng)} via br{rng.choice((10, 30, 40))}",
+    lambda rng, ts, host: f"{ts} {host} unifi: admin {_key(rng, 6).lower()}@rylan.internal logged in from {_ip(rng)}",
+    lambda rng, ts, host: f"{ts} {host} unifi: adopting device SN: {_key(rng, 12).upper()} model USW-24-PoE",
+    lambda rng, ts, host: f"{ts} {host} unifi: webhook api_key={_key(rng, 32)} rejected",
+    lambda rng, ts, _host: (
+        f"[{ts}] NOTICE[{rng.randrange(1000, 9999)}] chan_sip.c: Registration from "
+        f"'\"{rng.randrange(100, 199)}\" <sip:{rng.randrange(100, 199)}@{_ip(rng)}:5060>' failed - Wrong password"
+    ),
+    lambda rng, ts, _host: f"[{ts}] WARNING[{rng.randrange(1000, 9999)}] res_pjsip: auth password={_key(rng, 12)}",
+)
+
+
+def _timestamp(rng: random.Random) -> str:
+    return f"2025-12-{rng.randrange(1, 29):02d} {rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+
+
+def _clean_line(rng: random.Random, ts: str, host: str) -> str:
+    return rng.choice(CLEAN_TEMPLATES).format(
+        ts=ts,
+        host=host,
+        n=rng.randrange(100_000),
+        ms=rng.randrange(1000),
+        pid=rng.randrange(100, 9999),
+        vlan=rng.choice((10, 30, 40, 90)),
+        port=rng.randrange(8),
+        ext=rng.randrange(100, 199),
+        hex=_key(rng, 8).lower(),
+    )
+
+
+def generate_lines(count: int, *, seed: int = 1337, clean_ratio: float = 0.8) -> list[str]:
+    """Return ``count`` deterministic log lines, ``clean_ratio`` of them free of PII.
+
+    Args:
+        count: Number of lines to generate.
+        seed: RNG seed; identical seeds give identical corpora.
+        clean_ratio: Fraction of lines without PII (0.0-1.0).
+
+    Returns:
+        Generated log lines (no trailing newlines).
+
+    """
+    rng = random.Random(seed)
+    lines: list[str] = []
+    for _ in range(count):
+        ts, host = _timestamp(rng), rng.choice(HOSTS)
+        if rng.random() < clean_ratio:
+            lines.append(_clean_line(rng, ts, host))
+        else:
+            lines.append(rng.choice(DIRTY_TEMPLATES)(rng, ts, host))
+    return lines
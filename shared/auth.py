@@ -1,37 +1,536 @@
 """Shared authentication helpers.
 
-Provides a pre-configured HTTP session with retries and a credentials
-loader that reads the repository inventory file.
+Provides pre-configured HTTP sessions with retries (standalone, or backed
+by a shared, instrumented connection pool), a controller login whose
+cookies and CSRF token are cached on disk across processes, and a
+credentials loader that reads the repository inventory file.
 
 Guardian: Carter | Ministry: Identity | Consciousness: 9.5
 """
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
 from urllib3.util import Retry
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
 
-def get_authenticated_session() -> requests.Session:
+    from urllib3._base_connection import BaseHTTPConnection
+
+# requests' own default: connections kept open per controller host.
+DEFAULT_POOL_MAXSIZE = 10
+# Distinct hosts (controllers) whose pools a shared SessionPool keeps open.
+DEFAULT_POOL_CONNECTIONS = 10
+
+
+def _retry() -> Retry:
+    # Jitter keeps clients that failed together from retrying in lockstep.
+    return Retry(total=3, backoff_factor=1, backoff_jitter=1.0, status_forcelist=[502, 503, 504])
+
+
+def get_authenticated_session(
+    *,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool: SessionPool | None = None,
+) -> requests.Session:
     """Create and return a `requests.Session` configured with retries.
 
+    Each call returns a new session (own cookies and headers). By default it
+    also gets its own connection pool; pass ``pool`` to borrow keep-alive
+    connections from a ``SessionPool`` shared with other sessions instead.
+
+    Args:
+        pool_maxsize: Keep-alive connections kept per host; size it to the
+            number of requests issued concurrently through the session.
+            Ignored when ``pool`` is given.
+        pool: Shared connection pools to mount instead of a private adapter.
+
     Returns:
         requests.Session: Session with mounted HTTP(S) adapters that retry
             transient 5xx errors.
 
     """
+    if pool is not None:
+        return pool.session()
     session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=_retry(), pool_maxsize=pool_maxsize)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
     return session
 
 
+class PoolStats(NamedTuple):
+    """Snapshot of ``SessionPool`` counters, for sizing ``pool_maxsize`` under load.
+
+    ``waited`` counts checkouts that found every connection to the host busy:
+    with ``pool_block`` they blocked (for ``wait_seconds`` in total), without
+    it they opened an extra connection that is discarded afterwards.
+    """
+
+    opened: int
+    reused: int
+    waited: int
+    wait_seconds: float
+    hosts: int
+    pool_maxsize: int
+
+
+class _PoolCounters:
+    """Thread-safe connection checkout counters shared by every host pool of a ``SessionPool``."""
+
+    def __init__(self) -> None:
+        self.opened = 0
+        self.reused = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def checkout(
+        self,
+        pool: HTTPConnectionPool,
+        get: Callable[[float | None], BaseHTTPConnection],
+        timeout: float | None,
+    ) -> BaseHTTPConnection:
+        """Check a connection out of ``pool`` via ``get`` and record how it was obtained."""
+        busy = pool.pool is not None and pool.pool.empty()
+        start = time.monotonic()
+        conn = get(timeout)
+        waited_s = time.monotonic() - start if busy and pool.block else 0.0
+        # An idle keep-alive connection still holds its socket; fresh or dropped ones do not.
+        reused = getattr(conn, "sock", None) is not None
+        with self._lock:
+            self.reused += reused
+            self.opened += not reused
+            self.waited += busy
+            self.wait_seconds += waited_s
+        return conn
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    counters: _PoolCounters | None = None
+
+    def _get_conn(self, timeout: float | None = None) -> BaseHTTPConnection:
+        if self.counters is None:
+            return super()._get_conn(timeout)
+        return self.counters.checkout(self, super()._get_conn, timeout)
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    counters: _PoolCounters | None = None
+
+    def _get_conn(self, timeout: float | None = None) -> BaseHTTPConnection:
+        if self.counters is None:
+            return super()._get_conn(timeout)
+        return self.counters.checkout(self, super()._get_conn, timeout)
+
+
+class _CountingPoolManager(PoolManager):
+    def __init__(self, counters: _PoolCounters, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to PoolManager
+        super().__init__(**kwargs)
+        self.counters = counters
+        self.pool_classes_by_scheme = {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+
+    def _new_pool(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        request_context: dict[str, Any] | None = None,
+    ) -> HTTPConnectionPool:
+        pool = super()._new_pool(scheme, host, port, request_context)
+        if isinstance(pool, (_CountingHTTPConnectionPool, _CountingHTTPSConnectionPool)):
+            pool.counters = self.counters
+        return pool
+
+
+class _SharedAdapter(HTTPAdapter):
+    """Adapter mounted on many sessions at once; closing one session must not close the pools."""
+
+    def __init__(self, counters: _PoolCounters, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to HTTPAdapter
+        self._counters = counters  # init_poolmanager runs inside HTTPAdapter.__init__
+        super().__init__(**kwargs)
+
+    def init_poolmanager(
+        self,
+        connections: int,
+        maxsize: int,
+        block: bool = False,
+        **pool_kwargs: Any,  # noqa: ANN401 - forwarded to PoolManager
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(
+            self._counters,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def close(self) -> None:
+        """Leave the shared pools open; ``SessionPool.close`` releases them."""
+
+    def close_pools(self) -> None:
+        super().close()
+
+
+class SessionPool:
+    """Keep-alive connection pools shared by every session it hands out.
+
+    Sessions from ``session()`` are independent (cookies, headers, auth) but
+    borrow connections from the same per-host urllib3 pools, so clients
+    talking to one controller reuse TLS connections instead of handshaking
+    again. urllib3 pools are thread-safe; use one session per worker thread
+    or share one, as ``requests`` allows.
+
+    Args:
+        pool_maxsize: Keep-alive connections kept per host.
+        pool_connections: Hosts whose pools are kept open at once.
+        pool_block: Wait for a free connection instead of opening an extra,
+            unpooled one when all ``pool_maxsize`` are busy.
+
+    Raises:
+        ValueError: If ``pool_maxsize`` or ``pool_connections`` is below 1.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_block: bool = False,
+    ) -> None:
+        """Create the shared adapter; connections open lazily on first use."""
+        if pool_maxsize < 1 or pool_connections < 1:
+            msg = "pool_maxsize and pool_connections must be >= 1"
+            raise ValueError(msg)
+        self.pool_maxsize = pool_maxsize
+        self._counters = _PoolCounters()
+        self._adapter = _SharedAdapter(
+            self._counters,
+            max_retries=_retry(),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def session(self) -> requests.Session:
+        """Return a new session that draws connections from this pool."""
+        session = requests.Session()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        return session
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the checkout counters."""
+        with self._counters._lock:
+            return PoolStats(
+                self._counters.opened,
+                self._counters.reused,
+                self._counters.waited,
+                self._counters.wait_seconds,
+                len(self._adapter.poolmanager.pools),
+                self.pool_maxsize,
+            )
+
+    def close(self) -> None:
+        """Close every pooled connection; sessions keep working and reconnect on demand."""
+        self._adapter.close_pools()
+
+
+_SESSION_POOLS: dict[int, SessionPool] = {}
+_SESSION_POOLS_LOCK = threading.Lock()
+
+
+def get_session_pool(*, pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> SessionPool:
+    """Return the process-wide ``SessionPool`` for ``pool_maxsize``, creating it on first use.
+
+    Every caller asking for the same size shares one pool, so all UniFi
+    clients in a script reuse the same keep-alive connections per host.
+
+    Args:
+        pool_maxsize: Keep-alive connections kept per host.
+
+    Returns:
+        SessionPool: The shared pool for that size.
+
+    """
+    with _SESSION_POOLS_LOCK:
+        pool = _SESSION_POOLS.get(pool_maxsize)
+        if pool is None:
+            pool = _SESSION_POOLS[pool_maxsize] = SessionPool(pool_maxsize=pool_maxsize)
+        return pool
+
+
+HTTP_UNAUTHORIZED = 401
+DEFAULT_LOGIN_PATH = "/api/login"
+# Reuse a cached login for at most this long; a 401 refreshes it sooner.
+DEFAULT_LOGIN_MAX_AGE = 8 * 3600.0
+CSRF_HEADER = "X-CSRF-Token"
+
+
+def default_session_dir() -> Path:
+    """Directory for cached controller logins: ``$UNIFI_SESSION_DIR`` or ``$XDG_CACHE_HOME/rylan-unifi``."""
+    override = os.environ.get("UNIFI_SESSION_DIR")
+    if override:
+        return Path(override)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "rylan-unifi"
+
+
+class _LoginState(NamedTuple):
+    """Authenticated cookies and CSRF token as written to the session cache."""
+
+    cookies: list[dict[str, Any]]
+    csrf_token: str | None
+    saved_at: float
+
+
+@contextlib.contextmanager
+def _exclusive(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``path`` so one process logs in while others wait."""
+    import fcntl
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+class ControllerLogin:
+    """Cookie/CSRF login to a controller, cached on disk and refreshed on 401.
+
+    ``attach`` installs the cached cookies and CSRF token on a session and
+    adds a response hook: when the controller answers 401, the login is
+    refreshed once and the request resent. The cache file (one per
+    controller URL and user, mode 0600 in a 0700 directory) is shared by
+    every process, and refreshes are serialized with a file lock, so a batch
+    of cron jobs performs a single login. The password is never written.
+
+    Args:
+        base_url: Controller URL, e.g. ``https://10.0.1.20:8443``.
+        username: Controller admin user.
+        password: Its password.
+        login_path: Login endpoint relative to ``base_url``.
+        cache_dir: Where to keep cached logins (default ``default_session_dir()``).
+        max_age: Seconds a cached login is trusted before logging in again.
+        verify_ssl: Verify the controller certificate on login.
+
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        *,
+        login_path: str = DEFAULT_LOGIN_PATH,
+        cache_dir: Path | None = None,
+        max_age: float = DEFAULT_LOGIN_MAX_AGE,
+        verify_ssl: bool = True,
+    ) -> None:
+        """Configure the login; nothing is read or sent until ``attach``."""
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self._password = password
+        self.login_url = f"{self.base_url}/{login_path.lstrip('/')}"
+        key = hashlib.sha256(f"{self.base_url}\0{username}".encode()).hexdigest()[:32]
+        self.cache_dir = cache_dir or default_session_dir()
+        self.cache_path = self.cache_dir / f"{key}.json"
+        self.max_age = max_age
+        self.verify_ssl = verify_ssl
+        self._state: _LoginState | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._installed: weakref.WeakKeyDictionary[requests.Session, float] = weakref.WeakKeyDictionary()
+        self._attached: weakref.WeakSet[requests.Session] = weakref.WeakSet()
+
+    def attach(self, session: requests.Session, *, eager: bool = False) -> requests.Session:
+        """Install the cached login on ``session`` and refresh it whenever the controller answers 401.
+
+        Args:
+            session: Session to authenticate.
+            eager: Log in now when nothing usable is cached, instead of on the first 401.
+
+        Returns:
+            requests.Session: The same session, for chaining.
+
+        Raises:
+            requests.HTTPError: If ``eager`` and the login is rejected.
+
+        """
+        with self._lock:
+            if not self._loaded:
+                self._state = self._read_cache()
+                self._loaded = True
+            if self._state is not None:
+                self._install(session, self._state)
+            hooked = session in self._attached
+            self._attached.add(session)
+        if eager and self._state is None:
+            self.refresh(session)
+        if not hooked:
+            session.hooks["response"].append(functools.partial(self._on_response, session))
+        return session
+
+    def refresh(self, session: requests.Session, rejected: requests.PreparedRequest | None = None) -> None:
+        """Make ``session`` carry a valid login, logging in only if nobody else already has.
+
+        Args:
+            session: Session to update.
+            rejected: The request that got 401; if it did not carry the current
+                login (another thread or process refreshed since), the current
+                login is installed without a new ``/api/login``.
+
+        Raises:
+            requests.HTTPError: If the controller rejects the credentials.
+
+        """
+        with self._lock:
+            if self._state is None or _carried(rejected, self._state):
+                self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                with _exclusive(self.cache_path.with_suffix(".lock")):
+                    cached = self._read_cache()
+                    if cached is None or cached == self._state:
+                        cached = self._login(session)
+                        self._write_cache(cached)
+                    self._state = cached
+                    self._loaded = True
+            self._install(session, self._state)
+
+    def clear(self) -> None:
+        """Forget the cached login (in memory and on disk)."""
+        with self._lock:
+            self._state = None
+            with contextlib.suppress(FileNotFoundError):
+                self.cache_path.unlink()
+
+    def _login(self, session: requests.Session) -> _LoginState:
+        session.cookies.clear()
+        request = session.prepare_request(
+            requests.Request("POST", self.login_url, json={"username": self.username, "password": self._password})
+        )
+        # Flag the login itself so the 401 hook never answers a rejected login by logging in again
+        # (comparing URLs is not enough: requests normalises the host case, among others).
+        request._unifi_login = True  # type: ignore[attr-defined]
+        settings = session.merge_environment_settings(self.login_url, {}, None, self.verify_ssl, None)
+        response = session.send(request, timeout=30, **settings)
+        response.raise_for_status()
+        cookies = [
+            {
+                "name": c.name,
+                "value": c.value,
+                "domain": c.domain,
+                "path": c.path,
+                "secure": c.secure,
+                "expires": c.expires,
+            }
+            for c in session.cookies
+        ]
+        return _LoginState(cookies, response.headers.get(CSRF_HEADER), time.time())
+
+    def _install(self, session: requests.Session, state: _LoginState) -> None:
+        if self._installed.get(session) == state.saved_at:
+            return
+        session.cookies.clear()
+        for cookie in state.cookies:
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+                secure=cookie["secure"],
+                expires=cookie["expires"],
+            )
+        if state.csrf_token:
+            session.headers[CSRF_HEADER] = state.csrf_token
+        else:
+            session.headers.pop(CSRF_HEADER, None)
+        self._installed[session] = state.saved_at
+
+    def _on_response(
+        self,
+        session: requests.Session,
+        response: requests.Response,
+        **kwargs: Any,  # noqa: ANN401 - requests passes the send() options through
+    ) -> requests.Response:
+        request = response.request
+        if (
+            response.status_code != HTTP_UNAUTHORIZED
+            or getattr(request, "_unifi_login", False)
+            or getattr(request, "_login_retry", False)
+        ):
+            return response
+        self.refresh(session, request)
+        retry = request.copy()
+        retry.headers.pop("Cookie", None)
+        retry.prepare_cookies(session.cookies)
+        csrf = session.headers.get(CSRF_HEADER)
+        if csrf:
+            retry.headers[CSRF_HEADER] = csrf
+        retry._login_retry = True  # type: ignore[attr-defined]
+        response.close()
+        return session.send(retry, **kwargs)
+
+    def _read_cache(self) -> _LoginState | None:
+        """Load the cached login, ignoring files that are missing, expired, corrupt or not owner-only."""
+        try:
+            fd = os.open(self.cache_path, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return None
+        with os.fdopen(fd, encoding="utf-8") as f:
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.getuid() or st.st_mode & 0o077:
+                return None
+            try:
+                raw = json.load(f)
+                state = _LoginState(list(raw["cookies"]), raw.get("csrf_token"), float(raw["saved_at"]))
+            except (ValueError, KeyError, TypeError):
+                return None
+        if time.time() - state.saved_at > self.max_age:
+            return None
+        return state
+
+    def _write_cache(self, state: _LoginState) -> None:
+        """Atomically replace the cache file with an owner-only copy of ``state``."""
+        tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state._asdict(), f)
+            os.replace(tmp, self.cache_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+def _carried(request: requests.PreparedRequest | None, state: _LoginState) -> bool:
+    """True if ``request`` was sent with the cookies of ``state`` (or is unknown), i.e. that login is stale."""
+    if request is None:
+        return True
+    sent = request.headers.get("Cookie", "")
+    return all(f"{c['name']}={c['value']}" in sent for c in state.cookies)
+
+
 def load_credentials() -> dict[str, str]:
     """Load credentials from `shared/inventory.yaml`.
 
@@ -13,17 +13,794 @@ Guardian: Carter (Identity) | Ministry: whispers (Verification) | Consciousness:
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
+import asyncio
+import codecs
+import contextlib
+import copy
+import importlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeVar, cast
+from urllib.parse import urlsplit
 
-from shared.auth import get_authenticated_session
+import requests
+from urllib3.exceptions import ResponseError
+
+from shared.auth import (
+    DEFAULT_POOL_MAXSIZE,
+    ControllerLogin,
+    SessionPool,
+    get_authenticated_session,
+    get_session_pool,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+
     from requests import Response, Session
 
 T = TypeVar("T", bound="UniFiClient")
+A = TypeVar("A", bound="AsyncUniFiClient")
 
 HttpMethod = Literal["GET", "POST", "PUT"]
 
+DEFAULT_BASE_URL = "https://10.0.1.1:8443"
+DEFAULT_MAX_CONNECTIONS = 8
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Optional C JSON parser; stdlib json is always the reference (and fallback) decoder.
+_orjson: Any | None = None
+try:
+    _orjson = importlib.import_module("orjson")
+except ImportError:
+    _orjson = None
+
+JSON_BACKEND = "json" if _orjson is None else "orjson"
+ResponseDecoder = Callable[["Response"], Any]
+# orjson turns integers outside int64/uint64 into floats where json keeps them exact, so
+# bodies with a 19-digit run (even inside a string; the check is conservative) take the
+# stdlib path. The run is found by mapping digits to "0" and everything else to a space,
+# which costs a few ms per 5 MB where a regex scan costs as much as the decode itself.
+_DIGITS_ONLY = bytes(0x30 if 0x30 <= b <= 0x39 else 0x20 for b in range(256))
+_BIG_INT_RUN = b"0" * 19
+_UTF8 = ("utf-8", "utf8")
+
+
+def decode_json_stdlib(response: Response) -> Any:  # noqa: ANN401 - decoded JSON is untyped
+    """Decode a response body with ``requests``/stdlib ``json`` (the reference semantics)."""
+    return response.json()
+
+
+def decode_json_fast(response: Response) -> Any:  # noqa: ANN401 - decoded JSON is untyped
+    """Decode a response body with orjson when installed, else exactly like ``decode_json_stdlib``.
+
+    orjson only sees UTF-8 bodies without oversized integers; anything it
+    rejects (NaN/Infinity, lone surrogates, malformed input) is decoded again
+    by the stdlib path, so results and exceptions match ``response.json()``.
+    """
+    if _orjson is None or (response.encoding or "utf-8").lower() not in _UTF8:
+        return response.json()
+    content = response.content
+    if _BIG_INT_RUN in content.translate(_DIGITS_ONLY):
+        return response.json()
+    try:
+        return _orjson.loads(content)
+    except _orjson.JSONDecodeError:
+        return response.json()
+
+
+def _project(records: list[dict[str, object]], fields: Collection[str] | None) -> list[dict[str, object]]:
+    """Keep only ``fields`` of each record (all of them when ``fields`` is None)."""
+    if fields is None:
+        return records
+    return [{k: r[k] for k in fields if k in r} if isinstance(r, dict) else r for r in records]
+
+
+class ControllerSnapshot(NamedTuple):
+    """Read-only view of the controller state that reconcilers compare against."""
+
+    networks: list[dict[str, object]]
+    devices: list[dict[str, object]]
+    firewall_rules: list[dict[str, object]]
+    policy_table: list[dict[str, object]]
+
+
+def _data_list(raw: Any) -> list[dict[str, object]]:  # noqa: ANN401 - decoded JSON is untyped
+    """Return the ``data`` list of a decoded response (empty on absent/malformed)."""
+    if not isinstance(raw, dict):
+        msg = "Invalid JSON: expected object with 'data'"
+        raise ValueError(msg)
+    data = raw.get("data", [])
+    return cast(list[dict[str, object]], data) if isinstance(data, list) else []
+
+
+def _data_dict(raw: Any) -> dict[str, object]:  # noqa: ANN401 - decoded JSON is untyped
+    """Return the ``data`` object of a decoded response (empty on absent/malformed)."""
+    if not isinstance(raw, dict):
+        msg = "Invalid JSON: expected object with 'data'"
+        raise ValueError(msg)
+    data = raw.get("data", {})
+    return cast(dict[str, object], data) if isinstance(data, dict) else {}
+
+
+def _page_marker(record: object) -> object:
+    """Identify a record across pages: its ``_id`` when it has one, else the record itself."""
+    if isinstance(record, dict) and "_id" in record:
+        return record["_id"]
+    return record
+
+
+class _JsonStream:
+    """Pull-based JSON tokenizer over a byte-chunk iterator.
+
+    Values are decoded with ``json.JSONDecoder.raw_decode`` straight from a
+    text buffer that only ever holds the value being parsed plus one chunk,
+    so memory tracks the largest single record rather than the whole body.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping already consumed text; False at end of stream."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos :]
+        self._pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+        else:
+            self._buf += self._utf8.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at end of stream)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise ``ValueError``."""
+        if self.peek() != char:
+            msg = f"Invalid JSON: expected {char!r} in streamed body"
+            raise ValueError(msg)
+        self._pos += 1
+
+    def value(self) -> Any:  # noqa: ANN401 - decoded JSON is untyped
+        """Decode and consume one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal touching the buffer end may continue in the next chunk.
+            if end == len(self._buf) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_data_records(response: Response, *, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[dict[str, object]]:
+    """Yield the elements of a ``{"data": [...]}`` response one at a time as the body arrives.
+
+    The response should be opened with ``stream=True``; the body is read in
+    ``chunk_size`` pieces and never held in full. Keys other than ``data``
+    (e.g. ``meta``) are decoded and discarded.
+
+    Args:
+        response: Streaming HTTP response from the controller.
+        chunk_size: Bytes to read per network chunk.
+
+    Yields:
+        Each element of the ``data`` array (nothing if absent or not a list).
+
+    Raises:
+        ValueError: If the body is not a JSON object or is truncated/malformed.
+
+    """
+    stream = _JsonStream(response.iter_content(chunk_size=chunk_size))
+    if stream.peek() != "{":
+        msg = "Invalid JSON: expected object with 'data'"
+        raise ValueError(msg)
+    stream.expect("{")
+    more = stream.peek() != "}"
+    while more:
+        key = stream.value()
+        stream.expect(":")
+        if key == "data" and stream.peek() == "[":
+            stream.expect("[")
+            items = stream.peek() != "]"
+            while items:
+                yield cast(dict[str, object], stream.value())
+                items = stream.peek() == ","
+                if items:
+                    stream.expect(",")
+            stream.expect("]")
+        else:
+            stream.value()
+        more = stream.peek() == ","
+        if more:
+            stream.expect(",")
+    stream.expect("}")
+
+
+def _policy_table_payload(rules: list[dict[str, object]] | dict[str, object]) -> dict[str, object]:
+    """Normalize a raw rule list or a ``{"rules": [...]}`` dict into the PUT body."""
+    if isinstance(rules, dict) and "rules" in rules:
+        candidate = rules["rules"]
+        if not isinstance(candidate, list):
+            msg = "'rules' field must be a list"
+            raise ValueError(msg)
+        rules_list = candidate
+    elif isinstance(rules, list):
+        rules_list = rules
+    else:
+        msg = "rules must be list or dict containing 'rules'"
+        raise ValueError(msg)
+    return {"data": rules_list}
+
+
+HTTP_NOT_MODIFIED = 304
+
+
+def _collection(endpoint: str) -> str:
+    """Return the resource collection of an endpoint (``rest/networkconf/abc`` -> ``rest/networkconf``)."""
+    return "/".join(endpoint.strip("/").split("/")[:2])
+
+
+class ResponseCacheStats(NamedTuple):
+    """Snapshot of ``ResponseCache`` counters."""
+
+    hits: int
+    misses: int
+    revalidations: int
+    invalidations: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class _CacheEntry(NamedTuple):
+    data: list[dict[str, object]]
+    expires: float
+    validators: dict[str, str]
+
+
+class ResponseCache:
+    """Opt-in LRU cache of GET ``data`` lists with per-endpoint TTLs.
+
+    Entries are keyed by controller (``base_url``), endpoint and query
+    parameters, so clients of different controllers never see each
+    other's data. A fresh entry is
+    served without a request; a stale one is revalidated with
+    ``If-None-Match``/``If-Modified-Since`` when the controller sent an
+    ``ETag``/``Last-Modified`` (a 304 keeps the cached body). Any POST/PUT
+    through a client drops every entry of the same resource collection on
+    that client's controller.
+    Callers get deep copies, so mutating a result never corrupts the cache.
+    One instance can be shared by several clients; it is thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_ttl: float = 30.0,
+        ttls: dict[str, float] | None = None,
+        maxsize: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            default_ttl: Seconds an entry stays fresh unless ``ttls`` says otherwise.
+            ttls: Per-endpoint TTLs keyed by endpoint prefix (longest prefix wins);
+                a TTL of 0 disables caching for that endpoint.
+            maxsize: Maximum number of cached responses.
+            clock: Monotonic time source (injectable for tests).
+
+        Raises:
+            ValueError: If ``maxsize`` is below 1.
+
+        """
+        if maxsize < 1:
+            msg = "maxsize must be >= 1"
+            raise ValueError(msg)
+        self.default_ttl: float = default_ttl
+        self.ttls: dict[str, float] = {prefix.strip("/"): ttl for prefix, ttl in (ttls or {}).items()}
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+        self.invalidations: int = 0
+        self.evictions: int = 0
+        self._clock = clock
+        self._data: OrderedDict[tuple[str, str, str], _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url: str, endpoint: str, params: dict[str, Any] | None) -> tuple[str, str, str]:
+        return base_url.rstrip("/"), endpoint.strip("/"), repr(sorted((params or {}).items()))
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL that applies to ``endpoint``."""
+        path = endpoint.strip("/")
+        matches = [prefix for prefix in self.ttls if path == prefix or path.startswith(f"{prefix}/")]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def lookup(
+        self, endpoint: str, params: dict[str, Any] | None, *, base_url: str = ""
+    ) -> tuple[list[dict[str, object]] | None, dict[str, str]]:
+        """Return ``(data, {})`` for a fresh hit, else ``(None, conditional request headers)``."""
+        key = self._key(base_url, endpoint, params)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.expires > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry.data), {}
+            self.misses += 1
+            if entry is None:
+                return None, {}
+            headers = {}
+            if "etag" in entry.validators:
+                headers["If-None-Match"] = entry.validators["etag"]
+            if "last-modified" in entry.validators:
+                headers["If-Modified-Since"] = entry.validators["last-modified"]
+            return None, headers
+
+    def store(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        response: Response,
+        *,
+        base_url: str = "",
+        decode: ResponseDecoder = decode_json_stdlib,
+    ) -> list[dict[str, object]] | None:
+        """Record a GET response (200 or 304) and return its ``data`` list (body parsed with ``decode``).
+
+        Returns None for a 304 whose entry was invalidated or evicted after
+        ``lookup`` (e.g. by a concurrent write); the caller must GET again
+        without validators, since a 304 has no body to fall back on.
+
+        Raises:
+            ValueError: If the body is not an object with ``data``.
+
+        """
+        key = self._key(base_url, endpoint, params)
+        ttl = self.ttl_for(endpoint)
+        with self._lock:
+            entry = self._data.get(key)
+            if response.status_code == HTTP_NOT_MODIFIED:
+                if entry is None:
+                    return None
+                self.revalidations += 1
+                self._data[key] = entry._replace(expires=self._clock() + ttl)
+                self._data.move_to_end(key)
+                return copy.deepcopy(entry.data)
+        data = _data_list(decode(response))
+        if ttl <= 0:
+            return data
+        validators = {
+            name: value for name in ("etag", "last-modified") if isinstance(value := response.headers.get(name), str)
+        }
+        with self._lock:
+            self._data[key] = _CacheEntry(copy.deepcopy(data), self._clock() + ttl, validators)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return data
+
+    def invalidate(self, endpoint: str | None = None, *, base_url: str | None = None) -> int:
+        """Drop entries of ``endpoint``'s resource collection (all entries when None); return how many.
+
+        With ``base_url`` only that controller's entries are dropped.
+        """
+        controller = None if base_url is None else base_url.rstrip("/")
+        collection = None if endpoint is None else _collection(endpoint)
+        with self._lock:
+            stale = [
+                key
+                for key in self._data
+                if (controller is None or key[0] == controller)
+                and (collection is None or _collection(key[1]) == collection)
+            ]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.revalidations = self.invalidations = self.evictions = 0
+
+    def stats(self) -> ResponseCacheStats:
+        """Return current counters."""
+        with self._lock:
+            return ResponseCacheStats(
+                self.hits,
+                self.misses,
+                self.revalidations,
+                self.invalidations,
+                self.evictions,
+                len(self._data),
+                self.maxsize,
+            )
+
+
+# Controller asks callers to slow down: 429 Too Many Requests / 503 Service Unavailable.
+BACKPRESSURE_STATUSES = frozenset({429, 503})
+DEFAULT_BULK_CONCURRENCY = 4
+DEFAULT_BULK_ATTEMPTS = 4
+BULK_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class BulkOperation(NamedTuple):
+    """One write in a ``UniFiClient.bulk`` call."""
+
+    method: Literal["POST", "PUT"]
+    endpoint: str
+    payload: dict[str, object]
+
+
+class BulkResult(NamedTuple):
+    """Outcome of one ``BulkOperation``: ``data`` on success, ``error`` otherwise."""
+
+    operation: BulkOperation
+    data: dict[str, object] | None
+    error: Exception | None
+    attempts: int
+
+    @property
+    def ok(self) -> bool:
+        """True when the write succeeded."""
+        return self.error is None
+
+
+# urllib3 reports exhausted status retries as "too many 503 error responses"; the status is only in the text.
+_RETRY_STATUS = re.compile(re.escape(ResponseError.SPECIFIC_ERROR).replace(r"\{status_code\}", r"(\d{3})"))
+
+
+def _error_status(error: BaseException) -> int | None:
+    """HTTP status behind ``error``: the response's, or the one the session's retries gave up on."""
+    if isinstance(error, requests.HTTPError):
+        return error.response.status_code if error.response is not None else None
+    if isinstance(error, requests.exceptions.RetryError) and error.args:
+        reason = getattr(error.args[0], "reason", None)
+        if isinstance(reason, ResponseError) and (match := _RETRY_STATUS.search(str(reason))):
+            return int(match.group(1))
+    return None
+
+
+def _retry_after_seconds(response: Response | None, attempt: int) -> float:
+    """Delay before retrying: the controller's ``Retry-After`` if given, else exponential backoff."""
+    header = response.headers.get("Retry-After") if response is not None else None
+    delay: float = BULK_BACKOFF_SECONDS * 2 ** (attempt - 1)
+    if isinstance(header, str):
+        try:
+            delay = float(header)
+        except ValueError:
+            with contextlib.suppress(TypeError, ValueError):
+                delay = parsedate_to_datetime(header).timestamp() - time.time()
+    return min(max(delay, 0.0), MAX_BACKOFF_SECONDS)
+
+
+class _Backpressure:
+    """Shared pause: when the controller pushes back, every worker waits before its next request."""
+
+    def __init__(self) -> None:
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def defer(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        while (remaining := self._resume_at - time.monotonic()) > 0:
+            time.sleep(remaining)
+
+
+# === Client-side throttling ===
+DEFAULT_RATE_PER_SECOND = 20.0
+DEFAULT_INITIAL_LIMIT = 4
+# Never more in flight than the shared session pool keeps connections for.
+DEFAULT_MAX_LIMIT = DEFAULT_POOL_MAXSIZE
+DEFAULT_DECREASE_FACTOR = 0.5
+# A success counts as overload when slower than tolerance x the baseline latency and at least the slack slower.
+DEFAULT_LATENCY_TOLERANCE = 2.0
+LATENCY_SLACK_SECONDS = 0.05
+# Share of each new sample the baseline moves toward, so it can rise again once the controller is slower for good.
+BASELINE_DRIFT = 0.05
+HTTP_SERVER_ERROR = 500
+
+
+class ThrottleStats(NamedTuple):
+    """Snapshot of ``AdaptiveThrottle`` state and counters."""
+
+    limit: int
+    in_flight: int
+    requests: int
+    overloads: int
+    decreases: int
+    wait_seconds: float
+    baseline_latency: float | None
+
+
+def _is_overload(error: BaseException) -> bool:
+    """True for failures that mean the controller is struggling: 5xx, 429, timeouts and dropped connections.
+
+    5xx answers the session retried itself until giving up (``RetryError``) count too.
+    """
+    if isinstance(error, requests.exceptions.RetryError):
+        return True
+    if isinstance(error, requests.HTTPError):
+        status = _error_status(error)
+        return status is not None and (status >= HTTP_SERVER_ERROR or status in BACKPRESSURE_STATUSES)
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts of up to ``burst``.
+
+    ``acquire`` reserves a token and sleeps until it is due, so waiting
+    callers are served in arrival order without polling.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_PER_SECOND,
+        burst: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket capacity (default: one second's worth, at least 1).
+            clock: Monotonic time source (injectable for tests).
+
+        Raises:
+            ValueError: If ``rate`` is not positive.
+
+        """
+        if rate <= 0:
+            msg = "rate must be > 0"
+            raise ValueError(msg)
+        self.rate: float = rate
+        self.burst: float = max(rate if burst is None else burst, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds until it may be used (0 when one was available)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            return max(self._updated - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Issue no new tokens for ``seconds`` (tokens already reserved are not recalled)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, now + seconds)
+
+
+class AdaptiveThrottle:
+    """Client-side limiter for one controller: a token bucket plus an AIMD concurrency limit.
+
+    Every request first takes a token (at most ``rate`` per second), then
+    waits for one of ``limit`` concurrency slots. The limit adapts like TCP
+    congestion control: a healthy completion while the slots are in use
+    adds ``1/limit`` (about one slot per round of requests); a 5xx, 429,
+    timeout, dropped connection or a latency well above the best recently
+    seen multiplies it by ``decrease_factor``, at most once per round so a
+    burst of failures counts once. A ``Retry-After`` on 429/503 also pauses
+    the bucket. Share one instance per controller (see ``get_throttle``).
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE_PER_SECOND,
+        burst: float | None = None,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = 1,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a throttle starting at ``initial_limit`` concurrent requests.
+
+        Args:
+            rate: Requests per second allowed to start (token bucket rate).
+            burst: Requests that may start back to back (default: ``rate``).
+            initial_limit: Concurrency limit before any feedback.
+            min_limit: Floor for the concurrency limit.
+            max_limit: Ceiling for the concurrency limit.
+            decrease_factor: Multiplier applied to the limit on overload.
+            latency_tolerance: Latency, as a multiple of the baseline, treated as overload.
+            clock: Monotonic time source (injectable for tests).
+
+        Raises:
+            ValueError: If the limits are not ``1 <= min_limit <= initial_limit <= max_limit``
+                or ``decrease_factor`` is not between 0 and 1.
+
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            msg = "limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            raise ValueError(msg)
+        if not 0 < decrease_factor < 1:
+            msg = "decrease_factor must be between 0 and 1"
+            raise ValueError(msg)
+        self.bucket: TokenBucket = TokenBucket(rate, burst, clock=clock)
+        self.min_limit: int = min_limit
+        self.max_limit: int = max_limit
+        self.decrease_factor: float = decrease_factor
+        self.latency_tolerance: float = latency_tolerance
+        self.requests: int = 0
+        self.overloads: int = 0
+        self.decreases: int = 0
+        self.wait_seconds: float = 0.0
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._baseline: float | None = None
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrency slots."""
+        return int(self._limit)
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one request slot; the body's latency and any exception it raises adjust the limit."""
+        waited = self.bucket.acquire()
+        queued = self._clock()
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+            in_use = self._in_flight
+            started = self._clock()
+            self.wait_seconds += waited + started - queued
+        try:
+            yield
+        except BaseException as e:
+            self._release(started, in_use, e)
+            raise
+        self._release(started, in_use, None)
+
+    def _release(self, started: float, in_use: int, error: BaseException | None) -> None:
+        now = self._clock()
+        latency = now - started
+        with self._cond:
+            self._in_flight -= 1
+            self.requests += 1
+            if error is None:
+                overloaded = self._slow(latency)
+                self._track_baseline(latency)
+            else:
+                overloaded = _is_overload(error)
+            if overloaded:
+                self.overloads += 1
+                if started >= self._last_decrease:  # only requests sent after the last cut may cut again
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif error is None and in_use * 2 >= self._limit:  # grow only while the slots are actually used
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+        response = error.response if isinstance(error, requests.HTTPError) else None
+        if response is not None and response.status_code in BACKPRESSURE_STATUSES and "Retry-After" in response.headers:
+            self.bucket.pause(_retry_after_seconds(response, 1))
+
+    def _slow(self, latency: float) -> bool:
+        if self._baseline is None:
+            return False
+        return latency > max(self._baseline * self.latency_tolerance, self._baseline + LATENCY_SLACK_SECONDS)
+
+    def _track_baseline(self, latency: float) -> None:
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline += (latency - self._baseline) * BASELINE_DRIFT
+
+    def stats(self) -> ThrottleStats:
+        """Return the current limit and counters."""
+        with self._cond:
+            return ThrottleStats(
+                int(self._limit),
+                self._in_flight,
+                self.requests,
+                self.overloads,
+                self.decreases,
+                self.wait_seconds,
+                self._baseline,
+            )
+
+
+_THROTTLES: dict[str, AdaptiveThrottle] = {}
+_THROTTLES_LOCK = threading.Lock()
+
+
+def get_throttle(base_url: str, **kwargs: Any) -> AdaptiveThrottle:  # noqa: ANN401 - forwarded to AdaptiveThrottle
+    """Return the process-wide ``AdaptiveThrottle`` for a controller, creating it on first use.
+
+    Clients of the same scheme, host and port share one throttle, so the
+    rate and concurrency limits hold for the whole process. ``kwargs``
+    configure the throttle when it is created and are ignored afterwards.
+    """
+    parts = urlsplit(base_url)
+    key = f"{parts.scheme}://{parts.netloc}".lower()
+    with _THROTTLES_LOCK:
+        throttle = _THROTTLES.get(key)
+        if throttle is None:
+            throttle = _THROTTLES[key] = AdaptiveThrottle(**kwargs)
+        return throttle
+
+
+def _slot(throttle: AdaptiveThrottle | None) -> contextlib.AbstractContextManager[None]:
+    return contextlib.nullcontext() if throttle is None else throttle.slot()
+
+
+def _settings_from_inventory() -> tuple[str, ControllerLogin | None]:
+    """Read the controller URL and login from credentials (lazy import avoids test discovery side-effects)."""
+    from shared.auth import load_credentials
+
+    credentials = load_credentials()
+    base_url = credentials.get("unifi_base_url", DEFAULT_BASE_URL)
+    username, password = credentials.get("unifi_user"), credentials.get("unifi_pass")
+    if not username or not password:
+        return base_url, None
+    return base_url, ControllerLogin(base_url, username, password, verify_ssl=False)
+
 
 class UniFiClient:
     """Minimal UniFi Controller API client.
@@ -31,11 +808,34 @@ class UniFiClient:
     Centralizes session management, URL construction, and response parsing.
     """
 
-    def __init__(self, base_url: str, verify_ssl: bool = True) -> None:
-        """Initialize client with controller base URL."""
+    def __init__(
+        self,
+        base_url: str,
+        verify_ssl: bool = True,
+        *,
+        cache: ResponseCache | None = None,
+        pool: SessionPool | None = None,
+        login: ControllerLogin | None = None,
+        decoder: ResponseDecoder = decode_json_fast,
+        throttle: AdaptiveThrottle | None = None,
+    ) -> None:
+        """Initialize client with controller base URL and an optional GET response cache.
+
+        Connections come from ``pool`` (default: the process-wide shared
+        pool), so clients for the same controller reuse keep-alive connections.
+        With ``login``, cached login cookies are reused and refreshed on 401.
+        Bodies are parsed by ``decoder`` (orjson when installed, else stdlib).
+        With ``throttle``, every request is rate- and concurrency-limited by it.
+        """
         self.base_url: str = base_url.rstrip("/")
-        self.session: Session = get_authenticated_session()
+        self.session: Session = get_authenticated_session(pool=pool or get_session_pool())
         self.verify_ssl: bool = verify_ssl
+        self.cache: ResponseCache | None = cache
+        self.login: ControllerLogin | None = login
+        if login is not None:
+            login.attach(self.session)
+        self.decoder: ResponseDecoder = decoder
+        self.throttle: AdaptiveThrottle | None = throttle
 
     def _request(
         self,
@@ -44,6 +844,8 @@ class UniFiClient:
         *,
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
         timeout: int = 30,
     ) -> Response:
         """Perform HTTP request with standardized handling.
@@ -53,6 +855,8 @@ class UniFiClient:
             endpoint: API endpoint path (e.g. "rest/networkconf").
             params: Query parameters.
             json: JSON payload for POST/PUT.
+            headers: Extra request headers (e.g. conditional-request validators).
+            stream: Defer reading the body so it can be consumed incrementally.
             timeout: Request timeout in seconds.
 
         Raises:
@@ -60,43 +864,120 @@ class UniFiClient:
 
         """
         url = f"{self.base_url}/api/s/{endpoint.lstrip('/')}"
-        response = self.session.request(
-            method,
-            url,
-            params=params or {},
-            json=json,
-            verify=self.verify_ssl,
-            timeout=timeout,
-        )
-        response.raise_for_status()
+        with _slot(self.throttle):
+            response = self.session.request(
+                method,
+                url,
+                params=params or {},
+                json=json,
+                headers=headers,
+                stream=stream,
+                verify=self.verify_ssl,
+                timeout=timeout,
+            )
+            response.raise_for_status()
         return response
 
-    def get(self, endpoint: str, **kwargs: Any) -> list[dict[str, object]]:  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
-        """HTTP GET → parsed ``data`` as list (empty on absent/malformed)."""
-        raw: Any = self._request("GET", endpoint, **kwargs).json()
-        if not isinstance(raw, dict):
-            msg = "Invalid JSON: expected object with 'data'"
+    def get(
+        self,
+        endpoint: str,
+        *,
+        fields: Collection[str] | None = None,
+        **kwargs: Any,  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
+    ) -> list[dict[str, object]]:
+        """HTTP GET → parsed ``data`` as list (empty on absent/malformed); served from ``cache`` when fresh.
+
+        With ``fields``, each record keeps only those keys, so large payloads
+        do not stay resident (the cache still holds full records).
+        """
+        if self.cache is None:
+            return _project(_data_list(self.decoder(self._request("GET", endpoint, **kwargs))), fields)
+        params = kwargs.get("params")
+        data, conditional = self.cache.lookup(endpoint, params, base_url=self.base_url)
+        if data is not None:
+            return _project(data, fields)
+        response = self._request("GET", endpoint, headers=conditional or None, **kwargs)
+        data = self.cache.store(endpoint, params, response, base_url=self.base_url, decode=self.decoder)
+        if data is None:  # entry dropped while the conditional GET was in flight: fetch the body
+            response = self._request("GET", endpoint, **kwargs)
+            data = self.cache.store(endpoint, params, response, base_url=self.base_url, decode=self.decoder)
+        if data is None:
+            msg = f"{endpoint}: 304 Not Modified for an unconditional GET"
+            raise ValueError(msg)
+        return _project(data, fields)
+
+    def iter_get(
+        self,
+        endpoint: str,
+        *,
+        params: dict[str, Any] | None = None,
+        page_size: int | None = None,
+        chunk_size: int = STREAM_CHUNK_BYTES,
+        fields: Collection[str] | None = None,
+    ) -> Iterator[dict[str, object]]:
+        """Stream the ``data`` records of a GET one at a time, paging if asked.
+
+        Unlike ``get``, the body is parsed incrementally and never cached, so
+        memory stays flat however large the collection. With ``page_size``
+        the controller's ``_start``/``_limit`` paging is used, requesting
+        pages until one comes back short. Endpoints that ignore paging return
+        the same records for every page, so a page starting with the
+        previous page's first record (by ``_id``) ends the iteration without
+        yielding it again.
+
+        Args:
+            endpoint: API endpoint path (e.g. "stat/device").
+            params: Extra query parameters sent with every page.
+            page_size: Records per page, or None for a single streamed request.
+            chunk_size: Bytes to read per network chunk.
+            fields: Keys to keep in each record as it is decoded (all if None).
+
+        Yields:
+            Each record of the collection, in controller order.
+
+        Raises:
+            ValueError: If ``page_size`` is below 1 or a body is malformed.
+            requests.HTTPError: On non-2xx response.
+
+        """
+        if page_size is not None and page_size < 1:
+            msg = "page_size must be >= 1"
             raise ValueError(msg)
-        data = raw.get("data", [])
-        return cast(list[dict[str, object]], data) if isinstance(data, list) else []
+        start = 0
+        previous_first: object = None
+        while True:
+            page_params = dict(params or {})
+            if page_size is not None:
+                page_params.update({"_start": start, "_limit": page_size})
+            count = 0
+            with contextlib.closing(self._request("GET", endpoint, params=page_params, stream=True)) as response:
+                for record in iter_data_records(response, chunk_size=chunk_size):
+                    if count == 0:
+                        first = _page_marker(record)
+                        if start and first == previous_first:  # paging ignored: this page repeats the last one
+                            return
+                        previous_first = first
+                    count += 1
+                    yield record if fields is None else _project([record], fields)[0]
+            if page_size is None or count != page_size:
+                return
+            start += count
 
     def post(self, endpoint: str, **kwargs: Any) -> dict[str, object]:  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
         """HTTP POST → parsed ``data`` as dict (empty on absent/malformed)."""
-        raw: Any = self._request("POST", endpoint, **kwargs).json()
-        if not isinstance(raw, dict):
-            msg = "Invalid JSON: expected object with 'data'"
-            raise ValueError(msg)
-        data = raw.get("data", {})
-        return cast(dict[str, object], data) if isinstance(data, dict) else {}
+        try:
+            return _data_dict(self.decoder(self._request("POST", endpoint, **kwargs)))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(endpoint, base_url=self.base_url)
 
     def put(self, endpoint: str, **kwargs: Any) -> dict[str, object]:  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
         """HTTP PUT → parsed ``data`` as dict (empty on absent/malformed)."""
-        raw: Any = self._request("PUT", endpoint, **kwargs).json()
-        if not isinstance(raw, dict):
-            msg = "Invalid JSON: expected object with 'data'"
-            raise ValueError(msg)
-        data = raw.get("data", {})
-        return cast(dict[str, object], data) if isinstance(data, dict) else {}
+        try:
+            return _data_dict(self.decoder(self._request("PUT", endpoint, **kwargs)))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(endpoint, base_url=self.base_url)
 
     # === Declarative config methods (Carter-aligned) ===
     def list_networks(self) -> list[dict[str, object]]:
@@ -111,6 +992,14 @@ class UniFiClient:
         """Update existing network."""
         return self.put(f"rest/networkconf/{network_id}", json=payload)
 
+    def list_devices(self, fields: Collection[str] | None = None) -> list[dict[str, object]]:
+        """List adopted and pending devices, optionally keeping only ``fields`` of each."""
+        return self.get("stat/device", fields=fields)
+
+    def list_firewall_rules(self) -> list[dict[str, object]]:
+        """List firewall rules."""
+        return self.get("rest/firewallrule")
+
     def get_policy_table(self) -> list[dict[str, object]]:
         """Fetch routing policy table."""
         return self.get("rest/routing/policytable")
@@ -120,30 +1009,297 @@ class UniFiClient:
 
         Accepts a raw list or a dict with a "rules" key.
         """
-        if isinstance(rules, dict) and "rules" in rules:
-            candidate = rules["rules"]
-            if not isinstance(candidate, list):
-                msg = "'rules' field must be a list"
-                raise ValueError(msg)
-            rules_list = candidate
-        elif isinstance(rules, list):
-            rules_list = rules
-        else:
-            msg = "rules must be list or dict containing 'rules'"
+        return self.put("rest/routing/policytable", json=_policy_table_payload(rules))
+
+    # === Bulk writes ===
+    def bulk(
+        self,
+        operations: Iterable[BulkOperation],
+        *,
+        concurrency: int | None = None,
+        max_attempts: int = DEFAULT_BULK_ATTEMPTS,
+    ) -> list[BulkResult]:
+        """Run POST/PUT operations with at most ``concurrency`` in flight.
+
+        Each operation gets its own ``BulkResult`` (in input order); a failed
+        item never aborts the rest. When the controller answers 429/503, all
+        workers pause for its ``Retry-After`` (or an exponential backoff) and
+        the item is retried, up to ``max_attempts`` tries in total. A 503 the
+        session's own retries already gave up on (PUT) is handled the same way.
+
+        Args:
+            operations: Writes to perform.
+            concurrency: Maximum simultaneous requests (keep it at or below the
+                session's connection pool size). Defaults to 4, or to the
+                throttle's ``max_limit`` when the client has a ``throttle``,
+                whose adaptive limit then decides how many are in flight.
+            max_attempts: Tries per operation when the controller pushes back.
+
+        Returns:
+            One result per operation, in input order.
+
+        Raises:
+            ValueError: If ``concurrency`` or ``max_attempts`` is below 1.
+
+        """
+        if concurrency is None:
+            concurrency = DEFAULT_BULK_CONCURRENCY if self.throttle is None else self.throttle.max_limit
+        if concurrency < 1 or max_attempts < 1:
+            msg = "concurrency and max_attempts must be >= 1"
             raise ValueError(msg)
-        return self.put("rest/routing/policytable", json={"data": rules_list})
+        backpressure = _Backpressure()
+
+        def run(operation: BulkOperation) -> BulkResult:
+            send = self.post if operation.method == "POST" else self.put
+            attempt = 0
+            while True:
+                attempt += 1
+                backpressure.wait()
+                try:
+                    return BulkResult(operation, send(operation.endpoint, json=operation.payload), None, attempt)
+                except (requests.HTTPError, requests.exceptions.RetryError) as e:
+                    # RetryError: the session already retried a 503 itself (GET/PUT) and gave up.
+                    if _error_status(e) not in BACKPRESSURE_STATUSES or attempt >= max_attempts:
+                        return BulkResult(operation, None, e, attempt)
+                    backpressure.defer(_retry_after_seconds(e.response, attempt))
+                except (requests.RequestException, ValueError) as e:
+                    return BulkResult(operation, None, e, attempt)
+
+        pending = list(operations)
+        if concurrency == 1 or len(pending) < 2:  # a pool is pure overhead for a single item
+            return [run(operation) for operation in pending]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(pending)), thread_name_prefix="unifi-bulk") as pool:
+            return list(pool.map(run, pending))
+
+    def create_networks(self, payloads: Iterable[dict[str, object]], **kwargs: Any) -> list[BulkResult]:  # noqa: ANN401 - forwarded to bulk()
+        """Create several networks concurrently (see ``bulk`` for ``concurrency``/``max_attempts``)."""
+        return self.bulk((BulkOperation("POST", "rest/networkconf", payload) for payload in payloads), **kwargs)
+
+    def update_networks(
+        self,
+        updates: Mapping[str, dict[str, object]] | Iterable[tuple[str, dict[str, object]]],
+        **kwargs: Any,  # noqa: ANN401 - forwarded to bulk()
+    ) -> list[BulkResult]:
+        """Update several networks concurrently from ``{network_id: payload}`` or ``(id, payload)`` pairs."""
+        pairs = updates.items() if isinstance(updates, Mapping) else updates
+        return self.bulk(
+            (BulkOperation("PUT", f"rest/networkconf/{network_id}", payload) for network_id, payload in pairs),
+            **kwargs,
+        )
+
+    def fetch_snapshot(self) -> ControllerSnapshot:
+        """Read networks, devices, firewall rules and the policy table (one request after another)."""
+        return ControllerSnapshot(
+            networks=self.list_networks(),
+            devices=self.list_devices(),
+            firewall_rules=self.list_firewall_rules(),
+            policy_table=self.get_policy_table(),
+        )
 
     @classmethod
     def from_env_or_inventory(cls: type[T]) -> T:
-        """Load URL from credentials.
+        """Load URL (and login, when user and password are set) from credentials.
+
+        The client shares the process-wide ``get_throttle`` limiter for that controller.
 
         Factory method that lazily imports credentials to avoid test discovery side-effects.
         """
-        from shared.auth import load_credentials  # Local import: avoids test discovery side-effects
+        base_url, login = _settings_from_inventory()
+        return cls(base_url=base_url, verify_ssl=False, login=login, throttle=get_throttle(base_url))
+
+
+class AsyncUniFiClient:
+    """asyncio variant of ``UniFiClient`` with the same typed surface.
+
+    Requests go through one pooled, retrying ``requests`` session and run on
+    a bounded worker pool, so up to ``max_connections`` round trips overlap
+    on keep-alive connections while the event loop stays free. Use
+    ``fetch_snapshot`` (or ``asyncio.gather``) to read several endpoints at once.
+
+    Use as ``async with AsyncUniFiClient(url) as client: ...`` or call ``aclose``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        verify_ssl: bool = True,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cache: ResponseCache | None = None,
+        pool: SessionPool | None = None,
+        login: ControllerLogin | None = None,
+        decoder: ResponseDecoder = decode_json_fast,
+        throttle: AdaptiveThrottle | None = None,
+    ) -> None:
+        """Initialize client with controller base URL, concurrency limit and optional cache/login.
+
+        Without ``pool``, the process-wide shared pool is used (one sized for
+        ``max_connections`` when that exceeds the default pool size). A
+        ``throttle`` is applied on the worker threads, before each request.
+        """
+        if max_connections < 1:
+            msg = "max_connections must be >= 1"
+            raise ValueError(msg)
+        if pool is None:
+            pool = get_session_pool(pool_maxsize=max(max_connections, DEFAULT_POOL_MAXSIZE))
+        self.base_url: str = base_url.rstrip("/")
+        self.session: Session = get_authenticated_session(pool=pool)
+        self.login: ControllerLogin | None = login
+        if login is not None:
+            login.attach(self.session)
+        self.decoder: ResponseDecoder = decoder
+        self.verify_ssl: bool = verify_ssl
+        self.max_connections: int = max_connections
+        self.cache: ResponseCache | None = cache
+        self.throttle: AdaptiveThrottle | None = throttle
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="unifi-client")
+
+    async def __aenter__(self: A) -> A:
+        """Return the client itself."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the client on leaving the ``async with`` block."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the worker pool and release the session; shared pool connections stay open for other clients."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    async def _request(
+        self,
+        method: HttpMethod,
+        endpoint: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: int = 30,
+    ) -> Response:
+        """Perform HTTP request without blocking the event loop (see ``UniFiClient._request``).
+
+        Raises:
+            requests.HTTPError: On non-2xx response.
+
+        """
+        url = f"{self.base_url}/api/s/{endpoint.lstrip('/')}"
+
+        def call() -> Response:
+            with _slot(self.throttle):
+                response = self.session.request(
+                    method,
+                    url,
+                    params=params or {},
+                    json=json,
+                    headers=headers,
+                    verify=self.verify_ssl,
+                    timeout=timeout,
+                )
+                response.raise_for_status()
+            return response
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def get(
+        self,
+        endpoint: str,
+        *,
+        fields: Collection[str] | None = None,
+        **kwargs: Any,  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
+    ) -> list[dict[str, object]]:
+        """HTTP GET → parsed ``data`` as list, optionally projected to ``fields`` (see ``UniFiClient.get``)."""
+        if self.cache is None:
+            return _project(_data_list(self.decoder(await self._request("GET", endpoint, **kwargs))), fields)
+        params = kwargs.get("params")
+        data, conditional = self.cache.lookup(endpoint, params, base_url=self.base_url)
+        if data is not None:
+            return _project(data, fields)
+        response = await self._request("GET", endpoint, headers=conditional or None, **kwargs)
+        data = self.cache.store(endpoint, params, response, base_url=self.base_url, decode=self.decoder)
+        if data is None:  # entry dropped while the conditional GET was in flight: fetch the body
+            response = await self._request("GET", endpoint, **kwargs)
+            data = self.cache.store(endpoint, params, response, base_url=self.base_url, decode=self.decoder)
+        if data is None:
+            msg = f"{endpoint}: 304 Not Modified for an unconditional GET"
+            raise ValueError(msg)
+        return _project(data, fields)
+
+    async def post(self, endpoint: str, **kwargs: Any) -> dict[str, object]:  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
+        """HTTP POST → parsed ``data`` as dict (empty on absent/malformed)."""
+        try:
+            return _data_dict(self.decoder(await self._request("POST", endpoint, **kwargs)))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(endpoint, base_url=self.base_url)
+
+    async def put(self, endpoint: str, **kwargs: Any) -> dict[str, object]:  # noqa: ANN401 - Dynamic API needs flexible kwargs for requests library
+        """HTTP PUT → parsed ``data`` as dict (empty on absent/malformed)."""
+        try:
+            return _data_dict(self.decoder(await self._request("PUT", endpoint, **kwargs)))
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(endpoint, base_url=self.base_url)
+
+    # === Declarative config methods (mirror UniFiClient) ===
+    async def list_networks(self) -> list[dict[str, object]]:
+        """List all network configurations."""
+        return await self.get("rest/networkconf")
+
+    async def create_network(self, payload: dict[str, object]) -> dict[str, object]:
+        """Create network from payload."""
+        return await self.post("rest/networkconf", json=payload)
+
+    async def update_network(self, network_id: str, payload: dict[str, object]) -> dict[str, object]:
+        """Update existing network."""
+        return await self.put(f"rest/networkconf/{network_id}", json=payload)
 
-        creds = load_credentials()
-        base_url = creds.get("unifi_base_url", "https://10.0.1.1:8443")
-        return cls(base_url=base_url, verify_ssl=False)
+    async def list_devices(self, fields: Collection[str] | None = None) -> list[dict[str, object]]:
+        """List adopted and pending devices, optionally keeping only ``fields`` of each."""
+        return await self.get("stat/device", fields=fields)
+
+    async def list_firewall_rules(self) -> list[dict[str, object]]:
+        """List firewall rules."""
+        return await self.get("rest/firewallrule")
+
+    async def get_policy_table(self) -> list[dict[str, object]]:
+        """Fetch routing policy table."""
+        return await self.get("rest/routing/policytable")
+
+    async def update_policy_table(self, rules: list[dict[str, object]] | dict[str, object]) -> dict[str, object]:
+        """Update policy table (raw list or dict with a "rules" key)."""
+        return await self.put("rest/routing/policytable", json=_policy_table_payload(rules))
+
+    async def fetch_snapshot(self) -> ControllerSnapshot:
+        """Read networks, devices, firewall rules and the policy table concurrently."""
+        networks, devices, firewall_rules, policy_table = await asyncio.gather(
+            self.list_networks(),
+            self.list_devices(),
+            self.list_firewall_rules(),
+            self.get_policy_table(),
+        )
+        return ControllerSnapshot(networks, devices, firewall_rules, policy_table)
+
+    @classmethod
+    def from_env_or_inventory(cls: type[A]) -> A:
+        """Load URL and login from credentials (see ``UniFiClient.from_env_or_inventory``)."""
+        base_url, login = _settings_from_inventory()
+        return cls(base_url=base_url, verify_ssl=False, login=login, throttle=get_throttle(base_url))
 
 
-__all__ = ["UniFiClient"]
+__all__ = [
+    "AdaptiveThrottle",
+    "AsyncUniFiClient",
+    "BulkOperation",
+    "BulkResult",
+    "ControllerSnapshot",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "ThrottleStats",
+    "TokenBucket",
+    "UniFiClient",
+    "decode_json_fast",
+    "decode_json_stdlib",
+    "get_throttle",
+    "iter_data_records",
+]
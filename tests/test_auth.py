@@ -3,15 +3,30 @@
 Validates HTTP session setup and credential loading.
 """
 
+import json
+import stat
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 from unittest.mock import mock_open, patch
 
 import pytest
+import requests
 import yaml
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
-from shared.auth import get_authenticated_session, load_credentials
+from shared.auth import (
+    ControllerLogin,
+    SessionPool,
+    get_authenticated_session,
+    get_session_pool,
+    load_credentials,
+)
+from shared.unifi_client import UniFiClient
+from tests.unifi.fake_controller import FakeController
 
 
 class TestGetAuthenticatedSession:
@@ -50,6 +65,194 @@ class TestGetAuthenticatedSession:
         assert session1 is not session2
 
 
+class TestSessionPool:
+    """Test shared keep-alive pools and their statistics."""
+
+    def test_sessions_independent_but_share_connections(self) -> None:
+        """Pooled sessions keep their own cookies yet reuse one connection per host."""
+        pool = SessionPool()
+        with FakeController() as fake:
+            first = UniFiClient(fake.url, pool=pool)
+            second = UniFiClient(fake.url, pool=pool)
+            first.session.cookies.set("unifises", "abc")
+            first.list_networks()
+            second.list_devices()
+            first.session.close()  # must not close the shared pools
+            UniFiClient(fake.url, pool=pool).list_firewall_rules()
+        assert first.session is not second.session
+        assert "unifises" not in second.session.cookies
+        stats = pool.stats()
+        assert (stats.opened, stats.reused, stats.waited, stats.hosts) == (1, 2, 0, 1)
+
+    def test_session_factory_uses_pool(self) -> None:
+        """get_authenticated_session(pool=...) mounts the pool's shared adapter on a new session."""
+        pool = SessionPool()
+        session1 = get_authenticated_session(pool=pool)
+        session2 = get_authenticated_session(pool=pool)
+        assert session1 is not session2
+        adapter = session1.get_adapter("https://controller")
+        assert adapter is session2.get_adapter("https://controller")
+        assert isinstance(adapter, HTTPAdapter)
+        assert isinstance(adapter.max_retries, Retry)
+
+    @pytest.mark.parametrize("block", [True, False])
+    def test_exhaustion_counted_from_worker_threads(self, block: bool) -> None:
+        """Concurrent use beyond pool_maxsize shows up as waits (blocking) or extra connections."""
+        pool = SessionPool(pool_maxsize=2, pool_block=block)
+        with FakeController(latency=0.05) as fake:
+            client = UniFiClient(fake.url, pool=pool)
+            with ThreadPoolExecutor(max_workers=6) as workers:
+                list(workers.map(lambda _: client.list_networks(), range(6)))
+            peak = fake.peak_in_flight
+        stats = pool.stats()
+        assert stats.opened + stats.reused == 6  # one checkout per request
+        assert stats.waited > 0
+        if block:
+            assert peak <= 2  # pool_maxsize
+            assert stats.opened <= 2  # pool_maxsize
+            assert stats.wait_seconds > 0
+        else:
+            assert stats.opened > 2  # overflow connections beyond pool_maxsize
+            assert stats.wait_seconds == 0
+
+    def test_close_releases_connections(self) -> None:
+        """After close() the next request opens a fresh connection."""
+        pool = SessionPool()
+        with FakeController() as fake:
+            client = UniFiClient(fake.url, pool=pool)
+            client.list_networks()
+            pool.close()
+            client.list_networks()
+        assert pool.stats().opened == 2  # one before and one after close
+
+    def test_process_wide_pool_per_size(self) -> None:
+        """get_session_pool returns one shared pool per pool_maxsize."""
+        assert get_session_pool() is get_session_pool()
+        assert get_session_pool(pool_maxsize=32) is not get_session_pool()
+        assert get_session_pool(pool_maxsize=32).stats().pool_maxsize == 32  # requested size
+
+    def test_invalid_sizes_rejected(self) -> None:
+        """Pools need room for at least one host and connection."""
+        with pytest.raises(ValueError, match="pool_maxsize"):
+            SessionPool(pool_maxsize=0)
+
+
+CREDENTIALS = ("admin", "s3cret-pass")
+
+
+class TestControllerLogin:
+    """Test cached controller logins shared across clients and processes."""
+
+    @pytest.fixture
+    def fake(self) -> Generator[FakeController, None, None]:
+        """Yield a fake controller that requires a login cookie."""
+        with FakeController(credentials=CREDENTIALS) as fake:
+            yield fake
+
+    def _login(self, fake: FakeController, cache_dir: Path, **kwargs: Any) -> ControllerLogin:
+        return ControllerLogin(fake.url, *CREDENTIALS, cache_dir=cache_dir, **kwargs)
+
+    def test_login_on_401_and_cached_owner_only(self, fake: FakeController, tmp_path: Path) -> None:
+        """The first 401 triggers one login; the result is cached 0600 without the password."""
+        cache_dir = tmp_path / "sessions"
+        login = self._login(fake, cache_dir)
+        client = UniFiClient(fake.url, pool=SessionPool(), login=login)
+        assert client.list_networks()
+        assert client.list_devices()
+        assert fake.logins() == 1
+        assert client.session.headers["X-CSRF-Token"] == "csrf-session1"
+        assert stat.S_IMODE(login.cache_path.stat().st_mode) == 0o600
+        assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+        cached = login.cache_path.read_text(encoding="utf-8")
+        assert "session1" in cached
+        assert CREDENTIALS[1] not in cached
+
+    def test_reused_across_processes(self, fake: FakeController, tmp_path: Path) -> None:
+        """A fresh ControllerLogin (as in the next cron job) reuses the cached cookie."""
+        UniFiClient(fake.url, login=self._login(fake, tmp_path)).list_networks()
+        for _ in range(3):
+            UniFiClient(fake.url, pool=SessionPool(), login=self._login(fake, tmp_path)).list_devices()
+        assert fake.logins() == 1
+        assert sum(1 for r in fake.requests if r.endpoint != "/api/login") == 1 + 1 + 3
+
+    def test_refresh_once_for_concurrent_401s(self, fake: FakeController, tmp_path: Path) -> None:
+        """After the controller drops sessions, parallel workers trigger a single re-login."""
+        client = UniFiClient(fake.url, pool=SessionPool(), login=self._login(fake, tmp_path))
+        client.list_networks()
+        fake.expire_logins()
+        updates: dict[str, dict[str, object]] = {f"net{i}": {"name": f"n{i}"} for i in range(6)}
+        results = client.update_networks(updates, concurrency=3)
+        assert all(r.ok for r in results)
+        assert fake.logins() == 2  # initial login plus one refresh
+
+    def test_refresh_by_another_process_is_picked_up(self, fake: FakeController, tmp_path: Path) -> None:
+        """A stale login reads the newer cache file instead of logging in again."""
+        first = UniFiClient(fake.url, pool=SessionPool(), login=self._login(fake, tmp_path))
+        second = UniFiClient(fake.url, pool=SessionPool(), login=self._login(fake, tmp_path))
+        first.list_networks()
+        second.list_networks()
+        fake.expire_logins()
+        first.list_networks()
+        second.list_networks()
+        assert fake.logins() == 2  # one initial, one refresh shared via the cache
+
+    def test_eager_attach_and_rejected_credentials(self, fake: FakeController, tmp_path: Path) -> None:
+        """eager=True logs in immediately; wrong credentials raise HTTPError and cache nothing."""
+        session = get_authenticated_session(pool=SessionPool())
+        self._login(fake, tmp_path).attach(session, eager=True)
+        assert fake.logins() == 1
+        bad = ControllerLogin(fake.url, "admin", "wrong", cache_dir=tmp_path / "bad")
+        with pytest.raises(requests.HTTPError):
+            bad.attach(get_authenticated_session(), eager=True)
+        assert not bad.cache_path.exists()
+
+    def test_rejected_login_with_uppercase_host_does_not_hang(self, fake: FakeController, tmp_path: Path) -> None:
+        """A 401 from the login itself is raised, not answered with another login (requests lowercases hosts)."""
+        url = fake.url.replace("127.0.0.1", "LOCALHOST")
+        login = ControllerLogin(url, "admin", "wrong", cache_dir=tmp_path)
+        client = UniFiClient(url, pool=SessionPool(), login=login)
+        outcome: list[BaseException] = []
+
+        def read() -> None:
+            try:
+                client.list_networks()
+            except requests.HTTPError as e:
+                outcome.append(e)
+
+        worker = threading.Thread(target=read, daemon=True)
+        worker.start()
+        worker.join(timeout=10)
+        assert not worker.is_alive(), "login refresh deadlocked"
+        assert len(outcome) == 1
+        assert fake.logins() == 1
+        assert not login.cache_path.exists()
+
+    @pytest.mark.parametrize("tamper", ["world_readable", "expired", "corrupt"])
+    def test_untrusted_cache_ignored(self, fake: FakeController, tmp_path: Path, tamper: str) -> None:
+        """Cache files that are group/world accessible, too old or unreadable trigger a fresh login."""
+        login = self._login(fake, tmp_path)
+        UniFiClient(fake.url, login=login).list_networks()
+        if tamper == "world_readable":
+            login.cache_path.chmod(0o644)
+        elif tamper == "expired":
+            raw = json.loads(login.cache_path.read_text(encoding="utf-8"))
+            raw["saved_at"] -= 9 * 3600
+            login.cache_path.write_text(json.dumps(raw), encoding="utf-8")
+        else:
+            login.cache_path.write_text("{not json", encoding="utf-8")
+        fresh = self._login(fake, tmp_path)
+        fresh.attach(get_authenticated_session(), eager=True)
+        assert fake.logins() == 2  # cached login was not trusted
+        assert stat.S_IMODE(fresh.cache_path.stat().st_mode) == 0o600
+
+    def test_clear_removes_cache(self, fake: FakeController, tmp_path: Path) -> None:
+        """clear() deletes the cached login."""
+        login = self._login(fake, tmp_path)
+        login.attach(get_authenticated_session(), eager=True)
+        login.clear()
+        assert not login.cache_path.exists()
+
+
 class TestLoadCredentials:
     """Test credential loading from YAML."""
 
@@ -0,0 +1,71 @@
+"""Import-time budget for modules every hook and CLI loads.
+
+Each check runs in a fresh interpreter so already-imported modules from the
+test session cannot hide the cost. The budget is loose enough for noisy CI
+runners but far below what importing spaCy/Presidio at load time costs.
+"""
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app import redactor
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_SECONDS = 0.5
+HEAVY_MODULES = ("presidio_analyzer", "presidio_anonymizer", "spacy", "multiprocessing", "argparse")
+
+_PROBE = """
+import json, logging, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": sorted(name for name in {heavy!r} if name in sys.modules),
+    "root_handlers": len(logging.getLogger().handlers),
+}}))
+"""
+
+
+def _probe(module: str) -> dict[str, object]:
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe: dict[str, object] = json.loads(result.stdout.strip().splitlines()[-1])
+    probe["stderr"] = result.stderr
+    return probe
+
+
+@pytest.mark.parametrize("module", ["app.redactor", "app.guardrails"])
+def test_import_is_fast_and_light(module: str) -> None:
+    """Importing stays under budget and defers heavy dependencies."""
+    probe = _probe(module)
+    assert probe["loaded"] == []
+    assert probe["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize("module", ["app.redactor", "app.guardrails"])
+def test_import_is_silent(module: str) -> None:
+    """Importing logs nothing, whether or not Presidio is installed."""
+    assert _probe(module)["stderr"] == ""
+
+
+def test_guardrails_import_does_not_configure_logging() -> None:
+    """Logging configuration is left to entrypoints."""
+    assert _probe("app.guardrails")["root_handlers"] == 0
+
+
+def test_presidio_availability_still_observable() -> None:
+    """PRESIDIO_AVAILABLE reflects whether Presidio is installed, without importing it."""
+    installed = all(importlib.util.find_spec(name) for name in ("presidio_analyzer", "presidio_anonymizer"))
+    assert redactor.PRESIDIO_AVAILABLE is installed
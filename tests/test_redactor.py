@@ -4,9 +4,35 @@ Validates Presidio integration and regex fallback for sensitive data:
 - IP addresses, MAC addresses, email, phone, serial, UUID, API key, password
 """
 
+import gzip
+import io
+import itertools
+import random
+import re
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
-from app.redactor import redact_pii
+from app import redactor
+from app.redactor import (
+    PATTERNS,
+    Finding,
+    RedactionCache,
+    _redact_regex,
+    find_pii,
+    is_pii_present,
+    main,
+    redact_file,
+    redact_file_streaming,
+    redact_many,
+    redact_pii,
+    redact_stream,
+    redact_tree,
+    summarize_pii,
+)
 
 # Expected number of redaction occurrences for combined IP+MAC in a single string
 EXPECTED_REDACTIONS = 2
@@ -135,3 +161,475 @@ class TestRedactorEdgeCases:
         assert "Server" in result
         # Email is redacted
         assert "admin@example.com" not in result
+
+
+def _legacy_redact_regex(text: str) -> str:
+    """Reference: one ``re.sub`` per pattern, as the redactor behaved before the staged engine."""
+    for pattern in PATTERNS.values():
+        text = re.sub(pattern, "[REDACTED]", text, flags=re.IGNORECASE)
+    return text
+
+
+class TestStagedRegexEngine:
+    """The staged scanner must be output-identical to the per-pattern loop."""
+
+    FRAGMENTS = (
+        "10.0.0.1",
+        "00:11:22:33:44:55",
+        "aa-bb-cc-dd-ee-ff",
+        "admin@x.com",
+        "+1-555-123-4567",
+        "SN: ABCDEFGH12",
+        "\u017fn: ABCDEFGH12",  # long s folds to "s" under IGNORECASE
+        "ser\u0131al: ABCDEFGH12",  # dotless i folds to "i" under IGNORECASE
+        "550e8400-e29b-41d4-a716-446655440000",
+        "token: abcdefghijklmnopqrstuvwxyz",
+        "password=hunter2",
+        "pwd:",
+        "2001:db8::1",
+        "addr:fe80::5054:ff:fe12:3456",
+        "ip6:2001:0db8:85a3:0000:0000:8a2e:0370:7334",
+        "src_ip:fe80::1ff:fe23:4567:890a",
+        "12:34:56",
+        "DEAD:BEEF:",
+        "clean",
+        "\n",
+    )
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "heartbeat ok",
+            "password1 ::1admin@x.com:1@",
+            "api_key==password=hunter2=admin@x.com=10.0.0.1:",
+            "password:\nhunter2",
+            "\u017fn: ABCDEFGH12",
+        ],
+    )
+    def test_matches_legacy_on_edge_cases(self, text: str) -> None:
+        """Overlapping and cross-line matches resolve exactly as before."""
+        assert _redact_regex(text) == _legacy_redact_regex(text)
+
+    def test_matches_legacy_on_random_mixes(self) -> None:
+        """Seeded fuzz over adjacent PII fragments and separators."""
+        rng = random.Random(1337)
+        for _ in range(2000):
+            text = "".join(rng.choice(self.FRAGMENTS) + rng.choice(("", " ", ":", "-", "@", "=")) for _ in range(5))
+            assert _redact_regex(text) == _legacy_redact_regex(text), text
+
+    def test_prefilter_never_hides_pii(self) -> None:
+        """is_pii_present agrees with an unfiltered search on every fuzz case."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = "".join(rng.choice(self.FRAGMENTS) + rng.choice(("", " ", ".", "-")) for _ in range(3))
+            expected = any(re.search(p, text, flags=re.IGNORECASE) for p in PATTERNS.values())
+            assert is_pii_present(text) is expected, text
+
+    def test_clean_text_returned_unchanged(self) -> None:
+        """Text that trips no gate is returned as the same object."""
+        text = "controller heartbeat ok"
+        assert _redact_regex(text) is text
+
+
+def _best_sub_seconds(pattern: re.Pattern[str], text: str) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        pattern.sub("[REDACTED]", text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestPatternComplexity:
+    """Every pattern runs in linear time, even on input built to make it backtrack."""
+
+    HOSTILE = {
+        "colons": ":",
+        "hex_colon": "a:",
+        "hex_double_colon": "abcd::",
+        "digit_dash": "1-",
+        "dotted": "a.",
+        "at_runs": "a@",
+        "serial_runs": "SN ",
+        "key_runs": "token=",
+        "label_runs": "ip6:a:",
+    }
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("name", list(PATTERNS))
+    @pytest.mark.parametrize("unit", list(HOSTILE.values()), ids=list(HOSTILE))
+    def test_doubling_input_at_most_doubles_time(self, name: str, unit: str) -> None:
+        """Quadratic patterns take ~256x longer on 16x the input; linear ones ~16x.
+
+        The 64x bound and the 50 ms floor leave 4x of headroom on either side, so
+        scheduler noise on a busy runner cannot flip the result. Deselect with
+        ``-m "not slow"``; ``benchmarks/bench_patterns.py`` prints the per-pattern numbers.
+        """
+        pattern = re.compile(PATTERNS[name], flags=re.IGNORECASE)
+        small = _best_sub_seconds(pattern, unit * (5_000 // len(unit)))
+        large = _best_sub_seconds(pattern, unit * (80_000 // len(unit)))
+        assert large < 64 * small + 0.05, f"{name} on {unit!r}: {small:.4f}s -> {large:.4f}s"
+
+    def test_random_hostile_text_is_fast_and_matches_legacy(self) -> None:
+        """Seeded fuzz over the characters the patterns branch on."""
+        rng = random.Random(2024)
+        for _ in range(20):
+            text = "".join(rng.choice("0123456789abcdef:.-@+ ") for _ in range(20_000))
+            start = time.perf_counter()
+            assert _redact_regex(text) == _legacy_redact_regex(text)
+            assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.parametrize(
+        "text",
+        ["ts 12:34:56", "2025-12-13T10:20:30Z", "uptime 1:02:03:04", "std::map", "value DEAD:BEEF:"],
+    )
+    def test_ipv6_ignores_times_and_short_colon_runs(self, text: str) -> None:
+        """Timestamps and scope operators are not addresses."""
+        assert re.search(PATTERNS["ipv6"], text, flags=re.IGNORECASE) is None
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            *(
+                (f"peer {address} up", "peer [REDACTED] up")
+                for address in (
+                    "2001:db8::1",
+                    "fe80::1",
+                    "::1",
+                    "::",
+                    "2001:0db8:85a3:0000:0000:8a2e:0370:7334",
+                    "2001:db8::1:8080",
+                )
+            ),
+            ("inet6 addr:fe80::5054:ff:fe12:3456/64", "inet6 addr:[REDACTED]/64"),
+            ("ip:2001:db8::1", "ip:[REDACTED]"),
+            ("src_ip:fe80::1ff:fe23:4567:890a", "src_ip:[REDACTED]"),
+            ("ip6:2001:0db8:85a3:0000:0000:8a2e:0370:7334", "ip6:[REDACTED]"),
+        ],
+    )
+    def test_ipv6_redacts_whole_address(self, text: str, expected: str) -> None:
+        """Full and compressed forms are redacted as one token, also right after a ``label:`` prefix."""
+        assert is_pii_present(text)
+        assert redact_pii(text, method="regex") == expected
+
+    def test_email_redacts_whole_local_part(self) -> None:
+        """The match starts at the beginning of the local part, not inside it."""
+        assert redact_pii("from a.b-c@mail.example.com", method="regex") == "from [REDACTED]"
+
+
+class TestStreamingRedaction:
+    """Chunked redaction must be byte-identical to the in-memory path."""
+
+    BOUNDARY_TEXT = (
+        "ts=2025-12-13 host 10.0.10.10 mac 00:11:22:33:44:55\n"
+        "password:\n  hunter2\n"
+        "SN\n\nABCDEFGH1234 token = abcdefghijklmnopqrstuvwxyz\n"
+        '{"name":"ap","password":"a,b","ip":"192.168.1.17","mac":"aa:bb:cc:dd:ee:ff"}\r\n'
+        "email admin@rylan.internal\n"
+    )
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+    def test_stream_matches_in_memory(self, chunk_size: int) -> None:
+        """Matches split across chunk edges are still redacted as a whole."""
+        out = io.StringIO()
+        redact_stream(io.StringIO(self.BOUNDARY_TEXT), out, chunk_size=chunk_size)
+        assert out.getvalue() == _redact_regex(self.BOUNDARY_TEXT)
+
+    def test_file_streaming_is_byte_identical(self, tmp_path: Path) -> None:
+        """redact_file_streaming writes exactly what redact_file writes."""
+        src = tmp_path / "freepbx.log"
+        src.write_bytes(self.BOUNDARY_TEXT.encode("utf-8") * 50 + b"\xff trailing")
+        in_memory = tmp_path / "in_memory.log"
+        streamed = tmp_path / "streamed.log"
+
+        redact_file(str(src), str(in_memory))
+        written = redact_file_streaming(str(src), str(streamed), chunk_size=97)
+
+        assert streamed.read_bytes() == in_memory.read_bytes()
+        assert written == len(in_memory.read_text(encoding="utf-8"))
+
+    def test_gzip_in_gzip_out(self, tmp_path: Path) -> None:
+        """A .gz archive is redacted straight into a .gz output."""
+        src = tmp_path / "gatekeeper-1.log.gz"
+        with gzip.open(src, "wt", encoding="utf-8") as f:
+            f.write(self.BOUNDARY_TEXT * 20)
+        out = tmp_path / "gatekeeper-1.redacted.log.gz"
+
+        redact_file_streaming(str(src), str(out), chunk_size=64)
+
+        with gzip.open(out, "rt", encoding="utf-8") as f:
+            assert f.read() == _redact_regex(self.BOUNDARY_TEXT.replace("\r\n", "\n") * 20)
+
+    def test_gzip_to_plain_output(self, tmp_path: Path) -> None:
+        """Output compression follows the output suffix."""
+        src = tmp_path / "audit.log.gz"
+        src.write_bytes(gzip.compress(b"login from 10.0.0.7\n"))
+        out = tmp_path / "audit.log"
+        redact_file_streaming(str(src), str(out))
+        assert out.read_text(encoding="utf-8") == "login from [REDACTED]\n"
+
+    def test_file_streaming_missing_input(self, tmp_path: Path) -> None:
+        """Missing input raises FileNotFoundError like redact_file."""
+        with pytest.raises(FileNotFoundError):
+            redact_file_streaming(str(tmp_path / "absent.log"), str(tmp_path / "out.log"))
+
+
+@pytest.fixture
+def pii_tree(tmp_path: Path) -> Path:
+    """Small tree with dirty, clean, binary and excluded files."""
+    root = tmp_path / "repo"
+    (root / "logs").mkdir(parents=True)
+    (root / ".git").mkdir()
+    (root / "logs" / "controller.log").write_text("ap 10.0.0.5 mac 00:11:22:33:44:55\n", encoding="utf-8")
+    (root / "logs" / "clean.log").write_text("heartbeat ok\n", encoding="utf-8")
+    (root / "notes.md").write_text("mail admin@rylan.internal\n", encoding="utf-8")
+    (root / "blob.bin").write_bytes(b"\x00\x01 10.0.0.1")
+    (root / ".git" / "config").write_text("url = 10.0.0.9\n", encoding="utf-8")
+    return root
+
+
+class TestRedactTreeCli:
+    """Directory sweep: dry-run counts, globs, outputs and exit status."""
+
+    def test_dry_run_reports_per_file_counts(self, pii_tree: Path) -> None:
+        """Dry-run counts findings per file, skipping binaries and .git."""
+        reports = redact_tree([str(pii_tree)], dry_run=True, jobs=2)
+        counts = {Path(r.path).name: r.findings for r in reports}
+        assert counts == {"controller.log": 2, "clean.log": 0, "notes.md": 1}
+        assert "10.0.0.5" in (pii_tree / "logs" / "controller.log").read_text(encoding="utf-8")
+
+    def test_include_and_exclude_globs(self, pii_tree: Path) -> None:
+        """Include narrows the sweep; exclude prunes matching paths."""
+        reports = redact_tree([str(pii_tree)], dry_run=True, include=["*.log"], exclude=[".git", "clean.*"], jobs=1)
+        assert [Path(r.path).name for r in reports] == ["controller.log"]
+
+    def test_output_dir_mirrors_tree(self, pii_tree: Path, tmp_path: Path) -> None:
+        """Redacted copies land under --output with the same layout."""
+        out = tmp_path / "redacted"
+        redact_tree([str(pii_tree)], output_dir=str(out), jobs=1)
+        assert (out / "logs" / "controller.log").read_text(encoding="utf-8") == "ap [REDACTED] mac [REDACTED]\n"
+        assert "10.0.0.5" in (pii_tree / "logs" / "controller.log").read_text(encoding="utf-8")
+
+    def test_in_place_rewrites_files(self, pii_tree: Path) -> None:
+        """Without --output files are rewritten in place."""
+        redact_tree([str(pii_tree / "notes.md")])
+        assert (pii_tree / "notes.md").read_text(encoding="utf-8") == "mail [REDACTED]\n"
+
+    def test_in_place_keeps_bytes_and_mode(self, pii_tree: Path) -> None:
+        """Clean files are untouched; rewritten files keep CRLF, undecodable bytes and their mode."""
+        script = pii_tree / "run.sh"
+        script.write_bytes(b"#!/bin/sh\r\necho ok \xff\r\n")
+        script.chmod(0o755)
+        dirty = pii_tree / "dirty.sh"
+        dirty.write_bytes(b"ping 10.0.0.5\r\n\xfe end\r\n")
+        dirty.chmod(0o750)
+
+        reports = {Path(r.path).name: r for r in redact_tree([str(script), str(dirty)], jobs=1)}
+
+        assert reports["run.sh"].findings == 0
+        assert script.read_bytes() == b"#!/bin/sh\r\necho ok \xff\r\n"
+        assert script.stat().st_mode & 0o777 == 0o755  # executable bits survive
+        assert dirty.read_bytes() == b"ping [REDACTED]\r\n\xfe end\r\n"
+        assert dirty.stat().st_mode & 0o777 == 0o750  # mode copied onto the rewrite
+        assert not list(pii_tree.glob("*.redacting"))
+
+    def test_gzip_archives_redacted_in_place_and_mirrored(self, pii_tree: Path, tmp_path: Path) -> None:
+        """Archives stay compressed, are counted in dry-run, and a corrupt one is an error."""
+        archive = pii_tree / "logs" / "gatekeeper-1.log.gz"
+        archive.write_bytes(gzip.compress(b"deny 10.0.0.8 -> 10.0.0.9\n"))
+        (pii_tree / "logs" / "gatekeeper-2.log.gz").write_bytes(gzip.compress(b"ok\n")[:-6])
+
+        reports = {Path(r.path).name: r for r in redact_tree([str(pii_tree / "logs")], dry_run=True, jobs=2)}
+        assert reports["gatekeeper-1.log.gz"].findings == EXPECTED_REDACTIONS
+        assert reports["gatekeeper-2.log.gz"].error
+
+        out = tmp_path / "redacted"
+        redact_tree([str(archive)], output_dir=str(out), jobs=1)
+        assert gzip.decompress((out / archive.name).read_bytes()) == b"deny [REDACTED] -> [REDACTED]\n"
+
+        redact_tree([str(archive)], jobs=1)
+        assert gzip.decompress(archive.read_bytes()) == b"deny [REDACTED] -> [REDACTED]\n"
+
+    def test_main_exit_status(self, pii_tree: Path) -> None:
+        """Dry-run exits 1 when PII is found and 0 when the sweep is clean."""
+        assert main(["--dry-run", "--quiet", str(pii_tree)]) == 1
+        assert main(["--dry-run", "--quiet", str(pii_tree / "logs" / "clean.log")]) == 0
+
+    def test_main_rewrites_only_with_in_place(self, pii_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A bare invocation is a usage error and writes nothing; ``--in-place`` opts into rewriting."""
+        monkeypatch.chdir(pii_tree)
+        notes = pii_tree / "notes.md"
+        with pytest.raises(SystemExit) as exc:
+            main([])
+        assert exc.value.code == 2
+        assert notes.read_text(encoding="utf-8") == "mail admin@rylan.internal\n"
+        assert main(["--in-place", "--quiet", "."]) == 0
+        assert notes.read_text(encoding="utf-8") == "mail [REDACTED]\n"
+
+
+class TestRedactMany:
+    """Batch API: ordered, lazy, and identical to per-string redaction."""
+
+    LINES = (
+        "heartbeat ok",
+        "ap 10.0.0.5 adopted",
+        "",
+        "mac 00:11:22:33:44:55 password=hunter2",
+        "retrying in 5s",
+        "contact admin@rylan.internal",
+    )
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 4, 256])
+    def test_matches_per_line_redaction(self, batch_size: int) -> None:
+        """Every batch size yields the same results, in input order."""
+        expected = [redact_pii(line, method="regex") for line in self.LINES]
+        assert list(redact_many(self.LINES, method="regex", batch_size=batch_size)) == expected
+
+    def test_consumes_input_lazily(self) -> None:
+        """Results stream back without draining an unbounded input."""
+        endless = itertools.cycle(self.LINES)
+        first = list(itertools.islice(redact_many(endless, method="regex", batch_size=3), 4))
+        assert first[1] == "ap [REDACTED] adopted"
+
+    def test_rejects_non_positive_batch_size(self) -> None:
+        """batch_size must be at least one."""
+        with pytest.raises(ValueError, match="batch_size"):
+            list(redact_many(["x"], batch_size=0))
+
+
+@pytest.fixture
+def redaction_cache() -> Iterator[RedactionCache]:
+    """Enable a small module cache for one test."""
+    cache = redactor.enable_cache(maxsize=2)
+    try:
+        yield cache
+    finally:
+        redactor.disable_cache()
+
+
+class TestRedactionCache:
+    """Optional LRU cache for repeated lines."""
+
+    def test_repeated_line_is_a_hit(self, redaction_cache: RedactionCache) -> None:
+        """Second identical call is served from the cache with the same result."""
+        line = "rogue dhcp from 10.0.0.66"
+        first = redact_pii(line, method="regex")
+        with patch("app.redactor._redact_regex") as engine:
+            assert redact_pii(line, method="regex") == first
+            engine.assert_not_called()
+        assert redaction_cache.stats()[:2] == (1, 1)
+
+    def test_lru_eviction(self, redaction_cache: RedactionCache) -> None:
+        """The least recently used entry is evicted first."""
+        for line in ("a 10.0.0.1", "b 10.0.0.2", "a 10.0.0.1", "c 10.0.0.3"):
+            redact_pii(line, method="regex")
+        stats = redaction_cache.stats()
+        assert (stats.size, stats.evictions) == (2, 1)
+        assert redaction_cache.get("regex", "a 10.0.0.1") == "a [REDACTED]"
+        assert redaction_cache.get("regex", "b 10.0.0.2") is None
+
+    def test_long_text_bypasses_cache(self, redaction_cache: RedactionCache) -> None:
+        """Documents above max_text_len are never stored."""
+        redact_pii("x" * (redaction_cache.max_text_len + 1), method="regex")
+        assert redaction_cache.stats().size == 0
+
+    def test_redact_many_uses_cache(self, redaction_cache: RedactionCache) -> None:
+        """Batch redaction only sends misses to the engine."""
+        lines = ["heartbeat 10.0.0.1"] * 5
+        assert list(redact_many(lines, method="regex")) == ["heartbeat [REDACTED]"] * 5
+        assert list(redact_many(lines, method="regex")) == ["heartbeat [REDACTED]"] * 5
+        assert redaction_cache.stats().hits == 5
+
+    def test_disabled_by_default(self) -> None:
+        """No cache is active unless enabled."""
+        assert redactor.cache_stats() is None
+
+
+class TestFindPii:
+    """Span reporting without rewriting the text."""
+
+    TEXT = "ap 10.0.0.5 owner admin@rylan.internal uuid 550e8400-e29b-41d4-a716-446655440000"
+
+    def test_spans_point_at_original_text(self) -> None:
+        """Each finding slices the original text; results are ordered by start."""
+        findings = list(find_pii(self.TEXT, method="regex"))
+        assert [(f.entity, self.TEXT[f.start : f.end]) for f in findings] == [
+            ("ipv4", "10.0.0.5"),
+            ("email", "admin@rylan.internal"),
+            ("uuid", "550e8400-e29b-41d4-a716-446655440000"),
+        ]
+        assert findings[0] == Finding("ipv4", 3, 11)
+
+    def test_never_builds_redacted_copy(self) -> None:
+        """The substitution engine is not involved."""
+        with patch("app.redactor._redact_regex") as engine:
+            list(find_pii(self.TEXT, method="regex"))
+            summarize_pii(self.TEXT, method="regex")
+        engine.assert_not_called()
+
+    def test_summary_counts_only(self) -> None:
+        """Summary mode returns per-entity counts; clean text gives an empty dict."""
+        assert summarize_pii(self.TEXT + " 10.0.0.6", method="regex") == {"ipv4": 2, "email": 1, "uuid": 1}
+        assert summarize_pii("heartbeat ok", method="regex") == {}
+
+
+VLANS_YAML = Path(__file__).resolve().parent.parent / "02_declarative_config" / "vlans.yaml"
+
+
+@pytest.fixture
+def infra_allowlist() -> Iterator[frozenset[str]]:
+    """Allow the documented VLAN infrastructure and public resolvers for one test."""
+    try:
+        yield redactor.set_allowlist(redactor.allowlist_from_config([str(VLANS_YAML)]) | redactor.PUBLIC_RESOLVERS)
+    finally:
+        redactor.clear_allowlist()
+
+
+class TestAllowlist:
+    """Known infrastructure values stay readable; everything else is still redacted."""
+
+    def test_config_values_collected(self) -> None:
+        """Gateways, subnet addresses and resolvers come from vlans.yaml."""
+        values = redactor.allowlist_from_config([str(VLANS_YAML)])
+        assert {"10.0.10.1", "10.0.90.1", "10.0.30.0", "10.0.30.0/24", "1.1.1.1", "10.0.10.10"} <= values
+        assert "10.0.30.100" not in values  # DHCP ranges are client addresses
+
+    def test_allowed_values_kept(self, infra_allowlist: frozenset[str]) -> None:
+        """Only exact allowlisted matches survive; neighbours are redacted."""
+        assert "10.0.10.1" in infra_allowlist
+        text = "gw 10.0.10.1 dns 1.1.1.1 client 10.0.10.11 net 10.0.30.0/24"
+        assert redact_pii(text, method="regex") == "gw 10.0.10.1 dns 1.1.1.1 client [REDACTED] net 10.0.30.0/24"
+        assert redactor._redact_regex_counted(text)[1] == 1
+
+    def test_detection_ignores_allowed_values(self, infra_allowlist: frozenset[str]) -> None:
+        """is_pii_present / find_pii / summarize_pii agree with redaction."""
+        assert infra_allowlist
+        assert not is_pii_present("upstream 1.1.1.1 via 10.0.40.1")
+        assert is_pii_present("upstream 1.1.1.1 via 10.0.40.2")
+        assert [f.entity for f in find_pii("10.0.40.1 10.0.40.2", method="regex")] == ["ipv4"]
+        assert summarize_pii("10.0.40.1 10.0.40.2", method="regex") == {"ipv4": 1}
+
+    def test_ipv6_resolvers_case_insensitive(self, infra_allowlist: frozenset[str]) -> None:
+        """Hex addresses match regardless of case."""
+        assert infra_allowlist
+        assert redact_pii("dns 2606:4700:4700::1111", method="regex") == "dns 2606:4700:4700::1111"
+        assert redact_pii("dns 2001:4860:4860::8888", method="regex") == "dns 2001:4860:4860::8888"
+
+    def test_unmatchable_values_add_no_callbacks(self) -> None:
+        """Values no pattern can produce do not slow any pattern down."""
+        try:
+            redactor.set_allowlist(["controller", " "])
+            assert not redactor._ALLOWLISTED_NAMES
+        finally:
+            redactor.clear_allowlist()
+        assert redact_pii("controller 10.0.10.1", method="regex") == "controller [REDACTED]"
+
+    def test_cli_allow_config(self, pii_tree: Path) -> None:
+        """--allow-config keeps gateway addresses out of the findings."""
+        (pii_tree / "logs" / "controller.log").write_text("uplink via 10.0.10.1\n", encoding="utf-8")
+        (pii_tree / "notes.md").unlink()
+        try:
+            assert main([str(pii_tree), "--dry-run", "--quiet", "--allow-config", str(VLANS_YAML)]) == 0
+        finally:
+            redactor.clear_allowlist()
@@ -1,6 +1,7 @@
 """Extended tests for redactor.py Presidio integration and edge cases."""
 
 import sys
+import threading
 import unittest
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -8,7 +9,8 @@ from unittest.mock import MagicMock, patch
 # Add app to path
 sys.path.insert(0, "/home/egx570/repos/rylan-unifi-case-study")
 
-from app.redactor import is_pii_present, redact_file, redact_pii
+from app import redactor
+from app.redactor import Finding, find_pii, is_pii_present, redact_file, redact_many, redact_pii, summarize_pii
 
 
 class TestPresidioFallbackPath(unittest.TestCase):
@@ -40,6 +42,33 @@ class TestPresidioFallbackPath(unittest.TestCase):
             except Exception as e:
                 self.fail(f"redact_pii should not raise: {e}")
 
+    @patch("app.redactor.PRESIDIO_AVAILABLE", True)
+    @patch("app.redactor.AnonymizerEngine", None)
+    @patch("app.redactor.AnalyzerEngine", None)
+    def test_broken_install_disables_presidio_once(self) -> None:
+        """An installed Presidio whose import raises is tried once, then regex runs silently."""
+        redactor.reset_presidio()
+        with (
+            patch.dict(sys.modules, {"presidio_analyzer": None, "presidio_anonymizer": None}),
+            self.assertLogs("app.redactor", level="WARNING") as logs,
+        ):
+            results = [redact_pii(f"host 10.0.0.{i}") for i in range(3)]
+        self.assertEqual(results, ["host [REDACTED]"] * 3)
+        self.assertFalse(redactor.PRESIDIO_AVAILABLE)
+        self.assertEqual(sum("failed to import" in line for line in logs.output), 1)
+        self.assertEqual(sum("Traceback" in line for line in logs.output), 1)
+
+    @patch("app.redactor._FALLBACK_WARNED", False)
+    @patch("app.redactor.PRESIDIO_AVAILABLE", False)
+    def test_fallback_warning_only_when_presidio_requested(self) -> None:
+        """Regex requests stay silent; the first Presidio request warns once."""
+        with self.assertNoLogs("app.redactor", level="WARNING"):
+            redact_pii("host 10.0.0.1", method="regex")
+        with self.assertLogs("app.redactor", level="WARNING") as logs:
+            redact_pii("host 10.0.0.1")
+            redact_pii("host 10.0.0.2", method="hybrid")
+        self.assertEqual(len(logs.output), 1)
+
     def test_is_pii_present_with_ips(self) -> None:
         """Test PII detection for IP addresses."""
         # IPv4
@@ -201,5 +230,244 @@ class TestComprehensivePIIPatterns(unittest.TestCase):
         self.assertIn("[REDACTED]", result)
 
 
+@patch("app.redactor.PRESIDIO_AVAILABLE", True)
+@patch("app.redactor.AnonymizerEngine")
+@patch("app.redactor.AnalyzerEngine")
+class TestPresidioEngineReuse(unittest.TestCase):
+    """Presidio engines are built once and shared across calls and threads."""
+
+    def setUp(self) -> None:
+        redactor.reset_presidio()
+
+    def tearDown(self) -> None:
+        redactor.reset_presidio(entities=redactor.PRESIDIO_ENTITIES, language="en")
+
+    def _wire(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        analyzer_cls.return_value.analyze.return_value = []
+        anonymizer_cls.return_value.anonymize.return_value = MagicMock(text="clean")
+
+    def test_engines_built_once_across_calls(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """Repeated presidio redaction reuses the same engines."""
+        self._wire(analyzer_cls, anonymizer_cls)
+        for _ in range(3):
+            redact_pii("hello", method="presidio")
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.assert_called_once()
+        self.assertEqual(analyzer_cls.return_value.analyze.call_count, 3)
+
+    def test_concurrent_first_use_builds_once(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """Threads racing on first use share a single build."""
+        self._wire(analyzer_cls, anonymizer_cls)
+        threads = [threading.Thread(target=redact_pii, args=("hello", "presidio")) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        analyzer_cls.assert_called_once()
+
+    def test_warm_up_loads_engines(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """warm_up_presidio builds the engines and runs one analysis."""
+        self._wire(analyzer_cls, anonymizer_cls)
+        self.assertTrue(redactor.warm_up_presidio())
+        self.assertTrue(redactor._PRESIDIO.loaded)
+        analyzer_cls.return_value.analyze.assert_called_once()
+
+    def test_reset_rebuilds_with_new_entities(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """reset_presidio drops engines and applies the new entity list."""
+        self._wire(analyzer_cls, anonymizer_cls)
+        redact_pii("hello", method="presidio")
+        redactor.reset_presidio(entities=("PERSON",))
+        redact_pii("hello", method="presidio")
+        self.assertEqual(analyzer_cls.call_count, 2)
+        _, kwargs = analyzer_cls.return_value.analyze.call_args
+        self.assertEqual(kwargs["entities"], ["PERSON"])
+
+    def test_failed_build_is_not_cached(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """A failing build falls back to regex and is retried on the next call."""
+        self._wire(analyzer_cls, anonymizer_cls)
+        analyzer_cls.side_effect = [RuntimeError("model missing"), analyzer_cls.return_value]
+        self.assertIn("[REDACTED]", redact_pii("10.0.0.1", method="presidio"))
+        self.assertFalse(redactor._PRESIDIO.loaded)
+        redact_pii("hello", method="presidio")
+        self.assertTrue(redactor._PRESIDIO.loaded)
+
+
+@patch("app.redactor.PRESIDIO_AVAILABLE", True)
+@patch("app.redactor.BatchAnalyzerEngine")
+@patch("app.redactor.AnonymizerEngine")
+@patch("app.redactor.AnalyzerEngine")
+class TestPresidioBatchRedaction(unittest.TestCase):
+    """redact_many(method="presidio") analyses whole batches at once."""
+
+    def setUp(self) -> None:
+        redactor.reset_presidio()
+
+    def tearDown(self) -> None:
+        redactor.reset_presidio()
+
+    def test_one_batched_analysis_per_batch(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """Each batch is a single analyze_iterator call; order is preserved."""
+        batch_cls.return_value.analyze_iterator.side_effect = lambda texts, **_: [[] for _ in texts]
+        anonymizer_cls.return_value.anonymize.side_effect = lambda text, **_: MagicMock(text=text.upper())
+
+        result = list(redact_many(["a", "b", "c", "d", "e"], method="presidio", batch_size=2))
+
+        self.assertEqual(result, ["A", "B", "C", "D", "E"])
+        self.assertEqual(batch_cls.return_value.analyze_iterator.call_count, 3)
+        _, kwargs = batch_cls.return_value.analyze_iterator.call_args_list[0]
+        self.assertEqual(kwargs["batch_size"], 2)
+        analyzer_cls.assert_called_once()
+
+    def test_batch_failure_falls_back_to_regex(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """A failing batch is redacted with the regex engine instead."""
+        batch_cls.return_value.analyze_iterator.side_effect = RuntimeError("spaCy crashed")
+        result = list(redact_many(["ip 10.0.0.1", "clean"], method="presidio"))
+        self.assertEqual(result, ["ip [REDACTED]", "clean"])
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+
+@patch("app.redactor.PRESIDIO_AVAILABLE", True)
+@patch("app.redactor.AnonymizerEngine")
+@patch("app.redactor.AnalyzerEngine")
+class TestPresidioFindings(unittest.TestCase):
+    """find_pii(method="presidio") reports analyzer spans plus MAC matches."""
+
+    def setUp(self) -> None:
+        redactor.reset_presidio()
+
+    def tearDown(self) -> None:
+        redactor.reset_presidio()
+
+    def test_analyzer_spans_and_macs(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """Findings merge Presidio results with regex MACs, ordered by start."""
+        text = "Jane at 00:11:22:33:44:55"
+        analyzer_cls.return_value.analyze.return_value = [MagicMock(entity_type="PERSON", start=0, end=4)]
+
+        findings = list(find_pii(text, method="presidio"))
+
+        self.assertEqual(findings, [Finding("PERSON", 0, 4), Finding("mac", 8, 25)])
+        self.assertEqual(summarize_pii(text, method="presidio"), {"PERSON": 1, "mac": 1})
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_analyzer_failure_falls_back_to_regex(self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock) -> None:
+        """A failing analyzer yields regex findings instead."""
+        analyzer_cls.return_value.analyze.side_effect = RuntimeError("model missing")
+        self.assertEqual(list(find_pii("ip 10.0.0.1", method="presidio")), [Finding("ipv4", 3, 11)])
+        anonymizer_cls.assert_called_once()
+
+
+@patch("app.redactor.PRESIDIO_AVAILABLE", True)
+@patch("app.redactor.BatchAnalyzerEngine")
+@patch("app.redactor.AnonymizerEngine")
+@patch("app.redactor.AnalyzerEngine")
+class TestHybridRedaction(unittest.TestCase):
+    """method="hybrid" runs regex first and Presidio only on candidate windows."""
+
+    def setUp(self) -> None:
+        redactor.reset_presidio()
+
+    def tearDown(self) -> None:
+        redactor.reset_presidio()
+
+    def test_clean_lowercase_text_skips_presidio(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """Structured PII is regex-redacted and no window means no NLP call."""
+        result = redact_pii("lease 10.0.0.5 to aa:bb:cc:dd:ee:ff", method="hybrid")
+        self.assertEqual(result, "lease [REDACTED] to [REDACTED]")
+        analyzer_cls.assert_not_called()
+        batch_cls.assert_not_called()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_windows_are_analysed_and_offsets_mapped_back(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """Only NLP-only entities are requested and spans are shifted to whole-text offsets."""
+        text = "x" * 60 + " reset by Jane Doe from 10.0.0.5"
+        person = MagicMock(entity_type="PERSON", start=9, end=17)
+        batch_cls.return_value.analyze_iterator.return_value = [[person]]
+        anonymizer_cls.return_value.anonymize.side_effect = lambda text, analyzer_results: MagicMock(
+            text=text[: analyzer_results[0].start] + "<PERSON>" + text[analyzer_results[0].end :]
+        )
+
+        result = redact_pii(text, method="hybrid")
+
+        _, kwargs = batch_cls.return_value.analyze_iterator.call_args
+        self.assertEqual(kwargs["entities"], ["PERSON", "DOMAIN"])
+        self.assertEqual(kwargs["texts"], ["reset by Jane Doe from [REDACTED]"])
+        self.assertEqual(result, "x" * 60 + " reset by <PERSON> from [REDACTED]")
+        analyzer_cls.assert_called_once()
+
+    def test_analyzer_failure_keeps_regex_result(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """A failing analyzer still returns the regex redaction."""
+        batch_cls.return_value.analyze_iterator.side_effect = RuntimeError("spaCy crashed")
+        self.assertEqual(redact_pii("Jane at 10.0.0.5", method="hybrid"), "Jane at [REDACTED]")
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_allowlisted_analyzer_spans_kept(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """Allowlisted NLP spans are neither redacted nor reported, as on the presidio path."""
+        text = "reach controller.rylan.internal now"
+        domain = MagicMock(entity_type="DOMAIN", start=6, end=31)
+        batch_cls.return_value.analyze_iterator.side_effect = lambda **_: iter([[domain]])
+        redactor.set_allowlist(["controller.rylan.internal"])
+        try:
+            self.assertEqual(redact_pii(text, method="hybrid"), text)
+            self.assertEqual(list(find_pii(text, method="hybrid")), [])
+        finally:
+            redactor.clear_allowlist()
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_find_pii_reports_windowed_analyzer_spans(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """Hybrid findings are regex spans plus NLP spans on windows; spans inside a regex match are dropped."""
+        text = "x" * 60 + " reset by Jane Doe from 10.0.0.5"
+        person = MagicMock(entity_type="PERSON", start=9, end=17)
+        shadowed = MagicMock(entity_type="DOMAIN", start=23, end=31)
+        batch_cls.return_value.analyze_iterator.return_value = [[person, shadowed]]
+
+        findings = list(find_pii(text, method="hybrid"))
+
+        _, kwargs = batch_cls.return_value.analyze_iterator.call_args
+        self.assertEqual(kwargs["entities"], ["PERSON", "DOMAIN"])
+        self.assertEqual(kwargs["texts"], ["reset by Jane Doe from 10.0.0.5"])
+        self.assertEqual(findings, [Finding("PERSON", 70, 78), Finding("ipv4", 84, 92)])
+        batch_cls.return_value.analyze_iterator.return_value = [[person]]
+        self.assertEqual(summarize_pii(text, method="hybrid"), {"PERSON": 1, "ipv4": 1})
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_find_pii_analyzer_failure_keeps_regex_findings(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """A failing analyzer still reports the regex spans."""
+        batch_cls.return_value.analyze_iterator.side_effect = RuntimeError("spaCy crashed")
+        self.assertEqual(list(find_pii("Jane at 10.0.0.5", method="hybrid")), [Finding("ipv4", 8, 16)])
+        analyzer_cls.assert_called_once()
+        anonymizer_cls.return_value.anonymize.assert_not_called()
+
+    def test_presidio_masks_macs_before_analysis(
+        self, analyzer_cls: MagicMock, anonymizer_cls: MagicMock, batch_cls: MagicMock
+    ) -> None:
+        """MACs are masked in the analyzer input; anonymizer output is not re-scanned."""
+        analyzer_cls.return_value.analyze.return_value = []
+        anonymizer_cls.return_value.anonymize.side_effect = lambda text, **_: MagicMock(text=text)
+        redact_pii("port aa:bb:cc:dd:ee:ff", method="presidio")
+        _, kwargs = analyzer_cls.return_value.analyze.call_args
+        self.assertEqual(kwargs["text"], "port [REDACTED]")
+        batch_cls.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
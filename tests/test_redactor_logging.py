@@ -0,0 +1,101 @@
+"""Tests for app/redactor_logging.py - redacting filter on the fortress logger."""
+
+import io
+import logging
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from app.redactor_logging import RedactingFilter, install_redacting_filter
+
+
+class _Collector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def fortress_log() -> Iterator[tuple[logging.Logger, _Collector]]:
+    log = logging.getLogger("fortress.test_redaction")
+    collector = _Collector()
+    log.addHandler(collector)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    redacting = install_redacting_filter(log.name)
+    yield log, collector
+    log.removeFilter(redacting)
+    log.removeHandler(collector)
+
+
+class TestRedactingFilter:
+    """Messages, args and tracebacks are redacted before handlers run."""
+
+    def test_message_args_are_redacted(self, fortress_log: tuple[logging.Logger, _Collector]) -> None:
+        log, collector = fortress_log
+        log.info("controller %s unreachable (mac %s)", "10.0.1.20", "aa:bb:cc:dd:ee:ff")
+        assert collector.lines == ["controller [REDACTED] unreachable (mac [REDACTED])"]
+
+    def test_exception_text_is_redacted(self, fortress_log: tuple[logging.Logger, _Collector]) -> None:
+        log, collector = fortress_log
+        try:
+            msg = "login failed for admin@example.com"
+            raise RuntimeError(msg)
+        except RuntimeError:
+            log.exception("request failed")
+        assert "admin@example.com" not in collector.lines[0]
+        assert "RuntimeError: login failed for [REDACTED]" in collector.lines[0]
+
+    def test_clean_record_keeps_args(self) -> None:
+        record = logging.LogRecord("fortress", logging.INFO, __file__, 1, "VLAN %d created", (30,), None)
+        assert RedactingFilter().filter(record)
+        assert record.args == (30,)
+        assert record.getMessage() == "VLAN 30 created"
+
+    def test_suppressed_levels_skip_the_redactor(self, fortress_log: tuple[logging.Logger, _Collector]) -> None:
+        log, collector = fortress_log
+        with patch("app.redactor_logging._redact_regex") as redact:
+            log.debug("raw %s", "10.0.1.20")
+        redact.assert_not_called()
+        assert collector.lines == []
+
+    def test_install_is_idempotent(self) -> None:
+        first = install_redacting_filter("fortress.idempotent")
+        try:
+            assert install_redacting_filter("fortress.idempotent") is first
+            assert logging.getLogger("fortress.idempotent").filters == [first]
+        finally:
+            logging.getLogger("fortress.idempotent").removeFilter(first)
+
+    def test_malformed_call_does_not_raise(self) -> None:
+        log = logging.getLogger("fortress.malformed")
+        stream = logging.StreamHandler(io.StringIO())
+        log.addHandler(stream)
+        log.propagate = False
+        redacting = install_redacting_filter(log.name)
+        try:
+            with patch.object(stream, "handleError") as handle_error:
+                log.warning("vlan %d", "abc")
+        finally:
+            log.removeFilter(redacting)
+            log.removeHandler(stream)
+        handle_error.assert_called_once()
+
+    def test_handler_install_covers_child_loggers(self) -> None:
+        parent = logging.getLogger("fortress.handler_install")
+        child = logging.getLogger("fortress.handler_install.child")
+        collector = _Collector()
+        parent.addHandler(collector)
+        parent.propagate = False
+        parent.setLevel(logging.INFO)
+        redacting = install_redacting_filter(handler=collector)
+        try:
+            assert install_redacting_filter(handler=collector) is redacting
+            child.info("joined from %s", "10.0.1.20")
+            assert collector.lines == ["joined from [REDACTED]"]
+        finally:
+            parent.removeHandler(collector)
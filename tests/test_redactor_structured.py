@@ -0,0 +1,130 @@
+"""Tests for app/redactor_structured.py - key-based JSON/YAML redaction."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from app.redactor_structured import (
+    compile_json_redactors,
+    main,
+    redact_json_stream,
+    redact_structured_file,
+    redact_yaml_stream,
+)
+
+SNAPSHOT = Path(__file__).resolve().parent.parent / "05_network_migration/backups/20251213_232044/devices.json"
+
+
+def _redact_json(text: str, **kwargs: object) -> tuple[str, int]:
+    sink = io.StringIO()
+    count = redact_json_stream(io.StringIO(text), sink, **kwargs)  # type: ignore[arg-type]
+    return sink.getvalue(), count
+
+
+def _leaves(node: object) -> list[object]:
+    if isinstance(node, dict):
+        return [leaf for value in node.values() for leaf in _leaves(value)]
+    if isinstance(node, list):
+        return [leaf for value in node for leaf in _leaves(value)]
+    return [node]
+
+
+class TestJsonRedaction:
+    """Only values under configured keys change; everything else is byte-identical."""
+
+    def test_values_under_keys_are_redacted(self) -> None:
+        doc = '{"name": "ap1", "mac": "aa:bb:cc:dd:ee:ff", "uplink": {"ip": "10.0.1.5", "port": 8}}'
+        out, count = _redact_json(doc)
+        assert json.loads(out) == {
+            "name": "ap1",
+            "mac": "[REDACTED]",
+            "uplink": {"ip": "[REDACTED]", "port": 8},
+        }
+        assert count == 2
+
+    def test_wildcards_arrays_and_literals(self) -> None:
+        doc = '{"inform_ip": "10.0.1.1", "dns": ["1.1.1.1", 8], "gateway_mac": null, "lan_ip": false}'
+        out, count = _redact_json(doc)
+        assert json.loads(out) == {
+            "inform_ip": "[REDACTED]",
+            "dns": ["[REDACTED]", "[REDACTED]"],
+            "gateway_mac": None,
+            "lan_ip": False,
+        }
+        assert count == 3
+
+    def test_non_pii_hex_fields_untouched(self) -> None:
+        doc = '{"setup_id": "7f42dd99-1799-4451-aea7-633e2cf01c8a", "fw": "6.7.35:15586:ab:cd"}'
+        assert _redact_json(doc) == (doc, 0)
+
+    def test_key_text_inside_strings_is_not_a_key(self) -> None:
+        doc = '{"note": "copy \\"mac\\": \\"x\\" here", "tag": "ip"}'
+        assert _redact_json(doc) == (doc, 0)
+
+    def test_custom_keys(self) -> None:
+        out, _ = _redact_json('{"mac": "m", "site_name": "lab", "x_id": 3}', keys=["site_?ame", "x_*d"])
+        assert json.loads(out) == {"mac": "m", "site_name": "[REDACTED]", "x_id": "[REDACTED]"}
+
+    def test_no_keys_is_identity(self) -> None:
+        assert compile_json_redactors([]) == []
+        doc = '{"mac": "aa:bb:cc:dd:ee:ff"}'
+        assert _redact_json(doc, keys=[]) == (doc, 0)
+
+    @pytest.mark.parametrize("chunk_size", [7, 500, 1 << 20])
+    def test_snapshot_matches_tree_redaction(self, chunk_size: int) -> None:
+        text = SNAPSHOT.read_text(encoding="utf-8")
+        out, count = _redact_json(text, chunk_size=chunk_size)
+        original, redacted = _leaves(json.loads(text)), _leaves(json.loads(out))
+        changed = [(a, b) for a, b in zip(original, redacted, strict=True) if a != b]
+        assert len(changed) == count > 0
+        assert all(b == "[REDACTED]" for _, b in changed)
+        assert "192.168.1.17" not in out
+
+    def test_chunk_size_does_not_change_output(self) -> None:
+        doc = json.dumps({"data": [{"mac": f"aa:bb:cc:dd:ee:{i:02x}", "name": f"ap{i}"} for i in range(50)]})
+        assert _redact_json(doc, chunk_size=5) == _redact_json(doc)
+
+
+class TestYamlRedaction:
+    """YAML goes through PyYAML events; collections under matched keys are redacted recursively."""
+
+    def test_yaml_values_redacted(self) -> None:
+        text = (
+            "site:\n  gateway: 10.0.1.1\n  enabled: true\n  devices:\n    - mac: aa:bb:cc:dd:ee:ff\n      lan_ip: ~\n"
+        )
+        sink = io.StringIO()
+        assert redact_yaml_stream(io.StringIO(text), sink, keys=["gateway", "mac", "*_ip", "dns"]) == 2
+        assert yaml.safe_load(sink.getvalue()) == {
+            "site": {"gateway": "[REDACTED]", "enabled": True, "devices": [{"mac": "[REDACTED]", "lan_ip": None}]}
+        }
+
+    def test_yaml_nested_collection_under_key(self) -> None:
+        sink = io.StringIO()
+        redact_yaml_stream(io.StringIO("dns:\n  - 1.1.1.1\n  - {primary: 8.8.8.8}\nname: lab\n"), sink)
+        assert yaml.safe_load(sink.getvalue()) == {"dns": ["[REDACTED]", {"primary": "[REDACTED]"}], "name": "lab"}
+
+
+class TestStructuredFile:
+    """File dispatch by extension and the CLI."""
+
+    def test_file_and_cli(self, tmp_path: Path) -> None:
+        src = tmp_path / "devices.json"
+        src.write_text('{"data": [{"mac": "aa:bb:cc:dd:ee:ff"}]}', encoding="utf-8")
+        out = tmp_path / "out.json"
+        assert redact_structured_file(str(src), str(out)) == 1
+        assert json.loads(out.read_text(encoding="utf-8")) == {"data": [{"mac": "[REDACTED]"}]}
+        assert main([str(src), "-o", str(out), "--key", "ip"]) == 0
+        assert json.loads(out.read_text(encoding="utf-8")) == {"data": [{"mac": "aa:bb:cc:dd:ee:ff"}]}
+
+    def test_unsupported_extension(self, tmp_path: Path) -> None:
+        src = tmp_path / "devices.txt"
+        src.write_text("{}", encoding="utf-8")
+        with pytest.raises(ValueError, match="Unsupported structured format"):
+            redact_structured_file(str(src), str(tmp_path / "out"))
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            redact_structured_file(str(tmp_path / "absent.json"), str(tmp_path / "out.json"))
@@ -0,0 +1,158 @@
+"""Tests for app/redactor_tail.py - incremental redaction of append-only logs."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.redactor import redact_file_streaming
+from app.redactor_tail import TailCheckpoint, load_checkpoints, main, tail_redact, tail_redact_files
+
+LINES = [
+    "boot ok\n",
+    "dhcp lease 10.0.10.5 to aa:bb:cc:dd:ee:ff\n",
+    "admin login from ops@example.com\n",
+    "password: hunter2 rejected\n",
+]
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def log_pair(tmp_path: Path) -> tuple[Path, Path]:
+    src = tmp_path / "app.log"
+    src.write_text("".join(LINES[:2]), encoding="utf-8")
+    return src, tmp_path / "app.redacted.log"
+
+
+def _expected(src: Path, tmp_path: Path) -> str:
+    ref = tmp_path / "reference.log"
+    redact_file_streaming(str(src), str(ref))
+    return ref.read_text(encoding="utf-8")
+
+
+class TestTailRedact:
+    """Checkpointed, append-only redaction."""
+
+    def test_second_run_processes_only_appended_bytes(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        assert first.bytes_processed == src.stat().st_size
+        _append(src, "".join(LINES[2:]))
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset is None
+        assert second.bytes_processed == len("".join(LINES[2:]).encode())
+        assert out.read_text(encoding="utf-8") == _expected(src, tmp_path)
+        assert "10.0.10.5" not in out.read_text(encoding="utf-8")
+
+    def test_partial_line_waits_for_newline(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, out = log_pair
+        _append(src, "contact ops@exam")
+        first = tail_redact(str(src), str(out))
+        assert "ops@exam" not in out.read_text(encoding="utf-8")
+        _append(src, "ple.com\n")
+        tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert out.read_text(encoding="utf-8") == _expected(src, tmp_path)
+
+    def test_line_ending_in_password_label_waits_for_value(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, out = log_pair
+        _append(src, "password:\n")
+        first = tail_redact(str(src), str(out))
+        _append(src, "hunter2\n")
+        tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert out.read_text(encoding="utf-8") == _expected(src, tmp_path)
+        assert "hunter2" not in out.read_text(encoding="utf-8")
+
+    def test_no_new_data_is_a_noop(self, log_pair: tuple[Path, Path]) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.bytes_processed == 0
+        assert second.checkpoint == first.checkpoint
+
+    def test_truncation_restarts_from_zero(self, log_pair: tuple[Path, Path]) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        with src.open("w", encoding="utf-8") as f:
+            f.write("short\n")
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset == "truncated"
+        assert second.bytes_processed == len(b"short\n")
+
+    def test_rotation_restarts_from_zero(self, log_pair: tuple[Path, Path]) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        src.rename(src.with_suffix(".log.1"))
+        src.write_text("".join(LINES), encoding="utf-8")
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset == "rotated"
+        assert second.checkpoint.inode == os.stat(src).st_ino
+
+    def test_rotation_drains_lines_appended_to_the_old_file(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        _append(src, LINES[2])
+        rotated = src.with_suffix(".log.1")
+        src.rename(rotated)
+        src.write_text(LINES[3], encoding="utf-8")
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset == "rotated"
+        assert second.bytes_processed == len(LINES[2]) + len(LINES[3])
+        expected = _expected(rotated, tmp_path) + _expected(src, tmp_path)
+        assert out.read_text(encoding="utf-8") == expected
+        assert "ops@example.com" not in expected
+
+    def test_rotation_without_old_file_logs_the_loss(
+        self, log_pair: tuple[Path, Path], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        src.rename(src.parent / "archived.txt")  # not next to app.log under its name, so it cannot be found
+        src.write_text(LINES[3], encoding="utf-8")
+        with caplog.at_level("WARNING", logger="app.redactor_tail"):
+            second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset == "rotated"
+        assert "were not redacted" in caplog.text
+
+    def test_rewrite_in_place_detected_by_boundary_hash(self, log_pair: tuple[Path, Path]) -> None:
+        src, out = log_pair
+        first = tail_redact(str(src), str(out))
+        with src.open("r+", encoding="utf-8") as f:
+            f.write("X" * 20)
+        _append(src, LINES[2])
+        second = tail_redact(str(src), str(out), checkpoint=first.checkpoint)
+        assert second.reset == "rewritten"
+        assert second.bytes_processed == src.stat().st_size
+
+
+class TestTailStateFile:
+    """Checkpoint persistence across runs."""
+
+    def test_state_round_trip_and_cli(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, _ = log_pair
+        state = tmp_path / "state.json"
+        out_dir = tmp_path / "redacted"
+        assert main(["--state", str(state), "--output-dir", str(out_dir), str(src)]) == 0
+        checkpoints = load_checkpoints(str(state))
+        assert list(checkpoints.values())[0].offset == src.stat().st_size
+        _append(src, LINES[2])
+        results = tail_redact_files([str(src)], str(out_dir), state_path=str(state))
+        assert results[str(src)].bytes_processed == len(LINES[2])
+        assert (out_dir / src.name).read_text(encoding="utf-8") == _expected(src, tmp_path)
+
+    def test_missing_source_does_not_duplicate_output(self, log_pair: tuple[Path, Path], tmp_path: Path) -> None:
+        src, _ = log_pair
+        state = tmp_path / "state.json"
+        out_dir = tmp_path / "redacted"
+        sources = [str(src), str(tmp_path / "rotated-away.log")]
+        for _ in range(2):
+            results = tail_redact_files(sources, str(out_dir), state_path=str(state))
+            assert list(results) == [str(src)]
+        assert (out_dir / src.name).read_text(encoding="utf-8") == _expected(src, tmp_path)
+
+    def test_missing_state_file_is_empty(self, tmp_path: Path) -> None:
+        assert load_checkpoints(str(tmp_path / "absent.json")) == {}
+        assert TailCheckpoint(1, 0, "")._asdict() == {"inode": 1, "offset": 0, "boundary": ""}
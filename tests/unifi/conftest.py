@@ -0,0 +1,53 @@
+"""Shared fixtures for the UniFi client tests.
+
+A test module tunes the ``controller`` fixture by defining ``CONTROLLER_OPTIONS``
+(keyword arguments for ``FakeController``, e.g. ``{"latency": 0.02}``).
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from urllib3.util import Retry
+
+from shared import auth
+from shared.auth import SessionPool
+from tests.unifi.fake_controller import FakeController
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a clock the test advances by hand."""
+    return FakeClock()
+
+
+@pytest.fixture
+def controller(request: pytest.FixtureRequest) -> Generator[FakeController, None, None]:
+    """Yield a running fake controller configured by the module's ``CONTROLLER_OPTIONS``."""
+    with FakeController(**getattr(request.module, "CONTROLLER_OPTIONS", {})) as fake:
+        yield fake
+
+
+@pytest.fixture
+def quick_retry_pool(monkeypatch: pytest.MonkeyPatch) -> SessionPool:
+    """A session pool whose urllib3 retries give up on 5xx at once, without backoff."""
+    monkeypatch.setattr(auth, "_retry", lambda: Retry(total=1, backoff_factor=0, status_forcelist=[502, 503, 504]))
+    return SessionPool()
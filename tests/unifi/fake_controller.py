@@ -0,0 +1,221 @@
+"""Local fake UniFi controller for client tests.
+
+Serves ``/api/s/<endpoint>`` over plain HTTP from a background thread with a
+fixed per-request latency, records every request and tracks how many were
+in flight at once, so tests can prove concurrency without a real controller.
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import parse_qsl
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+API_PREFIX = "/api/s/"
+LOGIN_PATH = "/api/login"
+
+DEFAULT_DATA: dict[str, list[dict[str, object]]] = {
+    "rest/networkconf": [{"_id": "net10", "name": "servers", "vlan": 10, "subnet": "10.0.10.0/26"}],
+    "stat/device": [{"_id": "dev1", "mac": "00:11:22:33:44:55", "state": 1}],
+    "rest/firewallrule": [{"_id": "fw1", "name": "drop-iot-to-lan", "action": "drop"}],
+    "rest/routing/policytable": [{"_id": "pt1", "description": "voip-wan1"}],
+}
+
+
+class RecordedRequest(NamedTuple):
+    """One request as the fake controller saw it."""
+
+    method: str
+    endpoint: str
+    body: Any
+    headers: dict[str, str]
+    query: dict[str, str]
+
+
+class FakeController:
+    """Threaded HTTP fake of the controller API.
+
+    GET returns ``{"data": data[endpoint]}`` (404 for unknown endpoints)
+    with an ``ETag`` when ``etags`` is set, answering 304 to a matching
+    ``If-None-Match``; POST/PUT echo the JSON body back as ``data``.
+    GET honours ``_start``/``_limit`` paging unless ``paging`` is False.
+    Endpoints listed in ``fail`` answer with that status code instead, and
+    the first ``throttle`` writes get ``throttle_status`` (429 by default)
+    with ``Retry-After: retry_after``.
+    With ``capacity``, a request arriving while that many are already in
+    flight gets 503, like an overloaded controller.
+    With ``credentials``, ``POST /api/login`` issues a ``unifises`` cookie and
+    ``X-CSRF-Token`` (401 for wrong credentials, like UniFi OS) and every
+    other request without a live cookie gets 401.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        data: dict[str, list[dict[str, object]]] | None = None,
+        fail: dict[str, int] | None = None,
+        etags: bool = False,
+        throttle: int = 0,
+        throttle_status: int = 429,
+        retry_after: str = "0",
+        paging: bool = True,
+        credentials: tuple[str, str] | None = None,
+        capacity: int | None = None,
+    ) -> None:
+        """Configure the fake; the server starts on ``__enter__``."""
+        self.latency = latency
+        self.data = dict(DEFAULT_DATA if data is None else data)
+        self.fail = dict(fail or {})
+        self.etags = etags
+        self.throttle = throttle
+        self.throttle_status = throttle_status
+        self.retry_after = retry_after
+        self.paging = paging
+        self.credentials = credentials
+        self.capacity = capacity
+        self.rejected = 0
+        self.sessions: set[str] = set()
+        self._tokens = itertools.count(1)
+        self.requests: list[RecordedRequest] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL to hand to the client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> FakeController:
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop the server and release the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(
+        self,
+        method: str,
+        path: str,
+        body: Any,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, object] | None, dict[str, str]]:
+        route, _, raw_query = path.partition("?")
+        endpoint = route.removeprefix(API_PREFIX)
+        query = dict(parse_qsl(raw_query))
+        with self._lock:
+            self.requests.append(RecordedRequest(method, endpoint, body, headers, query))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            overloaded = self.capacity is not None and self.in_flight > self.capacity
+            self.rejected += overloaded
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if overloaded:
+            return 503, {"meta": {"rc": "error", "msg": "api.err.Overloaded"}}, {}
+        if route == LOGIN_PATH:
+            return self._login(body)
+        if self.credentials is not None:
+            cookie = SimpleCookie(headers.get("Cookie", "")).get("unifises")
+            if cookie is None or cookie.value not in self.sessions:
+                return 401, {"meta": {"rc": "error", "msg": "api.err.LoginRequired"}}, {}
+        if endpoint in self.fail:
+            return self.fail[endpoint], {"meta": {"rc": "error"}}, {}
+        if method != "GET":
+            with self._lock:
+                throttled = self.throttle > 0
+                self.throttle -= throttled
+            if throttled:
+                return (
+                    self.throttle_status,
+                    {"meta": {"rc": "error", "msg": "api.err.TooManyRequests"}},
+                    {"Retry-After": self.retry_after},
+                )
+        if method == "GET":
+            if endpoint not in self.data:
+                return 404, {"meta": {"rc": "error", "msg": "api.err.NotFound"}}, {}
+            records = self.data[endpoint]
+            if self.paging and "_limit" in query:
+                start = int(query.get("_start", 0))
+                records = records[start : start + int(query["_limit"])]
+            payload: dict[str, object] = {"meta": {"rc": "ok"}, "data": records}
+            if not self.etags:
+                return 200, payload, {}
+            etag = '"' + hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16] + '"'
+            if headers.get("If-None-Match") == etag:
+                return 304, None, {"ETag": etag}
+            return 200, payload, {"ETag": etag}
+        return 200, {"meta": {"rc": "ok"}, "data": body if isinstance(body, dict) else {}}, {}
+
+    def expire_logins(self) -> None:
+        """Invalidate every issued session cookie, as a controller restart would."""
+        with self._lock:
+            self.sessions.clear()
+
+    def logins(self) -> int:
+        """Number of login attempts received."""
+        return sum(1 for r in self.requests if r.endpoint == LOGIN_PATH)
+
+    def _login(self, body: Any) -> tuple[int, dict[str, object] | None, dict[str, str]]:
+        if self.credentials is None or body != {"username": self.credentials[0], "password": self.credentials[1]}:
+            return 401, {"meta": {"rc": "error", "msg": "api.err.Invalid"}}, {}
+        with self._lock:
+            token = f"session{next(self._tokens)}"
+            self.sessions.add(token)
+        headers = {"Set-Cookie": f"unifises={token}; Path=/", "X-CSRF-Token": f"csrf-{token}"}
+        return 200, {"meta": {"rc": "ok"}, "data": []}, headers
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real controller
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                status, payload, extra = fake._respond(
+                    self.command, self.path, json.loads(raw) if raw else None, dict(self.headers.items())
+                )
+                encoded = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            do_GET = do_POST = do_PUT = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Keep test output quiet."""
+
+        return Handler
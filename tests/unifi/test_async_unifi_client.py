@@ -0,0 +1,121 @@
+"""Tests for shared.unifi_client.AsyncUniFiClient against a local fake controller.
+
+Validates the async surface mirrors UniFiClient and that independent reads
+overlap instead of paying each round trip in turn.
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+import requests
+
+from shared.unifi_client import AsyncUniFiClient, ControllerSnapshot, UniFiClient
+from tests.unifi.fake_controller import DEFAULT_DATA, FakeController
+
+LATENCY = 0.1
+
+
+@pytest.mark.unit
+def test_snapshot_matches_sync_client(controller: FakeController) -> None:
+    """Both clients read the same four endpoints into the same snapshot."""
+
+    async def fetch() -> ControllerSnapshot:
+        async with AsyncUniFiClient(controller.url) as client:
+            return await client.fetch_snapshot()
+
+    snapshot = asyncio.run(fetch())
+    assert snapshot == UniFiClient(controller.url).fetch_snapshot()
+    assert snapshot.networks == DEFAULT_DATA["rest/networkconf"]
+    assert snapshot.devices == DEFAULT_DATA["stat/device"]
+
+
+@pytest.mark.unit
+def test_concurrent_fetch_beats_sequential() -> None:
+    """Four reads at 100 ms each take ~100 ms concurrently instead of ~400 ms."""
+    with FakeController(latency=LATENCY) as fake:
+        start = time.perf_counter()
+        UniFiClient(fake.url).fetch_snapshot()
+        sequential = time.perf_counter() - start
+
+        async def fetch() -> None:
+            async with AsyncUniFiClient(fake.url) as client:
+                await client.fetch_snapshot()
+
+        fake.peak_in_flight = 0
+        start = time.perf_counter()
+        asyncio.run(fetch())
+        concurrent = time.perf_counter() - start
+
+    assert sequential >= 4 * LATENCY
+    assert concurrent < sequential / 2
+    assert fake.peak_in_flight == len(ControllerSnapshot._fields)
+
+
+@pytest.mark.unit
+def test_max_connections_bounds_concurrency() -> None:
+    """No more than max_connections requests are in flight at once."""
+    with FakeController(latency=0.02) as fake:
+
+        async def fetch() -> None:
+            async with AsyncUniFiClient(fake.url, max_connections=2) as client:
+                await asyncio.gather(*(client.list_networks() for _ in range(8)))
+
+        asyncio.run(fetch())
+    assert fake.peak_in_flight == 2
+
+
+@pytest.mark.unit
+def test_writes_send_json(controller: FakeController) -> None:
+    """create/update/update_policy_table send the same bodies as the sync client."""
+
+    async def write() -> dict[str, object]:
+        async with AsyncUniFiClient(controller.url) as client:
+            await client.update_network("net10", {"name": "servers"})
+            await client.update_policy_table({"rules": [{"description": "voip-wan1"}]})
+            return await client.create_network({"name": "voip", "vlan": 40})
+
+    assert asyncio.run(write()) == {"name": "voip", "vlan": 40}
+    assert [(r.method, r.endpoint) for r in controller.requests] == [
+        ("PUT", "rest/networkconf/net10"),
+        ("PUT", "rest/routing/policytable"),
+        ("POST", "rest/networkconf"),
+    ]
+    assert controller.requests[1].body == {"data": [{"description": "voip-wan1"}]}
+
+
+@pytest.mark.unit
+def test_http_error_propagates() -> None:
+    """Non-2xx responses raise requests.HTTPError from the awaiting task."""
+    with FakeController(fail={"stat/device": 403}) as fake:
+
+        async def fetch() -> None:
+            async with AsyncUniFiClient(fake.url) as client:
+                await client.fetch_snapshot()
+
+        with pytest.raises(requests.HTTPError):
+            asyncio.run(fetch())
+
+
+@pytest.mark.unit
+def test_invalid_policy_rules_rejected(controller: FakeController) -> None:
+    """Malformed rules are rejected before any request is sent."""
+
+    async def update() -> None:
+        async with AsyncUniFiClient(controller.url) as client:
+            await client.update_policy_table({"rules": "not-a-list"})
+
+    with pytest.raises(ValueError, match="'rules' field must be a list"):
+        asyncio.run(update())
+    assert controller.requests == []
+
+
+@pytest.mark.unit
+def test_max_connections_must_be_positive() -> None:
+    """A pool needs at least one connection."""
+    with pytest.raises(ValueError, match="max_connections"):
+        AsyncUniFiClient("https://controller.local", max_connections=0)
@@ -0,0 +1,130 @@
+"""Tests for UniFiClient bulk writes (bounded concurrency, per-item results, backpressure).
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from shared.unifi_client import MAX_BACKOFF_SECONDS, BulkOperation, UniFiClient, _retry_after_seconds
+from tests.unifi.fake_controller import FakeController
+
+if TYPE_CHECKING:
+    from shared.auth import SessionPool
+
+# A little latency so writes overlap.
+CONTROLLER_OPTIONS = {"latency": 0.02}
+
+
+@pytest.mark.unit
+def test_concurrency_is_bounded(controller: FakeController) -> None:
+    """Never more than ``concurrency`` writes in flight; results keep input order."""
+    client = UniFiClient(controller.url)
+    payloads: list[dict[str, object]] = [{"name": f"vlan{i}", "vlan": i} for i in range(12)]
+    results = client.create_networks(payloads, concurrency=3)
+    assert controller.peak_in_flight == 3  # configured concurrency
+    assert [r.data for r in results] == payloads
+    assert all(r.ok and r.attempts == 1 for r in results)
+
+
+@pytest.mark.unit
+def test_failed_item_does_not_abort_batch() -> None:
+    """A rejected update is reported on its own result; the others still apply."""
+    updates: dict[str, dict[str, object]] = {"net10": {"name": "servers"}, "bad": {"name": "x"}, "net20": {}}
+    with FakeController(fail={"rest/networkconf/bad": 400}) as fake:
+        results = UniFiClient(fake.url).update_networks(updates)
+    assert [r.ok for r in results] == [True, False, True]
+    error = results[1].error
+    assert isinstance(error, requests.HTTPError)
+    assert error.response is not None
+    assert error.response.status_code == 400  # controller rejection
+    assert results[1].operation == BulkOperation("PUT", "rest/networkconf/bad", {"name": "x"})
+    assert len(fake.requests) == 3  # no retry for client errors
+
+
+@pytest.mark.unit
+def test_retries_after_backpressure() -> None:
+    """429 responses pause the batch for Retry-After and the items are retried."""
+    with FakeController(throttle=2, retry_after="0.1") as fake:
+        start = time.perf_counter()
+        results = UniFiClient(fake.url).create_networks([{"name": "a"}, {"name": "b"}], concurrency=1)
+        elapsed = time.perf_counter() - start
+    assert all(r.ok for r in results)
+    assert [r.attempts for r in results] == [3, 1]
+    assert elapsed >= 0.2  # two Retry-After pauses
+    assert len(fake.requests) == 4  # two throttled + two accepted
+
+
+@pytest.mark.unit
+def test_put_retries_after_session_gave_up_on_503(quick_retry_pool: SessionPool) -> None:
+    """A 503 the session already retried (RetryError on PUT) is backpressure too, not a final failure."""
+    updates: dict[str, dict[str, object]] = {"net10": {"name": "servers"}}
+    with FakeController(throttle=2, throttle_status=503) as fake:
+        results = UniFiClient(fake.url, pool=quick_retry_pool).update_networks(updates)
+    assert [(r.ok, r.attempts) for r in results] == [(True, 2)]
+    assert len(fake.requests) == 3  # 503 + session retry 503, then bulk retry succeeds
+
+
+@pytest.mark.unit
+def test_gives_up_after_max_attempts() -> None:
+    """Persistent backpressure is reported as the item's error once attempts run out."""
+    with FakeController(throttle=10) as fake:
+        [result] = UniFiClient(fake.url).create_networks([{"name": "a"}], max_attempts=2)
+    assert not result.ok
+    assert result.attempts == 2  # max_attempts
+    assert len(fake.requests) == 2  # max_attempts
+
+
+@pytest.mark.unit
+def test_generic_bulk_mixes_methods(controller: FakeController) -> None:
+    """bulk() accepts any mix of POST/PUT operations on any endpoint."""
+    client = UniFiClient(controller.url)
+    results = client.bulk(
+        [
+            BulkOperation("POST", "rest/networkconf", {"name": "voip"}),
+            BulkOperation("PUT", "rest/firewallrule/fw1", {"action": "accept"}),
+        ],
+    )
+    assert [r.data for r in results] == [{"name": "voip"}, {"action": "accept"}]
+    assert sorted((r.method, r.endpoint) for r in controller.requests) == [
+        ("POST", "rest/networkconf"),
+        ("PUT", "rest/firewallrule/fw1"),
+    ]
+
+
+@pytest.mark.unit
+def test_empty_batch_sends_nothing(controller: FakeController) -> None:
+    """No operations, no requests."""
+    assert UniFiClient(controller.url).create_networks([]) == []
+    assert controller.requests == []
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("kwargs", [{"concurrency": 0}, {"max_attempts": 0}])
+def test_invalid_limits_rejected(kwargs: dict[str, int]) -> None:
+    """Concurrency and attempts must both be positive."""
+    with pytest.raises(ValueError, match="must be >= 1"):
+        UniFiClient("https://controller.local").bulk([], **kwargs)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("header", "attempt", "expected"),
+    [
+        ("2", 1, 2.0),
+        (None, 3, 2.0),
+        ("not-a-date", 1, 0.5),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 1, 0.0),
+        ("3600", 1, MAX_BACKOFF_SECONDS),
+    ],
+)
+def test_retry_after_parsing(header: str | None, attempt: int, expected: float) -> None:
+    """Seconds and HTTP-dates are honoured, clamped to [0, MAX_BACKOFF_SECONDS]; otherwise back off."""
+    response = SimpleNamespace(headers={} if header is None else {"Retry-After": header})
+    assert _retry_after_seconds(response, attempt) == expected  # type: ignore[arg-type]
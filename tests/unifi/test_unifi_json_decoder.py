@@ -0,0 +1,117 @@
+"""Tests for the pluggable UniFiClient JSON decoder and field projection.
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import pytest
+import requests
+
+from shared import unifi_client
+from shared.unifi_client import ResponseCache, UniFiClient, decode_json_fast, decode_json_stdlib
+from tests.unifi.fake_controller import DEFAULT_DATA, FakeController
+
+BODIES = [
+    b'{"meta": {"rc": "ok"}, "data": [{"mac": "00:11:22:33:44:55", "uptime": 12, "temp": 41.5}]}',
+    '{"data": [{"name": "Büro-AP ☕", "tags": [], "nested": {"a": [1, 2, {"b": null}]}}]}'.encode(),
+    b'{"data": [{"a": 1, "a": 2}]}',
+    b'{"data": [{"counter": 18446744073709551616, "neg": -99999999999999999999}]}',
+    b'{"data": [{"just_below_int64": -9223372036854775809, "uint64_max": 18446744073709551615}]}',
+    b'{"data": [{"rx": NaN, "tx": Infinity, "big": 1e400}]}',
+    b'{"data": ["\\ud800"]}',
+    b"  [1, 2.0, -0.0, true, false, null]  ",
+]
+MALFORMED = [b"", b"{", b'{"data": [1,]}', b'{"a": 1} trailing', b"\xff\xfe{"]
+
+
+def _response(body: bytes, content_type: str = "application/json") -> requests.Response:
+    response = requests.Response()
+    response._content = body
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def _same(left: Any, right: Any) -> bool:
+    """Structural equality that treats NaN as equal to NaN and distinguishes int from float."""
+    if isinstance(left, float) and isinstance(right, float):
+        return (math.isnan(left) and math.isnan(right)) or repr(left) == repr(right)
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(_same(left[k], right[k]) for k in left)
+    if isinstance(left, list):
+        return len(left) == len(right) and all(_same(a, b) for a, b in zip(left, right, strict=True))
+    return bool(left == right)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("body", BODIES)
+def test_fast_decoder_matches_stdlib(body: bytes) -> None:
+    """Values and types are identical, including the inputs orjson handles differently."""
+    assert _same(decode_json_fast(_response(body)), decode_json_stdlib(_response(body)))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("body", MALFORMED)
+def test_fast_decoder_raises_like_stdlib(body: bytes) -> None:
+    """Malformed bodies raise the same requests.JSONDecodeError as response.json()."""
+    with pytest.raises(requests.JSONDecodeError) as expected:
+        decode_json_stdlib(_response(body))
+    with pytest.raises(requests.JSONDecodeError) as actual:
+        decode_json_fast(_response(body))
+    assert str(actual.value) == str(expected.value)
+
+
+@pytest.mark.unit
+def test_declared_charset_respected() -> None:
+    """A non-UTF-8 charset goes through requests' own decoding."""
+    body = '{"data": [{"name": "café"}]}'.encode("latin-1")
+    response = _response(body, "application/json; charset=ISO-8859-1")
+    assert decode_json_fast(response) == {"data": [{"name": "café"}]}
+
+
+@pytest.mark.unit
+def test_stdlib_used_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without orjson installed the fast decoder is exactly response.json()."""
+    monkeypatch.setattr(unifi_client, "_orjson", None)
+    for body in BODIES:
+        assert _same(decode_json_fast(_response(body)), _response(body).json())
+
+
+@pytest.mark.unit
+def test_custom_decoder_is_used(controller: FakeController) -> None:
+    """Any Response -> object callable can be plugged in."""
+    seen: list[str] = []
+
+    def decoder(response: requests.Response) -> Any:
+        seen.append(response.url)
+        return decode_json_stdlib(response)
+
+    client = UniFiClient(controller.url, decoder=decoder)
+    client.list_networks()
+    client.create_network({"name": "voip"})
+    assert len(seen) == 2  # one GET, one POST
+
+
+@pytest.mark.unit
+def test_fields_projection(controller: FakeController) -> None:
+    """Only requested keys survive; missing keys are skipped rather than invented."""
+    client = UniFiClient(controller.url)
+    assert client.list_devices(fields=("mac", "state", "absent")) == [{"mac": "00:11:22:33:44:55", "state": 1}]
+    assert list(client.iter_get("stat/device", fields=["mac"])) == [{"mac": "00:11:22:33:44:55"}]
+
+
+@pytest.mark.unit
+def test_fields_projection_keeps_cache_complete(controller: FakeController) -> None:
+    """A projected read does not shrink the cached records other callers get."""
+    client = UniFiClient(controller.url, cache=ResponseCache())
+    assert client.list_devices(fields=["mac"]) == [{"mac": "00:11:22:33:44:55"}]
+    assert client.list_devices() == DEFAULT_DATA["stat/device"]
+    assert client.list_devices(fields=["state"]) == [{"state": 1}]
+    assert len(controller.requests) == 1
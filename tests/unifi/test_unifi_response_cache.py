@@ -0,0 +1,180 @@
+"""Tests for the opt-in UniFiClient response cache (TTL, revalidation, invalidation).
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from shared.unifi_client import AsyncUniFiClient, ResponseCache, UniFiClient
+from tests.unifi.fake_controller import DEFAULT_DATA, FakeController
+
+if TYPE_CHECKING:
+    from tests.unifi.conftest import FakeClock
+
+
+CONTROLLER_OPTIONS = {"etags": True}
+
+
+def _gets(controller: FakeController, endpoint: str) -> int:
+    return sum(1 for r in controller.requests if r.method == "GET" and r.endpoint == endpoint)
+
+
+@pytest.mark.unit
+def test_fresh_entry_served_without_request(controller: FakeController, clock: FakeClock) -> None:
+    """Repeated reads inside the TTL hit the controller once."""
+    cache = ResponseCache(default_ttl=10, clock=clock)
+    client = UniFiClient(controller.url, cache=cache)
+    assert client.list_networks() == client.list_networks() == DEFAULT_DATA["rest/networkconf"]
+    assert _gets(controller, "rest/networkconf") == 1
+    assert cache.stats()[:2] == (1, 1)
+
+
+@pytest.mark.unit
+def test_stale_entry_revalidated_with_etag(controller: FakeController, clock: FakeClock) -> None:
+    """After the TTL a conditional GET is sent and a 304 reuses the cached body."""
+    cache = ResponseCache(default_ttl=10, clock=clock)
+    client = UniFiClient(controller.url, cache=cache)
+    client.get_policy_table()
+    clock.now = 11
+    assert client.get_policy_table() == DEFAULT_DATA["rest/routing/policytable"]
+    assert "If-None-Match" in controller.requests[-1].headers
+    assert cache.stats().revalidations == 1
+    client.get_policy_table()
+    assert _gets(controller, "rest/routing/policytable") == 2  # revalidation renewed the TTL
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("use_async", [False, True])
+def test_304_after_concurrent_invalidation_refetches(
+    controller: FakeController, clock: FakeClock, monkeypatch: pytest.MonkeyPatch, use_async: bool
+) -> None:
+    """A 304 for an entry a concurrent write dropped mid-request is followed by a plain GET."""
+    cache = ResponseCache(default_ttl=10, clock=clock)
+    UniFiClient(controller.url, cache=cache).list_networks()
+    clock.now = 11
+    lookup = cache.lookup
+
+    def lookup_then_invalidate(*args: Any, **kwargs: Any) -> tuple[list[dict[str, object]] | None, dict[str, str]]:
+        result = lookup(*args, **kwargs)
+        cache.invalidate()  # a PUT from another task lands before the 304 comes back
+        return result
+
+    monkeypatch.setattr(cache, "lookup", lookup_then_invalidate)
+
+    async def fetch() -> list[dict[str, object]]:
+        async with AsyncUniFiClient(controller.url, cache=cache) as client:
+            return await client.list_networks()
+
+    networks = asyncio.run(fetch()) if use_async else UniFiClient(controller.url, cache=cache).list_networks()
+    assert networks == DEFAULT_DATA["rest/networkconf"]
+    assert [r.headers.get("If-None-Match") is None for r in controller.requests[-2:]] == [False, True]
+    assert cache.stats().size == 1
+
+
+@pytest.mark.unit
+def test_changed_resource_refetched(controller: FakeController, clock: FakeClock) -> None:
+    """A stale entry whose ETag no longer matches is replaced."""
+    client = UniFiClient(controller.url, cache=ResponseCache(default_ttl=10, clock=clock))
+    client.list_networks()
+    controller.data["rest/networkconf"] = [{"_id": "net40", "vlan": 40}]
+    clock.now = 11
+    assert client.list_networks() == [{"_id": "net40", "vlan": 40}]
+
+
+@pytest.mark.unit
+def test_write_invalidates_collection_only(controller: FakeController, clock: FakeClock) -> None:
+    """PUT to one network drops cached network lists but not the policy table."""
+    cache = ResponseCache(default_ttl=60, clock=clock)
+    client = UniFiClient(controller.url, cache=cache)
+    client.list_networks()
+    client.get_policy_table()
+    client.update_network("net10", {"name": "servers"})
+    client.list_networks()
+    client.get_policy_table()
+    assert _gets(controller, "rest/networkconf") == 2
+    assert _gets(controller, "rest/routing/policytable") == 1
+    assert cache.stats().invalidations == 1
+
+
+@pytest.mark.unit
+def test_per_endpoint_ttl(controller: FakeController, clock: FakeClock) -> None:
+    """Longest matching prefix wins; a TTL of 0 disables caching for that endpoint."""
+    cache = ResponseCache(default_ttl=60, ttls={"stat": 0, "rest/routing": 5}, clock=clock)
+    assert cache.ttl_for("stat/device") == 0
+    assert cache.ttl_for("rest/routing/policytable") == 5  # configured TTL
+    assert cache.ttl_for("rest/networkconf") == 60  # default TTL
+    client = UniFiClient(controller.url, cache=cache)
+    client.list_devices()
+    client.list_devices()
+    assert _gets(controller, "stat/device") == 2
+    assert cache.stats().size == 0
+
+
+@pytest.mark.unit
+def test_lru_eviction_and_copies(controller: FakeController, clock: FakeClock) -> None:
+    """The least recently used entry goes first; results are independent copies."""
+    cache = ResponseCache(maxsize=2, clock=clock)
+    client = UniFiClient(controller.url, cache=cache)
+    client.list_networks()[0]["name"] = "mutated"
+    client.list_devices()
+    client.list_firewall_rules()
+    stats = cache.stats()
+    assert (stats.size, stats.evictions) == (2, 1)
+    assert client.list_networks() == DEFAULT_DATA["rest/networkconf"]
+
+
+@pytest.mark.unit
+def test_shared_by_async_client(controller: FakeController, clock: FakeClock) -> None:
+    """One cache instance serves sync and async clients alike."""
+    cache = ResponseCache(clock=clock)
+    UniFiClient(controller.url, cache=cache).fetch_snapshot()
+
+    async def fetch() -> None:
+        async with AsyncUniFiClient(controller.url, cache=cache) as client:
+            await client.fetch_snapshot()
+            await client.create_network({"name": "voip"})
+            await client.list_networks()
+
+    asyncio.run(fetch())
+    assert len(controller.requests) == 4 + 2  # first snapshot, POST, network re-read
+    assert cache.stats().hits == 4  # one per snapshot endpoint
+
+
+@pytest.mark.unit
+def test_shared_cache_keeps_controllers_apart(controller: FakeController, clock: FakeClock) -> None:
+    """Clients of different controllers sharing a cache never get each other's data."""
+    cache = ResponseCache(default_ttl=60, clock=clock)
+    first = UniFiClient(controller.url, cache=cache)
+    other_data = {**DEFAULT_DATA, "rest/networkconf": [{"_id": "other", "vlan": 99}]}
+    with FakeController(etags=True, data=other_data) as other:
+        second = UniFiClient(other.url, cache=cache)
+        first.list_networks()
+        assert second.list_networks() == other_data["rest/networkconf"]
+        first.list_networks()
+        second.update_network("other", {"name": "moved"})
+        assert first.list_networks() == DEFAULT_DATA["rest/networkconf"]
+        second.list_networks()
+    assert _gets(controller, "rest/networkconf") == 1  # untouched by the other controller's write
+    assert _gets(other, "rest/networkconf") == 2  # re-read after its own write
+
+
+@pytest.mark.unit
+def test_cache_disabled_by_default(controller: FakeController) -> None:
+    """Without a cache every call reaches the controller."""
+    client = UniFiClient(controller.url)
+    client.list_networks()
+    client.list_networks()
+    assert client.cache is None
+    assert _gets(controller, "rest/networkconf") == 2  # two calls
+
+
+@pytest.mark.unit
+def test_maxsize_must_be_positive() -> None:
+    """A cache needs room for at least one response."""
+    with pytest.raises(ValueError, match="maxsize"):
+        ResponseCache(maxsize=0)
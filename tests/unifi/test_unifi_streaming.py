@@ -0,0 +1,135 @@
+"""Tests for streamed, paginated reads (iter_data_records / UniFiClient.iter_get).
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+from shared.unifi_client import UniFiClient, iter_data_records
+from tests.unifi.fake_controller import FakeController
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEVICES: list[dict[str, object]] = [
+    {"_id": f"dev{i}", "mac": f"00:11:22:33:{i // 256:02x}:{i % 256:02x}", "state": i % 2, "name": "AP—Ü"}
+    for i in range(25)
+]
+
+
+def _response(body: bytes) -> Any:
+    def iter_content(chunk_size: int) -> Iterator[bytes]:
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    return SimpleNamespace(iter_content=iter_content)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_records_match_full_parse(chunk_size: int) -> None:
+    """Any chunking (including splits inside numbers and UTF-8 sequences) yields the same records."""
+    body = json.dumps(
+        {"meta": {"rc": "ok", "count": [1, 2.5e3, None, True]}, "data": DEVICES, "tail": 12345},
+        ensure_ascii=False,
+        indent=1,
+    ).encode()
+    assert list(iter_data_records(_response(body), chunk_size=chunk_size)) == DEVICES
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        (b'{"meta": {"rc": "ok"}}', []),
+        (b'{"data": {"not": "a list"}}', []),
+        (b'{"data": []}', []),
+        (b' {"data":[{"a":1},{"b":2}] , "meta":{}} ', [{"a": 1}, {"b": 2}]),
+    ],
+)
+def test_envelope_shapes(body: bytes, expected: list[dict[str, object]]) -> None:
+    """Missing or non-list ``data`` yields nothing, matching ``UniFiClient.get``."""
+    assert list(iter_data_records(_response(body), chunk_size=3)) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("body", [b"[]", b"", b'{"data": [{"a": 1}, {"b":', b'{"data": [1 2]}'])
+def test_malformed_bodies_rejected(body: bytes) -> None:
+    """Non-object, truncated or malformed bodies raise ValueError."""
+    with pytest.raises(ValueError, match="JSON|Expecting"):
+        list(iter_data_records(_response(body), chunk_size=4))
+
+
+@pytest.mark.unit
+def test_memory_stays_flat() -> None:
+    """Peak allocation while streaming is a small fraction of the body size."""
+    record = {"_id": "x" * 24, "mac": "00:11:22:33:44:55", "model": "U6LR", "uptime": 123456, "port_table": [{}] * 8}
+    body = json.dumps({"meta": {"rc": "ok"}, "data": [record] * 20_000}).encode()
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_data_records(_response(body)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 20_000  # records in the body
+    assert peak < len(body) / 10
+
+
+@pytest.mark.unit
+def test_iter_get_pages_until_short_page() -> None:
+    """page_size drives ``_start``/``_limit`` and stops on the first short page."""
+    with FakeController(data={"stat/device": DEVICES}) as fake:
+        records = list(UniFiClient(fake.url).iter_get("stat/device", page_size=10, params={"type": "uap"}))
+    assert records == DEVICES
+    assert [r.query for r in fake.requests] == [
+        {"type": "uap", "_start": "0", "_limit": "10"},
+        {"type": "uap", "_start": "10", "_limit": "10"},
+        {"type": "uap", "_start": "20", "_limit": "10"},
+    ]
+
+
+@pytest.mark.unit
+def test_iter_get_stops_when_paging_ignored() -> None:
+    """An endpoint that returns everything at once is read in a single request."""
+    with FakeController(data={"stat/device": DEVICES}, paging=False) as fake:
+        records = list(UniFiClient(fake.url).iter_get("stat/device", page_size=10))
+    assert records == DEVICES
+    assert len(fake.requests) == 1
+
+
+@pytest.mark.unit
+def test_iter_get_stops_when_paging_ignored_and_page_is_full() -> None:
+    """A collection of exactly page_size records from an endpoint without paging is read once, not forever."""
+    with FakeController(data={"stat/device": DEVICES[:5]}, paging=False) as fake:
+        records = list(UniFiClient(fake.url).iter_get("stat/device", page_size=5))
+    assert records == DEVICES[:5]
+    assert len(fake.requests) == 2  # the second, repeated page ends the iteration
+
+
+@pytest.mark.unit
+def test_iter_get_is_lazy_and_unpaged_by_default() -> None:
+    """Nothing is requested until iteration starts; without page_size no paging params are sent."""
+    with FakeController() as fake:
+        records = UniFiClient(fake.url).iter_get("stat/device")
+        assert fake.requests == []
+        assert list(records) == UniFiClient(fake.url).list_devices()
+    assert fake.requests[0].query == {}
+
+
+@pytest.mark.unit
+def test_iter_get_errors() -> None:
+    """HTTP errors surface on first iteration; page_size must be positive."""
+    with FakeController(fail={"stat/device": 403}) as fake:
+        client = UniFiClient(fake.url)
+        with pytest.raises(requests.HTTPError):
+            next(client.iter_get("stat/device"))
+        with pytest.raises(ValueError, match="page_size"):
+            next(client.iter_get("stat/device", page_size=0))
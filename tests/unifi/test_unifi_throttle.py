@@ -0,0 +1,211 @@
+"""Tests for client-side throttling (TokenBucket, AdaptiveThrottle, get_throttle).
+
+Guardian: Beale | Ministry: Detection | Consciousness: 2.6
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import time
+
+import pytest
+import requests
+
+from shared.auth import SessionPool
+from shared.unifi_client import AdaptiveThrottle, AsyncUniFiClient, TokenBucket, UniFiClient, get_throttle
+from tests.unifi.conftest import FakeClock
+from tests.unifi.fake_controller import FakeController
+
+
+def _http_error(status: int, headers: dict[str, str] | None = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def _finish(slot: contextlib.AbstractContextManager[None], error: BaseException | None = None) -> None:
+    """Leave an entered slot, as if its body returned or raised ``error``."""
+    if error is None:
+        slot.__exit__(None, None, None)
+    else:
+        assert not slot.__exit__(type(error), error, None)
+
+
+def _enter(throttle: AdaptiveThrottle, count: int) -> list[contextlib.AbstractContextManager[None]]:
+    slots: list[contextlib.AbstractContextManager[None]] = [throttle.slot() for _ in range(count)]
+    for slot in slots:
+        slot.__enter__()
+    return slots
+
+
+@pytest.mark.unit
+def test_token_bucket_bursts_then_spaces_requests(clock: FakeClock) -> None:
+    """A full bucket allows ``burst`` immediate requests, then one per 1/rate seconds."""
+    bucket = TokenBucket(10.0, 2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0.0, 0.0, 0.1, 0.2])
+    clock.now = 0.3
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+@pytest.mark.unit
+def test_token_bucket_pause(clock: FakeClock) -> None:
+    """A pause issues nothing until it ends and does not bank tokens meanwhile."""
+    bucket = TokenBucket(10.0, 5, clock=clock)
+    bucket.pause(2.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert bucket.reserve() == pytest.approx(2.1)
+    clock.now = 2.5
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+@pytest.mark.unit
+def test_additive_increase_while_saturated() -> None:
+    """Healthy rounds that use every slot grow the limit up to ``max_limit``; idle use does not."""
+    throttle = AdaptiveThrottle(rate=1e6, initial_limit=1, max_limit=5, clock=FakeClock())
+    _finish(_enter(throttle, 1)[0])
+    assert throttle.limit == 2  # 1 + 1/1
+    for _ in range(20):
+        for slot in _enter(throttle, throttle.limit):
+            _finish(slot)
+    assert throttle.limit == 5  # max_limit
+
+    idle = AdaptiveThrottle(rate=1e6, initial_limit=4, clock=FakeClock())
+    for _ in range(20):
+        _finish(_enter(idle, 1)[0])
+    assert idle.limit == 4  # one request at a time never needs more slots
+
+
+@pytest.mark.unit
+def test_multiplicative_decrease_once_per_round(clock: FakeClock) -> None:
+    """Errors from requests already in flight at the cut do not cut again."""
+    throttle = AdaptiveThrottle(rate=1e6, initial_limit=8, clock=clock)
+    slots = _enter(throttle, 8)
+    clock.now = 1.0
+    for slot in slots:
+        _finish(slot, _http_error(503))
+    stats = throttle.stats()
+    assert (stats.limit, stats.overloads, stats.decreases, stats.in_flight) == (4, 8, 1, 0)
+    clock.now = 2.0
+    _finish(_enter(throttle, 1)[0], requests.ConnectionError("reset"))
+    assert throttle.limit == 2  # halved again by a request sent after the cut
+
+
+@pytest.mark.unit
+def test_client_errors_and_slow_responses(clock: FakeClock) -> None:
+    """4xx leaves the limit alone; a response far slower than the baseline counts as overload."""
+    throttle = AdaptiveThrottle(rate=1e6, initial_limit=4, clock=clock)
+    _finish(_enter(throttle, 1)[0], _http_error(404))
+    assert (throttle.limit, throttle.overloads) == (4, 0)
+
+    [slot] = _enter(throttle, 1)
+    clock.now += 0.1
+    _finish(slot)
+    [slot] = _enter(throttle, 1)
+    clock.now += 0.15
+    _finish(slot)
+    assert throttle.limit == 4  # within tolerance of the 0.1 s baseline
+    [slot] = _enter(throttle, 1)
+    clock.now += 1.0
+    _finish(slot)
+    stats = throttle.stats()
+    assert (stats.limit, stats.overloads) == (2, 1)
+    assert stats.baseline_latency is not None
+    assert stats.baseline_latency > 0.1  # drifts toward slower samples
+
+
+@pytest.mark.unit
+def test_retry_after_pauses_bucket(clock: FakeClock) -> None:
+    """A 429 with Retry-After holds back the next token for that long."""
+    throttle = AdaptiveThrottle(rate=100.0, clock=clock)
+    _finish(_enter(throttle, 1)[0], _http_error(429, {"Retry-After": "3"}))
+    assert throttle.bucket.reserve() == pytest.approx(3.0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"min_limit": 0}, {"initial_limit": 20, "max_limit": 10}, {"decrease_factor": 1.0}, {"rate": 0.0}],
+)
+def test_invalid_settings_rejected(kwargs: dict[str, float]) -> None:
+    """Limits must be ordered and positive, the decrease a real reduction, the rate positive."""
+    with pytest.raises(ValueError, match="must"):
+        AdaptiveThrottle(**kwargs)  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+def test_get_throttle_is_per_controller() -> None:
+    """Clients of the same scheme/host/port share one throttle."""
+    first = get_throttle("https://Controller.test:8443/")
+    assert get_throttle("https://controller.test:8443/other", rate=1.0) is first
+    assert get_throttle("https://controller.test:9443") is not first
+
+
+@pytest.mark.unit
+def test_client_respects_concurrency_limit() -> None:
+    """A bulk job never has more requests in flight than the throttle allows."""
+    throttle = AdaptiveThrottle(initial_limit=2, max_limit=2)
+    with FakeController(latency=0.02) as fake:
+        results = UniFiClient(fake.url, throttle=throttle).create_networks([{"name": f"n{i}"} for i in range(8)])
+    assert all(r.ok for r in results)
+    assert fake.peak_in_flight == 2  # max_limit
+    assert throttle.stats().requests == 8  # one per write
+
+
+@pytest.mark.unit
+def test_client_respects_rate() -> None:
+    """Requests start no faster than the bucket rate once the burst is spent."""
+    client_throttle = AdaptiveThrottle(rate=50.0, burst=1)
+    with FakeController() as fake:
+        client = UniFiClient(fake.url, throttle=client_throttle)
+        start = time.perf_counter()
+        for _ in range(6):
+            client.list_networks()
+        elapsed = time.perf_counter() - start
+    assert elapsed >= 0.1  # five waits of 1/50 s
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["GET", "PUT"])
+def test_retried_5xx_counts_as_overload(quick_retry_pool: SessionPool, method: str) -> None:
+    """A 503 the session retried itself (RetryError) still cuts the limit."""
+    throttle = AdaptiveThrottle(initial_limit=4)
+    with FakeController(fail={"rest/networkconf/n1": 503}) as fake:
+        client = UniFiClient(fake.url, pool=quick_retry_pool, throttle=throttle)
+        call = client.get if method == "GET" else functools.partial(client.put, json={"name": "x"})
+        with pytest.raises(requests.exceptions.RetryError):
+            call("rest/networkconf/n1")
+    assert len(fake.requests) == 2  # the session's own retry
+    stats = throttle.stats()
+    assert (stats.overloads, stats.decreases, stats.limit) == (1, 1, 2)
+
+
+@pytest.mark.unit
+def test_bulk_adapts_to_overloaded_controller() -> None:
+    """Against a controller that sheds load above 3 requests, the limit backs off and every write lands."""
+    throttle = AdaptiveThrottle(initial_limit=8, max_limit=8, rate=1000.0)
+    with FakeController(latency=0.02, capacity=3) as fake:
+        client = UniFiClient(fake.url, throttle=throttle)
+        results = client.create_networks([{"name": f"n{i}"} for i in range(40)], max_attempts=8)
+    assert all(r.ok for r in results)
+    stats = throttle.stats()
+    assert stats.decreases >= 1
+    assert stats.limit < 8  # initial limit
+    assert fake.rejected <= stats.overloads
+
+
+@pytest.mark.unit
+def test_async_client_uses_throttle() -> None:
+    """The async client takes its slots on the worker threads."""
+    throttle = AdaptiveThrottle(initial_limit=1, max_limit=1)
+
+    async def snapshot(url: str) -> None:
+        async with AsyncUniFiClient(url, throttle=throttle) as client:
+            await client.fetch_snapshot()
+
+    with FakeController(latency=0.02) as fake:
+        asyncio.run(snapshot(fake.url))
+    assert fake.peak_in_flight == 1
+    assert throttle.stats().requests == 4  # four snapshot endpoints